@@ -0,0 +1,10 @@
+#!/bin/bash
+if [ "$#" -ne 1 ] ; then
+        echo "expecting data directory as argument" >&2
+        exit 1
+fi
+D=$1
+d=`date +"%Y-%m-%d"`
+# uncompressed so that nlpready can read documents directly from the archive
+# (place the tar file in the data directory)
+tar cvf xml-$D-$d.tar $D/xml_* $D/failed_*
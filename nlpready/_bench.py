@@ -0,0 +1,230 @@
+"""Benchmark the cleaning pipeline on a frozen set of pages.
+
+``nlpready bench freeze`` copies a few pages of every layout (the Clean
+subclass that create_clean picks) for each module from the downloads into
+``{DATADIR}/bench``. ``nlpready bench run`` times get_soup, create_clean,
+each Clean accessor, tostr and reduce_nums on them. Each module runs in a
+fresh process so that its peak RSS can be reported. Results are compared
+against a saved baseline.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import resource
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from io import BytesIO
+from multiprocessing import get_context
+from os.path import join
+from typing import Any
+
+import click
+from bs4 import BeautifulSoup
+
+from ._metrics import Metrics
+from ._rescantxt import reduce_nums
+from ._store import get_store
+from ._store import split_name
+from ._types import Paper
+from ._utils import data_dir
+
+BENCHDIR = "bench"
+MANIFEST = "manifest.json"
+BASELINE = "baseline.json"
+
+ACCESSORS = ("title", "abstract", "methods", "results", "full_text", "xrefs")
+SECTIONS = ("abstract", "methods", "results", "full_text")
+
+
+def bench_dir(directory: str | None = None) -> str:
+    return directory or join(data_dir(), BENCHDIR)
+
+
+def read_manifest(directory: str) -> dict[str, list[dict[str, Any]]]:
+    fname = join(directory, MANIFEST)
+    if not os.path.exists(fname):
+        return {}
+    with open(fname, encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def write_json(fname: str, data: Any) -> None:
+    tmp = fname + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(data, fp, indent=2)
+    os.replace(tmp, fname)
+
+
+def freeze(
+    mod: str,
+    directory: str,
+    pmid2doi: dict[str, Paper],
+    per_layout: int = 3,
+    scan: int = 100,
+) -> Counter[str]:
+    """Copy up to per_layout pages of each layout of module mod.
+
+    At most scan pages per journal are parsed to find the layouts.
+    Returns the number of pages frozen for each layout.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ._cli import getmod
+
+    d = getmod(mod)
+    target = join(directory, mod)
+    entries = []
+    layouts: Counter[str] = Counter()
+    for issn in d["issn"]:
+        store = get_store(f"xml_{issn}")
+        pmids = list(store.names())
+        random.shuffle(pmids)
+        g = d["Generate"](issn, pmid2doi=pmid2doi, journal=issn)
+        for pmid in pmids[:scan]:
+            data = store.read(pmid)
+            try:
+                soup = BeautifulSoup(BytesIO(data), g.parser)
+                layout = type(g.create_clean(soup, pmid)).__name__
+            except Exception:  # pylint: disable=broad-except
+                continue
+            if layouts[layout] >= per_layout:
+                continue
+            s = split_name(os.path.basename(store.path(pmid)))
+            ext = s[1] if s else ".html"
+            os.makedirs(target, exist_ok=True)
+            with open(join(target, pmid + ext), "wb") as fp:
+                fp.write(data)
+            paper = pmid2doi.get(pmid)
+            entries.append(
+                dict(
+                    issn=issn,
+                    pmid=pmid,
+                    ext=ext,
+                    layout=layout,
+                    paper=asdict(paper) if paper else None,
+                ),
+            )
+            layouts[layout] += 1
+    if entries:
+        manifest = read_manifest(directory)
+        old = manifest.get(mod, [])
+        keep = {(e["pmid"], e["ext"]) for e in entries}
+        for e in old:  # remove stale pages
+            if (e["pmid"], e["ext"]) not in keep:
+                fname = join(target, e["pmid"] + e["ext"])
+                if os.path.exists(fname):
+                    os.remove(fname)
+        manifest[mod] = entries
+        write_json(join(directory, MANIFEST), manifest)
+    return layouts
+
+
+def bench_module(
+    mod: str,
+    directory: str,
+    entries: list[dict[str, Any]],
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Benchmark one module. Run this in a fresh process for a sensible RSS."""
+    # pylint: disable=import-outside-toplevel
+    from ._cli import getmod
+
+    d = getmod(mod)
+    pmid2doi = {e["pmid"]: Paper(**e["paper"]) for e in entries if e["paper"]}
+    pages = []
+    for e in entries:
+        with open(join(directory, mod, e["pmid"] + e["ext"]), "rb") as fp:
+            pages.append((e, fp.read()))
+    gens = {
+        issn: d["Generate"](issn, pmid2doi=pmid2doi, journal=issn)
+        for issn in {e["issn"] for e in entries}
+    }
+    m = Metrics()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for e, data in pages:
+            g = gens[e["issn"]]
+            with m.timer("get_soup"):
+                soup = BeautifulSoup(BytesIO(data), g.parser)
+            with m.timer("create_clean"):
+                c = g.create_clean(soup, e["pmid"])
+            secs = {}
+            for name in ACCESSORS:
+                with m.timer(name):
+                    secs[name] = getattr(c, name)()
+            for name in SECTIONS:
+                if not secs[name]:
+                    continue
+                with m.timer("tostr"):
+                    txt = c.tostr(secs[name])
+                with m.timer("reduce_nums"):
+                    for p in txt:
+                        reduce_nums(p)
+        best = min(best, time.perf_counter() - start)
+    stages = {s["stage"]: s["sum"] / s["count"] * 1000.0 for s in m.todict()["stages"]}
+    return dict(
+        docs=len(pages),
+        docs_per_sec=len(pages) / best if best > 0 else 0.0,
+        # ru_maxrss is in kilobytes on Linux
+        peak_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        stages_ms=stages,
+    )
+
+
+def run(
+    mods: list[str],
+    directory: str,
+    repeat: int = 3,
+) -> dict[str, dict[str, Any]]:
+    manifest = read_manifest(directory)
+    results = {}
+    ctx = get_context("spawn")
+    for mod in mods:
+        entries = manifest.get(mod)
+        if not entries:
+            continue
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+            results[mod] = executor.submit(
+                bench_module,
+                mod,
+                directory,
+                entries,
+                repeat,
+            ).result()
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float = 0.2,
+) -> list[str]:
+    """Print results and return the modules whose throughput regressed."""
+    regressed = []
+    for mod, r in sorted(results.items()):
+        b = baseline.get(mod)
+        msg = (
+            f"{mod:12} {r['docs']:4} docs {r['docs_per_sec']:8.1f} docs/s"
+            f" {r['peak_rss_mb']:7.1f}MB"
+        )
+        fg = None
+        if b and b["docs_per_sec"] > 0:
+            change = r["docs_per_sec"] / b["docs_per_sec"] - 1.0
+            msg += f" {100 * change:+6.1f}%"
+            if change < -threshold:
+                regressed.append(mod)
+                fg = "red"
+            elif change > threshold:
+                fg = "green"
+        click.secho(msg, fg=fg)
+        slow = sorted(r["stages_ms"].items(), key=lambda t: -t[1])[:3]
+        click.secho(
+            "    " + ", ".join(f"{s} {ms:.2f}ms" for s, ms in slow),
+            fg="blue",
+        )
+    return regressed
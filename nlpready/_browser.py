@@ -0,0 +1,217 @@
+"""One long lived Chrome for all the selenium downloads of a run.
+
+``nlpready download`` creates a single BrowserSession and hands it to every
+DownloadSelenium (cell, genetics ...) instead of each journal starting and
+closing its own Chrome. Chrome is started on first use with a persistent
+profile in ``{DATADIR}/browser-<hostname>`` so cookies, consent banners and
+institutional logins carry over between journals and runs. Chrome locks its
+profile: if another process on this machine (e.g. ``watch`` and a manual
+``download``) has it, a throwaway profile is used instead. A crashed tab or
+dead browser is replaced and the page retried once.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from os.path import join
+from typing import Callable
+from typing import TYPE_CHECKING
+
+import click
+from selenium.common.exceptions import InvalidSessionIdException
+from selenium.common.exceptions import NoSuchWindowException
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from ._metrics import inc
+from ._metrics import timer
+from ._utils import data_dir
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+PROFILEDIR = "browser"
+
+
+def default_profile() -> str:
+    # one per machine: the data directory may be shared (see --queue)
+    return join(data_dir(), f"{PROFILEDIR}-{socket.gethostname()}")
+
+
+def profile_in_use(profile: str) -> bool:
+    """Does a running Chrome on this machine hold the profile's lock?"""
+    try:  # Chrome's lock is a symlink to "<hostname>-<pid>"
+        owner = os.readlink(join(profile, "SingletonLock"))
+    except OSError:
+        return False
+    host, _, pid = owner.rpartition("-")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False  # stale: Chrome takes it over
+    except PermissionError:
+        pass
+    return True
+
+
+# messages of WebDriverExceptions that mean the tab or browser is gone
+CRASHED = (
+    "tab crashed",
+    "invalid session id",
+    "disconnected",
+    "chrome not reachable",
+    "no such window",
+    "target window already closed",
+    "session deleted",
+)
+
+
+class BrowserSession:
+    def __init__(
+        self,
+        headless: bool = True,
+        profile: str | None = "",
+        driver: WebDriver | None = None,
+    ) -> None:
+        """profile is the Chrome user data directory ("" for the default
+        ``{DATADIR}/browser-<hostname>``, None for a throwaway profile). An
+        existing driver is adopted as is.
+        """
+        self.headless = headless
+        self.profile = default_profile() if profile == "" else profile
+        self.driver_ = driver
+        self.lock = threading.RLock()  # one browser can only do one thing at a time
+        self.warmed: set[str] = set()
+        self.pages = 0
+        self.seconds = 0.0
+        self.restarts = 0
+
+    def launch(self) -> WebDriver:
+        # pylint: disable=import-outside-toplevel
+        from selenium import webdriver
+
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("headless")
+        if self.profile and profile_in_use(self.profile):
+            click.secho(
+                f"{self.profile} is in use by another Chrome:"
+                " using a throwaway profile",
+                fg="yellow",
+            )
+            self.profile = None
+        if self.profile:
+            options.add_argument(f"user-data-dir={self.profile}")
+        print("starting Chrome")
+        return webdriver.Chrome(options=options)
+
+    @property
+    def driver(self) -> WebDriver:
+        with self.lock:
+            if self.driver_ is None:
+                self.driver_ = self.launch()
+            return self.driver_
+
+    @property
+    def started(self) -> bool:
+        return self.driver_ is not None
+
+    def warm(self, url: str) -> None:
+        """Visit url once per session (cookie banners, referer, logins)."""
+        with self.lock:
+            if url in self.warmed:
+                return
+            self.warmed.add(url)
+            try:
+                self.driver.get(url)
+            except WebDriverException as e:
+                click.secho(f"warm up {url} failed: {e.msg}", fg="yellow")
+
+    @staticmethod
+    def crashed(e: WebDriverException) -> bool:
+        if isinstance(e, TimeoutException):
+            return False
+        if isinstance(e, (InvalidSessionIdException, NoSuchWindowException)):
+            return True
+        msg = (e.msg or "").lower()
+        return any(m in msg for m in CRASHED)
+
+    def recover(self) -> None:
+        """Open a fresh tab or, if the browser is gone, restart it."""
+        self.restarts += 1
+        inc("browser_restarts")
+        driver = self.driver_
+        if driver is not None:
+            try:
+                driver.switch_to.new_window("tab")
+                for handle in driver.window_handles[:-1]:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                driver.switch_to.window(driver.window_handles[-1])
+                click.secho("browser tab recovered", fg="yellow")
+                return
+            except WebDriverException:
+                try:
+                    driver.quit()
+                except WebDriverException:
+                    pass
+        click.secho("restarting Chrome", fg="yellow")
+        self.driver_ = None
+
+    def get(
+        self,
+        url: str,
+        ready: Callable[[WebDriver], None] | None = None,
+        **labels: str,
+    ) -> tuple[str, str]:
+        """Load url, call ready(driver) to wait for it, return (html, final url)."""
+        with self.lock:
+            for attempt in range(2):
+                start = time.perf_counter()
+                try:
+                    with timer("browser_page", **labels):
+                        driver = self.driver
+                        driver.get(url)
+                        if ready is not None:
+                            ready(driver)
+                        h = driver.find_element(by=By.TAG_NAME, value="html")
+                        txt = h.get_attribute("outerHTML") or ""
+                        current = driver.current_url or "<unknown>"
+                except WebDriverException as e:
+                    if attempt or not self.crashed(e):
+                        raise
+                    self.recover()
+                    continue
+                finally:
+                    self.seconds += time.perf_counter() - start
+                self.pages += 1
+                return txt, current
+            raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        with self.lock:
+            if self.pages:
+                click.secho(
+                    f"browser: {self.pages} pages in {self.seconds:.1f}s"
+                    f" ({self.seconds / self.pages:.2f}s/page),"
+                    f" {self.restarts} restarts",
+                    fg="blue",
+                )
+            if self.driver_ is not None:
+                try:
+                    self.driver_.quit()
+                except WebDriverException:
+                    pass
+                self.driver_ = None
+
+    def __enter__(self) -> BrowserSession:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
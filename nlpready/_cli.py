@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import time
 import warnings
 from collections import Counter
 from collections import namedtuple
@@ -8,12 +9,21 @@ from importlib import import_module
 from pickle import dump
 from pickle import load
 from typing import Any
+from typing import TYPE_CHECKING
 
 import click
 
+from ._mlabc import FAKE_ISSN
 from ._mlabc import Generate
 from ._utils import getconfig
 
+if TYPE_CHECKING:
+    from ._docstats import DocStats
+    from ._profile import Profiler
+    from ._shard import LeaseQueue
+    from ._shard import Shard
+    from ._throttle import Throttle
+
 # add module name to this list...
 
 MODS = [
@@ -68,7 +78,7 @@ from typing import TypedDict, Callable, cast
 
 class NLPMod(TypedDict):
     issn: dict[str, str]
-    download: Callable[[str, float, int], None]
+    download: Callable[..., None]
     Generate: type[Generate]
 
 
@@ -116,6 +126,131 @@ def doubles() -> None:
             papers.append((paper, e))
 
 
+def make_profiler(n: int) -> Profiler | None:
+    if n <= 0:
+        return None
+    # pylint: disable=import-outside-toplevel
+    from ._profile import Profiler
+
+    return Profiler(n)
+
+
+def profile_option(f):
+    return click.option(
+        "--profile-slowest",
+        "profile",
+        default=0,
+        metavar="N",
+        help="keep cProfile and tracemalloc stats of the N slowest"
+        " and N most memory hungry papers in {DATADIR}/profile",
+    )(f)
+
+
+def docstats_option(f):
+    return click.option(
+        "--docstats",
+        metavar="FILE",
+        help="save section heading and class statistics to FILE"
+        " (see the docstats command)",
+    )(f)
+
+
+def make_docstats(fname: str | None) -> DocStats | None:
+    if not fname:
+        return None
+    # pylint: disable=import-outside-toplevel
+    from ._docstats import DocStats
+
+    return DocStats()
+
+
+def selector_stats_option(f):
+    return click.option(
+        "--selector-stats",
+        "selector_stats",
+        default=0,
+        metavar="N",
+        help="time the css selects and show the N most expensive selectors"
+        " of each module",
+    )(f)
+
+
+def selector_stats_start(top: int) -> None:
+    if top:
+        # pylint: disable=import-outside-toplevel
+        from ._selectors import STATS
+
+        STATS.enabled = True
+
+
+def selector_stats_report(top: int) -> None:
+    if top:
+        # pylint: disable=import-outside-toplevel
+        from ._selectors import STATS
+
+        STATS.report(top)
+
+
+def shard_options(f):
+    def shard(ctx: click.Context, param: click.Parameter, value: str | None):
+        # pylint: disable=import-outside-toplevel
+        from ._shard import parse_shard
+
+        if value is None:
+            return None
+        try:
+            return parse_shard(value)
+        except ValueError as e:
+            raise click.BadParameter(str(e), ctx, param) from e
+
+    f = click.option(
+        "--lease",
+        default=600.0,
+        help="seconds after which the lease of a silent node is handed out again",
+        show_default=True,
+    )(f)
+    f = click.option(
+        "--queue",
+        metavar="FILE",
+        help="share the work with other nodes through leases in FILE"
+        " (an SQLite file on shared storage)",
+    )(f)
+    return click.option(
+        "--shard",
+        metavar="I/N",
+        callback=shard,
+        help="only process the papers in shard I (0 <= I < N) of N by pmid hash",
+    )(f)
+
+
+def throttle_option(f):
+    def throttle(ctx: click.Context, param: click.Parameter, value: bool):
+        if not value:
+            return None
+        # pylint: disable=import-outside-toplevel
+        from ._throttle import throttle as shared
+
+        return shared()
+
+    return click.option(
+        "--throttle/--no-throttle",
+        default=True,
+        callback=throttle,
+        help="adapt the delay between requests to each host to its responses"
+        " (429s, 503s, latency) and remember it in {DATADIR}/throttle.json;"
+        " --sleep is then the delay for new hosts [default: throttle]",
+    )(f)
+
+
+def make_queue(fname: str | None, lease: float) -> LeaseQueue | None:
+    if not fname:
+        return None
+    # pylint: disable=import-outside-toplevel
+    from ._shard import LeaseQueue
+
+    return LeaseQueue(fname, ttl=lease)
+
+
 def mod_option(f):
     return click.option(
         "--mod",
@@ -132,8 +267,21 @@ def issn_option(f):
 
 
 @click.group()
-def cli():
-    pass
+@click.option(
+    "--metrics",
+    "metrics_file",
+    metavar="FILE",
+    envvar="NLPREADY_METRICS",
+    help="save stage timings and counters to FILE at exit"
+    " (Prometheus textfile if it ends with .prom, JSON otherwise, '-' for stdout)",
+)
+@click.pass_context
+def cli(ctx: click.Context, metrics_file: str | None = None) -> None:
+    if metrics_file:
+        # pylint: disable=import-outside-toplevel
+        from ._metrics import metrics
+
+        ctx.call_on_close(lambda: metrics().dump(metrics_file))
 
 
 # pylint: disable=redefined-outer-name
@@ -148,12 +296,18 @@ def cli():
     help=f"cached pickle file. Defaults to {getconfig().data_dir}/{getconfig().cache}",
     # show_default=True,
 )
+@profile_option
+@docstats_option
+@selector_stats_option
 def tohtml(
     cache: str,
     issn: str | None = None,
     mod: str = "",
     num: bool = False,
     sort: str = "journal",
+    profile: int = 0,
+    docstats: str | None = None,
+    selector_stats: int = 0,
 ) -> None:
     """Generate HTML documents from downloads."""
     # pylint: disable=too-many-locals
@@ -189,6 +343,9 @@ def tohtml(
     p2i = pmid2doi()
     issns = {p.issn: p.journal for p in p2i.values() if not issn_ or p.issn in issn_}
     issnmap = {}
+    profiler = make_profiler(profile)
+    stats = make_docstats(docstats)
+    selector_stats_start(selector_stats)
 
     for mmod in mods:
         d = getmod(mmod)
@@ -197,7 +354,13 @@ def tohtml(
                 continue
             journal = issns.get(iissn, iissn)
             print("writing", mmod, iissn, journal)
-            g = d["Generate"](iissn, pmid2doi=p2i)
+            g = d["Generate"](
+                iissn,
+                pmid2doi=p2i,
+                journal=journal,
+                profiler=profiler,
+                docstats=stats,
+            )
             # try:
             fname, papers, failed, _ = g.tohtmlx(
                 save=True,
@@ -236,6 +399,12 @@ def tohtml(
             #     click.secho("failed %s %s %s" % (m, i, str(e)), fg='magenta')
             #     raise e
 
+    if profiler is not None:
+        profiler.save()
+    if stats is not None and docstats:
+        stats.save(docstats)
+    selector_stats_report(selector_stats)
+
     if os.path.exists(cache):
         with open(cache, "rb") as fp:
             issnmap2 = load(fp)
@@ -308,14 +477,25 @@ def tokenize(mod: str = "") -> None:
     is_flag=True,
     help="replace numbers with the token NUMBER in the text",
 )
+@profile_option
+@docstats_option
+@selector_stats_option
+@shard_options
 def clean(
     num: bool = False,
     issn: str = "",
     mod: str = "",
     nowrite: bool = False,
+    profile: int = 0,
+    docstats: str | None = None,
+    selector_stats: int = 0,
+    shard: Shard | None = None,
+    queue: str | None = None,
+    lease: float = 600.0,
 ) -> None:  # pylint: disable=redefined-outer-name
     """Create "clean" documents suitable for input into ML programs."""
     # pylint: disable=import-outside-toplevel
+    from ._mlabc import issn2journal
     from ._mlabc import pmid2doi
 
     if mod:
@@ -327,15 +507,59 @@ def clean(
     else:
         issns = None
     p2i = pmid2doi()
+    journals = issn2journal(p2i)
+    seen: dict[tuple[type, str], str] = {}
+    profiler = make_profiler(profile)
+    stats = make_docstats(docstats)
+    selector_stats_start(selector_stats)
+    lq = make_queue(queue, lease)
     for m in mods:
         d = getmod(m)
         for i in d["issn"]:
             if issns and issn not in issns:
                 continue
             print("writing ", m, i)
-            g = d["Generate"](i, pmid2doi=p2i)
+            g = d["Generate"](
+                i,
+                pmid2doi=p2i,
+                journal=journals.get(i),
+                dedup=seen,
+                profiler=profiler,
+                docstats=stats,
+                shard=shard,
+                queue=lq,
+            )
             # print('overwrite', not nowrite)
             g.run(overwrite=not nowrite, prefix=m, num=num)
+    if lq is not None:
+        click.secho(f"queue {queue}: {lq.stats()}", fg="blue")
+        lq.close()
+    if profiler is not None:
+        profiler.save()
+    if stats is not None and docstats:
+        stats.save(docstats)
+    selector_stats_report(selector_stats)
+
+
+@cli.command(name="docstats")
+@click.option("--out", metavar="FILE", help="save the merged statistics to FILE")
+@click.option("--top", default=15, help="unrecognised headings to show per section")
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True))
+def docstats_cmd(files: tuple[str, ...], out: str | None = None, top: int = 15) -> None:
+    """Merge --docstats files and report section headings.
+
+    Shows the headings picked for abstract, methods and results in each module
+    and headings that look like one of them but are not recognised.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ._docstats import DocStats
+
+    stats = DocStats()
+    for fname in files:
+        stats.merge(DocStats.load(fname))
+    if out:
+        stats.save(out)
+    stats.report(top=top)
 
 
 @cli.command()
@@ -363,8 +587,54 @@ def cleandirs(d: str | None) -> None:
     show_default=True,
 )
 @click.option("--mx", default=3, help="max documents to download 0=all")
-def download(mod: str = "", sleep: float = 10.0, mx: int = 1, issn: str = "") -> None:
+@click.option(
+    "--workers",
+    type=int,
+    help="number of concurrent downloads per journal [default: module specific]",
+)
+@click.option(
+    "--head",
+    default=False,
+    is_flag=True,
+    help="don't run the browser (for selenium modules) headless",
+)
+@click.option(
+    "--retry-failed",
+    metavar="KINDS",
+    default="",
+    help="download the failed papers of these comma separated kinds again:"
+    " transient (e.g. 429, 503, timeouts), permanent (e.g. 404), layout"
+    " (rejected by check_soup) or all",
+)
+@shard_options
+@throttle_option
+def download(
+    mod: str = "",
+    sleep: float = 10.0,
+    mx: int = 1,
+    issn: str = "",
+    workers: int | None = None,
+    head: bool = False,
+    shard: Shard | None = None,
+    queue: str | None = None,
+    lease: float = 600.0,
+    retry_failed: str = "",
+    throttle: Throttle | None = None,
+) -> None:
     """Download html/xml from websites."""
+    # pylint: disable=import-outside-toplevel
+    from ._browser import BrowserSession
+    from ._mlabc import FAILURES
+
+    kinds = tuple(k.strip() for k in retry_failed.split(",") if k.strip())
+    if "all" in kinds:
+        kinds = FAILURES
+    if set(kinds) - set(FAILURES):
+        raise click.BadParameter(
+            f"unknown kinds {retry_failed!r}: use {', '.join(FAILURES)} or all",
+            param_hint="--retry-failed",
+        )
+
     if mod:
         mods = [s.strip() for s in mod.split(",")]
         exclude = {m[1:] for m in mods if m[0] == "-"}
@@ -378,16 +648,382 @@ def download(mod: str = "", sleep: float = 10.0, mx: int = 1, issn: str = "") ->
         issns = {i.strip() for i in issn.split(",")}
     else:
         issns = None
+    lq = make_queue(queue, lease)
+    start = time.time()
+    # one browser (started on first use) for every selenium journal
+    with BrowserSession(headless=not head) as session:
+        for m in mods:
+            if m in exclude:
+                continue
+            d = getmod(m)
+            for iissn in d["issn"]:
+                if issns and iissn not in issns:
+                    continue
+                # print("downloading:", m, iissn)
+                func = d["download"]
+                kwargs: dict[str, Any] = dict(
+                    browser_session=session,
+                    shard=shard,
+                    queue=lq,
+                    retry_failed=kinds,
+                    throttle=throttle,
+                )
+                if workers:
+                    kwargs["workers"] = workers
+                func(iissn, sleep=sleep, mx=mx, **kwargs)
+    if lq is not None:
+        click.secho(f"queue {queue}: {lq.stats()}", fg="blue")
+        lq.close()
+    if throttle is not None:
+        throttle.report(since=start)
+
+
+@cli.command()
+@mod_option
+@click.option(
+    "--interval",
+    default=60.0,
+    help="seconds between checks for new pmids and downloads",
+    show_default=True,
+)
+@click.option("--once", is_flag=True, help="run one update cycle and exit")
+@click.option(
+    "--sleep",
+    default=10.0,
+    help="wait sleep seconds between download requests",
+    show_default=True,
+)
+@click.option("--mx", default=0, help="max documents to download per journal 0=all")
+@click.option(
+    "--workers",
+    type=int,
+    help="number of concurrent downloads per journal [default: module specific]",
+)
+@click.option(
+    "--head",
+    default=False,
+    is_flag=True,
+    help="don't run the browser (for selenium modules) headless",
+)
+@click.option("--email", help="your email address for NCBI E-Utilities")
+@click.option("--api-key", help="your NCBI API_KEY")
+@click.option(
+    "--col",
+    default=0,
+    help="column in file that contains the pubmed ID",
+    show_default=True,
+)
+@click.option("--noheader", is_flag=True, help="csvfile has no header")
+@click.option(
+    "--state",
+    metavar="FILE",
+    help="progress file [default: {DATADIR}/watch.json]",
+)
+@throttle_option
+@click.argument("csvfile", type=click.Path(dir_okay=False, file_okay=True))
+@click.pass_context
+def watch(
+    ctx: click.Context,
+    csvfile: str,
+    mod: str = "",
+    interval: float = 60.0,
+    once: bool = False,
+    sleep: float = 10.0,
+    mx: int = 0,
+    workers: int | None = None,
+    head: bool = False,
+    email: str | None = None,
+    api_key: str | None = None,
+    col: int = 0,
+    noheader: bool = False,
+    state: str | None = None,
+    throttle: Throttle | None = None,
+) -> None:
+    """Keep metadata, downloads and clean documents up to date with CSVFILE.
+
+    Watches the pmid CSVFILE and the download directories: new pmids get
+    their metadata fetched and are downloaded, new downloads are cleaned and
+    the journal reports (tohtml) refreshed.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ._browser import BrowserSession
+    from ._watch import Watcher
+
+    if mod:
+        mods = [s.strip() for s in mod.split(",")]
+    else:
+        mods = MODS
+
+    def refresh(mods: list[str], issns: list[str]) -> None:
+        ctx.invoke(tohtml, mod=",".join(mods), issn=",".join(issns))
+
+    with BrowserSession(headless=not head) as session:
+        w = Watcher(
+            csvfile,
+            {m: getmod(m) for m in mods},
+            refresh,
+            header=not noheader,
+            pcol=col,
+            email=email,
+            api_key=api_key,
+            sleep=sleep,
+            mx=mx,
+            workers=workers,
+            browser_session=session,
+            statefile=state,
+            throttle=throttle,
+        )
+        try:
+            w.run(interval=interval, once=once)
+        except KeyboardInterrupt:
+            w.save("stopped")
+
+
+@cli.command()
+@click.option(
+    "--host", default="127.0.0.1", help="address to listen on", show_default=True
+)
+@click.option("--port", default=8000, help="port to listen on", show_default=True)
+@click.option(
+    "--cache-size",
+    default=10000,
+    help="number of parsed documents to keep in memory",
+    show_default=True,
+)
+@click.option(
+    "--rescan",
+    default=60.0,
+    help="seconds between checks for new cleaned documents (0=never)",
+    show_default=True,
+)
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    cache_size: int = 10000,
+    rescan: float = 60.0,
+) -> None:
+    """Serve the cleaned documents as a read-only JSON API.
+
+    GET /docs/PMID, GET /docs?pmids=... (or POST /docs with a JSON body
+    {"pmids": [...]}) and GET /export?issn=...&year=2015-2020 (JSON lines).
+    All take sections=abstract,results,methods,full_text.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ._serve import serve as serve_
+
+    serve_(host=host, port=port, cache_size=cache_size, rescan=rescan)
+
+
+@cli.command()
+@mod_option
+@click.option(
+    "--samples",
+    default=2000,
+    help="max number of documents per module to train the dictionary on",
+    show_default=True,
+)
+@click.option(
+    "--dict-size",
+    default=112640,
+    help="zstd dictionary size in bytes",
+    show_default=True,
+)
+@click.option("--retrain", is_flag=True, help="retrain existing dictionaries")
+def compress(
+    mod: str = "",
+    samples: int = 2000,
+    dict_size: int = 112640,
+    retrain: bool = False,
+) -> None:
+    """Compress downloads with a zstd dictionary trained for each module.
+
+    New downloads for a module are compressed once its dictionary exists.
+    Deduplicated documents (see dedup) stay linked to a (compressed) blob.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ._store import blobstore, codec, DirStore
+
+    conf = getconfig()
+    if mod:
+        mods = [s.strip() for s in mod.split(",")]
+    else:
+        mods = MODS
+    c = codec()
     for m in mods:
-        if m in exclude:
-            continue
         d = getmod(m)
-        for iissn in d["issn"]:
-            if issns and iissn not in issns:
+        gdirs = [DirStore(os.path.join(conf.data_dir, f"xml_{i}")) for i in d["issn"]]
+        fdirs = [
+            DirStore(os.path.join(conf.data_dir, f"failed_{i}")) for i in d["issn"]
+        ]
+        gdirs = [g for g in gdirs if os.path.isdir(g.directory)]
+        fdirs = [f for f in fdirs if os.path.isdir(f.directory)]
+        if not gdirs:
+            continue
+        if retrain or c.for_module(m) is None:
+            n = max(1, samples // len(gdirs))
+            sample = [data for g in gdirs for data in g.samples(n)]
+            if len(sample) < 10:
+                click.secho(f"{m}: not enough documents to train on", fg="yellow")
                 continue
-            # print("downloading:", m, iissn)
-            func = d["download"]
-            func(iissn, sleep=sleep, mx=mx)  # type: ignore
+            zd = c.train(sample, m, size=dict_size)
+            click.secho(
+                f"{m}: trained dictionary {zd.dict_id()} on {len(sample)} documents",
+                fg="blue",
+            )
+        before = after = 0
+        for g in gdirs + fdirs:
+            b, a = g.compress(m)
+            before += b
+            after += a
+        if before:
+            click.secho(
+                f"{m}: {before/1e6:.1f}MB -> {after/1e6:.1f}MB"
+                f" ({100 * (1 - after / before):.0f}% saved)",
+                fg="green",
+            )
+    # the uncompressed blobs are no longer linked from anywhere
+    ngc, gcsize = blobstore().gc()
+    if ngc:
+        click.secho(
+            f"{ngc} unreferenced blobs: {gcsize/1e6:.1f}MB reclaimed",
+            fg="green",
+        )
+
+
+@cli.command()
+@click.option("--dry-run", is_flag=True, help="only report what would be reclaimed")
+def dedup(dry_run: bool = False) -> None:
+    """Store identical downloads only once.
+
+    Documents in xml_* directories become hard links into {DATADIR}/blobs.
+    Once that directory exists new downloads are stored the same way.
+    """
+    # pylint: disable=import-outside-toplevel
+    from glob import glob
+    from ._store import blobstore, DirStore
+
+    conf = getconfig()
+    blobs = blobstore()
+    files = (
+        f
+        for d in sorted(glob(os.path.join(conf.data_dir, "xml_*")))
+        if os.path.isdir(d)
+        for f in DirStore(d).files()
+    )
+    nfiles, nunique, saved = blobs.dedup(files, dry_run=dry_run)
+    ngc, gcsize = blobs.gc(dry_run=dry_run)
+    click.secho(
+        f"{nfiles} documents, {nunique} unique: {saved/1e6:.1f}MB reclaimed",
+        fg="green",
+    )
+    if ngc:
+        click.secho(
+            f"{ngc} unreferenced blobs: {gcsize/1e6:.1f}MB reclaimed",
+            fg="green",
+        )
+
+
+@cli.group()
+def bench() -> None:
+    """Benchmark cleaning on a frozen set of pages."""
+
+
+@bench.command()
+@mod_option
+@click.option(
+    "--dir",
+    "directory",
+    type=click.Path(file_okay=False),
+    help="fixture directory [default: {DATADIR}/bench]",
+)
+@click.option(
+    "--per-layout",
+    default=3,
+    help="number of pages to keep for each layout",
+    show_default=True,
+)
+@click.option(
+    "--scan",
+    default=100,
+    help="number of pages per journal to look at",
+    show_default=True,
+)
+def freeze(
+    mod: str = "",
+    directory: str | None = None,
+    per_layout: int = 3,
+    scan: int = 100,
+) -> None:
+    """Copy representative downloaded pages for each module."""
+    # pylint: disable=import-outside-toplevel
+    from ._bench import bench_dir, freeze as freeze_mod
+    from ._mlabc import pmid2doi
+
+    directory = bench_dir(directory)
+    mods = [s.strip() for s in mod.split(",")] if mod else MODS
+    p2d = pmid2doi(lambda doi, issn: True)
+    for m in mods:
+        layouts = freeze_mod(m, directory, p2d, per_layout=per_layout, scan=scan)
+        if layouts:
+            click.secho(
+                f"{m}: " + ", ".join(f"{k} {v}" for k, v in sorted(layouts.items())),
+                fg="green",
+            )
+
+
+@bench.command(name="run")
+@mod_option
+@click.option(
+    "--dir",
+    "directory",
+    type=click.Path(file_okay=False),
+    help="fixture directory [default: {DATADIR}/bench]",
+)
+@click.option("--repeat", default=3, help="best of repeat runs", show_default=True)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False),
+    help="baseline file [default: {dir}/baseline.json]",
+)
+@click.option("--save", is_flag=True, help="save results as the new baseline")
+@click.option(
+    "--threshold",
+    default=0.2,
+    help="fail if throughput drops by more than this fraction",
+    show_default=True,
+)
+def bench_run(
+    mod: str = "",
+    directory: str | None = None,
+    repeat: int = 3,
+    baseline: str | None = None,
+    save: bool = False,
+    threshold: float = 0.2,
+) -> None:
+    """Time get_soup, Clean methods, tostr and reduce_nums per module."""
+    # pylint: disable=import-outside-toplevel
+    import json
+    from ._bench import BASELINE, bench_dir, compare, run, write_json
+
+    directory = bench_dir(directory)
+    mods = [s.strip() for s in mod.split(",")] if mod else MODS
+    if baseline is None:
+        baseline = os.path.join(directory, BASELINE)
+    base = {}
+    if os.path.exists(baseline):
+        with open(baseline, encoding="utf-8") as fp:
+            base = json.load(fp)
+    results = run(mods, directory, repeat=repeat)
+    if not results:
+        raise click.ClickException(
+            f"no pages in {directory}: run 'nlpready bench freeze' first",
+        )
+    regressed = compare(results, base, threshold=threshold)
+    if save:
+        write_json(baseline, {**base, **results})
+        click.secho(f"saved baseline {baseline}", fg="blue")
+    elif regressed:
+        raise click.ClickException(f"throughput regressed: {', '.join(regressed)}")
 
 
 @cli.command()
@@ -429,6 +1065,17 @@ def summary() -> None:
     show_default=True,
 )
 @click.option("--noheader", is_flag=True, help="csvfile has no header")
+@click.option(
+    "--from-baseline",
+    "baseline",
+    help="directory of PubMed baseline/updatefiles (*.xml.gz) to use instead of NCBI",
+    type=click.Path(dir_okay=True, file_okay=False, exists=True),
+)
+@click.option(
+    "--processes",
+    type=int,
+    help="number of processes to scan baseline files [default: #cpus]",
+)
 @click.argument("csvfile", type=click.Path(dir_okay=False, exists=True, file_okay=True))
 def journals(
     csvfile: str,
@@ -439,15 +1086,28 @@ def journals(
     col: int = 0,
     sleep: float = 0.37,
     batch_size: int = 10,
+    baseline: str | None = None,
+    processes: int | None = None,
 ) -> None:
     """Create a CSV of (pmid, issn, name, year, doi, pmcid, title) from list of pubmed IDs."""
     # pylint: disable=import-outside-toplevel
-    from ._download import getmeta
+    from ._download import getmeta, getmeta_baseline
 
     conf = getconfig()
     if out is None:
         out = conf.suba_csv
 
+    if baseline:
+        getmeta_baseline(
+            csvfile,
+            pubmeds=out,
+            directory=baseline,
+            header=not noheader,
+            pcol=col,
+            processes=processes,
+        )
+        return
+
     if not email:
         if conf.email:
             email = conf.email
@@ -484,9 +1144,6 @@ blocked from the NCBI site.""",
     )
 
 
-FAKE_ISSN = {"epmc", "elsevier"}
-
-
 @cli.command()
 def issn() -> None:
     """Print all known ISSN,journals."""
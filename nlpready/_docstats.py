@@ -0,0 +1,158 @@
+"""Heading and class statistics of the cleaned documents.
+
+Opt in with ``nlpready clean --docstats FILE`` (or ``tohtml``). Each Generate
+then records the section headings and section classes of every document it
+cleans and which headings were picked as abstract, methods and results. The
+sections found by the accessors are reused, so no extra pass is needed
+(see Clean.section_headings). A DocStats is thread safe and
+several files (e.g. from parallel runs) merge with ``nlpready docstats``,
+which also lists headings that look like abstract/methods/results but are
+not recognised (synonyms to add to Clean.RESULTS and Clean.METHODS or a
+module's own lists).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import Counter
+from collections import defaultdict
+from typing import Any
+from typing import TYPE_CHECKING
+
+import click
+
+if TYPE_CHECKING:
+    from bs4 import Tag
+    from ._mlabc import Clean
+
+# section -> words that suggest a heading is about it
+HINTS = {
+    "abstract": ("abstract", "summary"),
+    "methods": ("method", "procedure", "experimental", "protocol"),
+    "results": ("result", "finding"),
+}
+
+
+def default_known() -> dict[str, tuple[str, ...]]:
+    # pylint: disable=import-outside-toplevel
+    from ._mlabc import Clean
+
+    return dict(abstract=("abstract",), methods=Clean.METHODS, results=Clean.RESULTS)
+
+
+class DocStats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.docs: Counter[str] = Counter()  # module -> documents
+        # (module, heading) -> documents with that heading
+        self.headings: Counter[tuple[str, str]] = Counter()
+        self.classes: Counter[tuple[str, str]] = Counter()
+        # (module, section, heading) -> documents where it was picked
+        self.picked: Counter[tuple[str, str, str]] = Counter()
+        self.missing: Counter[tuple[str, str]] = Counter()  # (module, section)
+
+    def collect(self, module: str, e: Clean, found: dict[str, list[Tag]]) -> None:
+        """Record the sections of e; found maps "abstract" etc. to the sections used."""
+        names = set()
+        classes = set()
+        for name, cls in e.section_headings():
+            if name:
+                names.add(name)
+            classes.update(cls)
+        picked: list[tuple[str, str | None]] = []
+        for section, seclist in found.items():
+            if not seclist:
+                picked.append((section, None))
+            else:
+                picked.append((section, e.section_title(seclist) or ""))
+        with self.lock:
+            self.docs[module] += 1
+            for name in names:
+                self.headings[(module, name)] += 1
+            for c in classes:
+                self.classes[(module, c)] += 1
+            for section, name in picked:
+                if name is None:
+                    self.missing[(module, section)] += 1
+                else:
+                    self.picked[(module, section, name)] += 1
+
+    def merge(self, other: DocStats) -> DocStats:
+        with self.lock:
+            self.docs.update(other.docs)
+            self.headings.update(other.headings)
+            self.classes.update(other.classes)
+            self.picked.update(other.picked)
+            self.missing.update(other.missing)
+        return self
+
+    def todict(self) -> dict[str, Any]:
+        with self.lock:
+            return dict(
+                docs=dict(self.docs),
+                headings=[[*k, v] for k, v in sorted(self.headings.items())],
+                classes=[[*k, v] for k, v in sorted(self.classes.items())],
+                picked=[[*k, v] for k, v in sorted(self.picked.items())],
+                missing=[[*k, v] for k, v in sorted(self.missing.items())],
+            )
+
+    @classmethod
+    def fromdict(cls, d: dict[str, Any]) -> DocStats:
+        s = cls()
+        s.docs.update(d["docs"])
+        for attr in ("headings", "classes", "picked", "missing"):
+            counter = getattr(s, attr)
+            for *k, v in d[attr]:
+                counter[tuple(k)] += v
+        return s
+
+    def save(self, fname: str) -> None:
+        tmp = f"{fname}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump(self.todict(), fp, indent=2)
+        os.replace(tmp, fname)
+
+    @classmethod
+    def load(cls, fname: str) -> DocStats:
+        with open(fname, encoding="utf-8") as fp:
+            return cls.fromdict(json.load(fp))
+
+    def synonyms(self, known: dict[str, tuple[str, ...]]) -> dict[str, Counter[str]]:
+        """Headings (across all modules) that look like a section but are not known."""
+        ret: dict[str, Counter[str]] = defaultdict(Counter)
+        for (_, name), n in self.headings.items():
+            for section, hints in HINTS.items():
+                if name in known.get(section, ()):
+                    continue
+                if any(h in name for h in hints):
+                    ret[section][name] += n
+        return ret
+
+    def report(
+        self,
+        known: dict[str, tuple[str, ...]] | None = None,
+        top: int = 15,
+    ) -> None:
+        if known is None:
+            known = default_known()
+        for module, n in sorted(self.docs.items()):
+            click.secho(f"{module}: {n} documents", fg="blue")
+            for section in ("abstract", "methods", "results"):
+                miss = self.missing[(module, section)]
+                picks = Counter(
+                    {
+                        name: v
+                        for (m, s, name), v in self.picked.items()
+                        if m == module and s == section
+                    },
+                )
+                common = ", ".join(f'"{k}" {v}' for k, v in picks.most_common(3))
+                fg = "red" if miss else None
+                click.secho(f"  {section:8} missing {miss:5}  {common}", fg=fg)
+        for section, names in sorted(self.synonyms(known).items()):
+            click.secho(f"unrecognised {section} headings:", fg="yellow")
+            for name, v in names.most_common(top):
+                mods = sorted(m for (m, h) in self.headings if h == name)
+                click.echo(f"  {v:6} {name!r} ({', '.join(mods)})")
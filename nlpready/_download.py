@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import csv
+import gzip
 import os
 import re
 import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
 from io import BytesIO
 from itertools import batched
 from typing import Iterator
@@ -48,6 +51,87 @@ def fetchpubmed(
     return resp.content  # need buffer for parsing
 
 
+def parse_article(diva: etree._Element) -> NCBIPaper | None:
+    """Parse a single PubmedArticle element."""
+    article = diva.find("MedlineCitation/Article")
+    if article is None:
+        return None
+    t = diva.findtext("MedlineCitation/PMID")
+    if not t:
+        return None
+    pmid: str = t.strip()
+    title: str | None = article.findtext("ArticleTitle")
+    abstract = article.findtext("Abstract/AbstractText")
+    authors = article.findall("AuthorList/Author")
+    pages = article.findtext("Pagination/MedlinePgn")
+    journal = article.find("Journal")
+    year = -1
+    if journal is not None:
+
+        name = journal.findtext("ISOAbbreviation", None) or journal.findtext(
+            "Title",
+            "",
+        )
+        volume = journal.findtext("JournalIssue/Volume")
+        issue = journal.findtext("JournalIssue/Issue")
+        yearx = journal.findtext("JournalIssue/PubDate/Year")
+        yearx = yearx or journal.findtext("JournalIssue/PubDate/MedlineDate")
+        if yearx:
+            yearx = yearx.strip()[:4]
+
+            year = int(yearx)
+
+        issn = journal.findtext("ISSN")
+        issn = issn.strip() if issn else None
+    else:
+        name = volume = issue = issn = None
+
+    data = diva.find("PubmedData")
+    if data is not None:
+        ids = data.findall("ArticleIdList/ArticleId")
+        if ids:
+            doil = [i.text.strip() for i in ids if i.get("IdType") == "doi" and i.text]
+            doi: str | None
+            if doil:
+                doi = doil[0]
+            else:
+                doi = None
+            pmcidl = [
+                i.text.strip() for i in ids if i.get("IdType") == "pmc" and i.text
+            ]
+            if pmcidl:
+                pmcid = pmcidl[0]
+            else:
+                pmcid = None
+        else:
+            doi = pmcid = None
+    else:
+        doi = pmcid = None
+
+    # elementtree tries to encode everything as ascii
+    # or if that fails it leaves the string alone
+    # alist = [(a.findtext('LastName'), a.findtext('ForeName'), a.findtext('Initials'))
+    #          for a in authors]
+    alist = [
+        (a.findtext("ForeName"), a.findtext("Initials"), a.findtext("LastName"))
+        for a in authors
+    ]
+    return NCBIPaper(
+        pmid=pmid,
+        year=year,
+        title=title,
+        abstract=abstract,
+        authors=alist,
+        journal=name,
+        volume=volume,
+        issue=issue,
+        pages=pages,
+        doi=doi or "",
+        issn=issn,
+        pmcid=pmcid,
+    )
+
+
 def parse_xml(xml: bytes) -> Iterator[NCBIPaper]:
     """Parse NCBI Journal metadata into a dictionary."""
     ipt = BytesIO(xml)
@@ -56,85 +140,9 @@ def parse_xml(xml: bytes) -> Iterator[NCBIPaper]:
     if error == "ERROR":  # no id
         return None
     for diva in tree.findall("PubmedArticle"):
-        article = diva.find("MedlineCitation/Article")
-        if article is None:
-            continue
-        t = diva.findtext("MedlineCitation/PMID")
-        if not t:
-            continue
-        pmid: str = t.strip()
-        title: str | None = article.findtext("ArticleTitle")
-        abstract = article.findtext("Abstract/AbstractText")
-        authors = article.findall("AuthorList/Author")
-        pages = article.findtext("Pagination/MedlinePgn")
-        journal = article.find("Journal")
-        if journal is not None:
-
-            name = journal.findtext("ISOAbbreviation", None) or journal.findtext(
-                "Title",
-                "",
-            )
-            volume = journal.findtext("JournalIssue/Volume")
-            issue = journal.findtext("JournalIssue/Issue")
-            yearx = journal.findtext("JournalIssue/PubDate/Year")
-            yearx = yearx or journal.findtext("JournalIssue/PubDate/MedlineDate")
-            if yearx:
-                yearx = yearx.strip()[:4]
-
-                year = int(yearx)
-
-            issn = journal.findtext("ISSN")
-            issn = issn.strip() if issn else None
-        else:
-            name = volume = issue = issn = None
-            year = -1
-
-        data = diva.find("PubmedData")
-        if data is not None:
-            ids = data.findall("ArticleIdList/ArticleId")
-            if ids:
-                doil = [
-                    i.text.strip() for i in ids if i.get("IdType") == "doi" and i.text
-                ]
-                doi: str | None
-                if doil:
-                    doi = doil[0]
-                else:
-                    doi = None
-                pmcidl = [
-                    i.text.strip() for i in ids if i.get("IdType") == "pmc" and i.text
-                ]
-                if pmcidl:
-                    pmcid = pmcidl[0]
-                else:
-                    pmcid = None
-            else:
-                doi = pmcid = None
-        else:
-            doi = pmcid = None
-
-        # elementtree tries to encode everything as ascii
-        # or if that fails it leaves the string alone
-        # alist = [(a.findtext('LastName'), a.findtext('ForeName'), a.findtext('Initials'))
-        #          for a in authors]
-        alist = [
-            (a.findtext("ForeName"), a.findtext("Initials"), a.findtext("LastName"))
-            for a in authors
-        ]
-        yield NCBIPaper(
-            pmid=pmid,
-            year=year,
-            title=title,
-            abstract=abstract,
-            authors=alist,
-            journal=name,
-            volume=volume,
-            issue=issue,
-            pages=pages,
-            doi=doi or "",
-            issn=issn,
-            pmcid=pmcid,
-        )
+        paper = parse_article(diva)
+        if paper is not None:
+            yield paper
 
     # return data from xml file at NIH in a pythonic dictionary
 
@@ -153,6 +161,30 @@ def pubmed_meta(
     yield from parse_xml(xml)
 
 
+HEADER = ["pmid", "issn", "name", "year", "doi", "pmcid", "title"]
+
+
+def csvrow(m: NCBIPaper) -> list[str]:
+    return [
+        m.pmid,
+        m.issn or "",
+        m.journal or "",
+        str(m.year),
+        m.doi or "",
+        m.pmcid or "",
+        m.title or "",
+    ]
+
+
+def read_done(pubmeds: str) -> set[str]:
+    if not os.path.exists(pubmeds):
+        return set()
+    with open(pubmeds, encoding="utf8") as fp:
+        R = csv.reader(fp)
+        next(R)  # skip header
+        return {row[0] for row in R}
+
+
 def getmeta(
     csvfile: str,
     pubmeds: str,
@@ -167,13 +199,7 @@ def getmeta(
 
     session = requests.Session()
     e = os.path.exists(pubmeds)
-    if e:
-        with open(pubmeds, encoding="utf8") as fp:
-            R = csv.reader(fp)
-            next(R)  # skip header
-            done = {row[0] for row in R}
-    else:
-        done = set()
+    done = read_done(pubmeds)
 
     todo = [
         pmid
@@ -185,7 +211,7 @@ def getmeta(
     with open(pubmeds, "a", encoding="utf8") as fp:
         W = csv.writer(fp)
         if not e:
-            W.writerow(["pmid", "issn", "name", "year", "doi", "pmcid", "title"])
+            W.writerow(HEADER)
             fp.flush()
         for pmids in batched(todo, batch_size):
             d = []
@@ -194,17 +220,7 @@ def getmeta(
                 if not pubmed:
                     continue
                 d.append(pubmed)
-                W.writerow(
-                    [
-                        pubmed,
-                        m.issn or "",
-                        m.journal,
-                        str(m.year),
-                        m.doi or "",
-                        m.pmcid or "",
-                        m.title or "",
-                    ],
-                )
+                W.writerow(csvrow(m))
                 fp.flush()  # in case of interrupt.
                 done.add(pubmed)
             for p in pmids:
@@ -215,6 +231,120 @@ def getmeta(
                 time.sleep(sleep)  # be nice :)
 
 
+# PubMed baseline/updatefiles from https://ftp.ncbi.nlm.nih.gov/pubmed/
+# e.g. pubmed25n0001.xml.gz ... The update files continue the numbering
+# so sorting on the basename gives the order in which they must be applied.
+
+_PMIDS: set[str] = set()
+
+
+def _init_baseline(pmids: set[str]) -> None:
+    global _PMIDS  # pylint: disable=global-statement
+    _PMIDS = pmids
+
+
+def scan_baseline(fname: str) -> tuple[str, list[NCBIPaper], list[str]]:
+    """Stream a gzipped PubMed XML file returning the wanted articles
+    and any deleted pmids."""
+    found: list[NCBIPaper] = []
+    deleted: list[str] = []
+    with gzip.open(fname, "rb") as fp:
+        for _, elem in etree.iterparse(
+            fp,
+            events=("end",),
+            tag=("PubmedArticle", "PubmedBookArticle", "DeleteCitation"),
+        ):
+            if elem.tag == "DeleteCitation":
+                for p in elem.iterfind("PMID"):
+                    pmid = (p.text or "").strip()
+                    if pmid in _PMIDS:
+                        deleted.append(pmid)
+            elif elem.tag == "PubmedArticle":
+                pmid = (elem.findtext("MedlineCitation/PMID") or "").strip()
+                if pmid in _PMIDS:
+                    paper = parse_article(elem)
+                    if paper is not None:
+                        found.append(paper)
+            # free memory as we go
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    return fname, found, deleted
+
+
+def baseline_files(directory: str) -> list[str]:
+    files = glob(os.path.join(directory, "**", "*.xml.gz"), recursive=True)
+    return sorted(files, key=os.path.basename)
+
+
+def baseline_meta(
+    directory: str,
+    pmids: set[str],
+    processes: int | None = None,
+) -> dict[str, NCBIPaper]:
+    """Find metadata for pmids from local PubMed baseline/updatefiles.
+
+    Later files override earlier ones.
+    """
+    files = baseline_files(directory)
+    if not files:
+        raise click.ClickException(f'no "*.xml.gz" files found in "{directory}"')
+    ret: dict[str, NCBIPaper] = {}
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_baseline,
+        initargs=(pmids,),
+    ) as executor:
+        # map returns results in file order
+        for fname, found, deleted in executor.map(scan_baseline, files):
+            for paper in found:
+                ret[paper.pmid] = paper
+            for pmid in deleted:
+                ret.pop(pmid, None)
+            click.secho(
+                f"{os.path.basename(fname)}: {len(found)} found, {len(ret)} total",
+                fg="green",
+            )
+    return ret
+
+
+def getmeta_baseline(
+    csvfile: str,
+    pubmeds: str,
+    directory: str,
+    header: bool = True,
+    pcol: int = 0,
+    processes: int | None = None,
+) -> None:
+    """Create a CSV of (pmid, issn, name, year, doi, title) from list of pubmed IDs
+    using local PubMed baseline files instead of E-utilities."""
+    e = os.path.exists(pubmeds)
+    done = read_done(pubmeds)
+
+    todo = [
+        pmid
+        for pmid in read_pubmed_csv(csvfile, header=header, pcol=pcol)
+        if pmid not in done
+    ]
+    click.secho(f"{len(done)} done. {len(todo)} todo", fg="blue")
+    if not todo:
+        return
+    meta = baseline_meta(directory, set(todo), processes=processes)
+
+    with open(pubmeds, "a", encoding="utf8") as fp:
+        W = csv.writer(fp)
+        if not e:
+            W.writerow(HEADER)
+        for pmid in todo:
+            m = meta.get(pmid)
+            if m is None:
+                click.secho(f"missing {pmid}", fg="red", err=True)
+                continue
+            W.writerow(csvrow(m))
+            done.add(pmid)
+    click.secho(f"{len(meta)}/{len(todo)} found", fg="green")
+
+
 def journal_summary() -> None:
     """Summarize journal statistics."""
     # pylint: disable=import-outside-toplevel
@@ -0,0 +1,178 @@
+"""Stage timings and counters.
+
+Downloading and cleaning record how long each stage takes (fetch,
+check_soup, parse, each Clean section method, tostr, write ...) and count
+errors, labelled by module and ISSN. Use ``nlpready --metrics=FILE <command>``
+to save them at the end of a command: as a Prometheus textfile if FILE ends in
+``.prom`` otherwise as JSON ("-" for stdout).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import AbstractContextManager
+from contextlib import contextmanager
+from typing import Any
+from typing import Iterator
+
+# upper bounds of the histogram buckets in seconds (the last one is +Inf)
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PREFIX = "nlpready"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def make_labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def todict(self) -> dict[str, Any]:
+        return dict(
+            count=self.count,
+            sum=self.total,
+            mean=self.total / self.count if self.count else 0.0,
+            max=self.max,
+            buckets=dict(zip([str(b) for b in BUCKETS] + ["+Inf"], self.counts)),
+        )
+
+
+class Metrics:
+    """Thread safe collection of stage histograms and counters."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self.counters: dict[tuple[str, Labels], int] = {}
+        self.start = time.time()
+
+    def observe(self, stage: str, seconds: float, **labels: Any) -> None:
+        key = (stage, make_labels(labels))
+        with self.lock:
+            h = self.histograms.get(key)
+            if h is None:
+                h = self.histograms[key] = Histogram()
+            h.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str, **labels: Any) -> Iterator[None]:
+        """Time the body of a with statement as stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def inc(self, name: str, n: int = 1, /, **labels: Any) -> None:
+        key = (name, make_labels(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def clear(self) -> None:
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.start = time.time()
+
+    def todict(self) -> dict[str, Any]:
+        with self.lock:
+            return dict(
+                start=self.start,
+                end=time.time(),
+                stages=[
+                    dict(stage=stage, labels=dict(labels), **h.todict())
+                    for (stage, labels), h in sorted(self.histograms.items())
+                ],
+                counters=[
+                    dict(name=name, labels=dict(labels), value=v)
+                    for (name, labels), v in sorted(self.counters.items())
+                ],
+            )
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format."""
+
+        def fmt(labels: Labels, **extra: str) -> str:
+            lst = list(labels) + list(extra.items())
+            if not lst:
+                return ""
+            s = ",".join(
+                '{}="{}"'.format(
+                    k,
+                    v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+                )
+                for k, v in lst
+            )
+            return "{" + s + "}"
+
+        out = []
+        name = f"{PREFIX}_stage_seconds"
+        out.append(f"# HELP {name} time spent in each processing stage")
+        out.append(f"# TYPE {name} histogram")
+        with self.lock:
+            for (stage, labels), h in sorted(self.histograms.items()):
+                labels = (("stage", stage),) + labels
+                cum = 0
+                for b, c in zip([str(b) for b in BUCKETS] + ["+Inf"], h.counts):
+                    cum += c
+                    out.append(f"{name}_bucket{fmt(labels, le=b)} {cum}")
+                out.append(f"{name}_sum{fmt(labels)} {h.total}")
+                out.append(f"{name}_count{fmt(labels)} {h.count}")
+            names = sorted({n for n, _ in self.counters})
+            for n in names:
+                cname = f"{PREFIX}_{n}_total"
+                out.append(f"# TYPE {cname} counter")
+                for (n2, labels), v in sorted(self.counters.items()):
+                    if n2 == n:
+                        out.append(f"{cname}{fmt(labels)} {v}")
+        return "\n".join(out) + "\n"
+
+    def dump(self, fname: str) -> None:
+        """Save as JSON or, if fname ends with .prom, as a Prometheus textfile."""
+        if fname.endswith(".prom"):
+            txt = self.prometheus()
+        else:
+            txt = json.dumps(self.todict(), indent=2) + "\n"
+        if fname == "-":
+            sys.stdout.write(txt)
+            return
+        # atomic so a textfile collector never sees half a file
+        tmp = f"{fname}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            fp.write(txt)
+        os.replace(tmp, fname)
+
+
+METRICS = Metrics()
+
+
+def metrics() -> Metrics:
+    return METRICS
+
+
+def timer(stage: str, **labels: Any) -> AbstractContextManager[None]:
+    return METRICS.timer(stage, **labels)
+
+
+def inc(name: str, n: int = 1, /, **labels: Any) -> None:
+    METRICS.inc(name, n, **labels)
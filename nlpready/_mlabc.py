@@ -2,10 +2,17 @@ from __future__ import annotations
 
 import csv
 import os
+import random
 import re
+import shutil
 import sys
 import time
+from collections import Counter
 from collections import defaultdict
+from contextlib import AbstractContextManager
+from contextlib import nullcontext
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from io import BytesIO
 from os.path import join
@@ -19,22 +26,43 @@ from typing import TypedDict
 import click
 import requests
 from bs4 import BeautifulSoup
+from bs4 import Tag
 from requests import ConnectionError as RequestConnectionError
 from requests import Response as RequestResponse
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from urllib3.util.retry import Retry
 
+from ._browser import BrowserSession
+from ._metrics import inc
+from ._metrics import timer
 from ._rescantxt import find_primers
 from ._rescantxt import reduce_nums
+from ._selectors import compile_one
+from ._selectors import precompile
+from ._selectors import STATS as SELECTOR_STATS
+from ._store import digest
+from ._store import get_store
+from ._textview import Match
+from ._textview import TextView
+from ._throttle import retry_after
+from ._throttle import ThrottledAdapter
 from ._types import Paper
 from ._utils import data_dir
 from ._utils import getconfig
 
 if TYPE_CHECKING:
     from jinja2 import Environment
-    from bs4 import Tag
     from selenium.webdriver.remote.webdriver import WebDriver
+    from soupsieve import SoupSieve
+    from ._docstats import DocStats
+    from ._profile import Profiler
+    from ._shard import LeaseQueue
+    from ._shard import Shard
+    from ._throttle import Throttle
 
 
 # Simple fake requests Response Object
@@ -73,6 +101,9 @@ USER_AGENT = (
     " (KHTML, like Gecko) Chrome/64.0.3282.186 Safari/537.36"
 )
 
+# modules that are not tied to an ISSN (they pick their papers with want())
+FAKE_ISSN = {"epmc", "elsevier"}
+
 
 def ok(doi: str, issn: str) -> bool:
     return True
@@ -82,6 +113,15 @@ def pmid2doi(check=ok) -> dict[str, Paper]:
     return {p.pmid: p for p in read_suba_papers_csv() if check(p.doi, p.issn)}
 
 
+def issn2journal(papers: dict[str, Paper]) -> dict[str, str]:
+    """ISSN -> journal name index of papers.
+
+    Build this once and pass ``journal=`` to each Generate instead of letting
+    every instance scan pmid2doi.
+    """
+    return {p.issn: p.journal for p in papers.values() if p.issn and p.journal}
+
+
 def read_journals_csv() -> dict[str, Paper]:
     return pmid2doi()
 
@@ -95,6 +135,9 @@ def read_suba_papers_csv() -> Iterator[Paper]:
 def readx_suba_papers_csv(csvfile: str) -> Iterator[Paper]:
     if not os.path.isfile(csvfile):
         raise ValueError(f'"{csvfile}" is not a file!')
+    # issn, journal name and year repeat across thousands of rows:
+    # share one object for each distinct value
+    years: dict[str, int] = {}
     with open(csvfile, encoding="utf8") as fp:
         R = csv.reader(fp)
         r = next(R)  # skip header pylint: disable=stop-iteration-return
@@ -106,12 +149,15 @@ def readx_suba_papers_csv(csvfile: str) -> Iterator[Paper]:
             if not issn or issn == "missing-issn":
                 # click.secho("missing %s" % pmid, fg='yellow')
                 continue
+            y = years.get(year)
+            if y is None:
+                y = years[year] = int(year)
             yield Paper(
                 doi=doi,
                 pmid=pmid,
-                year=int(year),
-                issn=issn,
-                journal=journal or None,
+                year=y,
+                issn=sys.intern(issn),
+                journal=sys.intern(journal) if journal else None,
                 pmcid=pmcid or None,
                 title=title or None,
             )
@@ -148,14 +194,8 @@ def read_issn() -> dict[str, tuple[int, str]]:
 
 
 def readxml(d: str) -> Iterator[str]:
-    """Scan directory d and return the pubmed ids."""
-    dd = join(data_dir(), d)
-    if not os.path.isdir(dd):
-        return
-    for f in os.listdir(dd):
-        f, ext = os.path.splitext(f)
-        if ext in {".html", ".xml"}:
-            yield f
+    """Scan directory d (or any archived copy) and return the pubmed ids."""
+    yield from get_store(d).names()
 
 
 def dump(paper: Paper, xml: bytes) -> None:
@@ -165,8 +205,47 @@ def dump(paper: Paper, xml: bytes) -> None:
 
 _Plug = object()
 
+HEADING = re.compile(r"^h[1-6]$")
+
+
+class SectionIndex:
+    """Sections of a document by class and by heading, built in one pass.
+
+    Lookups return the first section in document order, as a loop over
+    ``select(css)`` checking each heading would.
+    """
+
+    def __init__(self, sections: list[Tag], names: list[str | None]) -> None:
+        self.entries = list(zip(sections, names))
+        self.byname: dict[str, Tag] = {}
+        self.byclass: dict[str, Tag] = {}
+        for sec, name in self.entries:
+            for c in sec.get_attribute_list("class"):
+                self.byclass.setdefault(c, sec)
+            if name:
+                self.byname.setdefault(name, sec)
+
+    def find(
+        self,
+        names: tuple[str, ...] = (),
+        classes: tuple[str, ...] = (),
+        suffix: bool = False,
+    ) -> list[Tag]:
+        """[first section with one of classes, else one of names] or []
+
+        With suffix a heading only has to end with one of names.
+        """
+        for c in classes:
+            if c in self.byclass:
+                return [self.byclass[c]]
+        for name, sec in self.byname.items():
+            if name.endswith(names) if suffix else name in names:
+                return [sec]
+        return []
+
 
 class Clean:
+    article: Tag
     SPACE: re.Pattern = re.compile(r"\s+", re.I)
     FIGURE: str = "[[FIGURE: %s]]"
     TABLE: str = "[[TABLE: %s]]"
@@ -176,10 +255,204 @@ class Clean:
     t: object | str | None = _Plug
     f: object | list[Tag] = _Plug
     x = _Plug
+    # Flat layouts (OUP, Science) have the headings and the paragraphs,
+    # figures and tables of each section as siblings in one container:
+    # see flat_sections.
+    FLAT_HEADING: str = "h2"
+    FLAT_ELEMENTS: Match = "p"
+    RESULTS = ("results", "results and discussion")
+    METHODS = (
+        "methods",
+        "experimental procedures",
+        "materials and methods",
+        "material and methods",  # spelling!
+    )
+    _byid: dict[str, Tag] | None = None
+    _flat: dict[int, dict[str, list[Tag]]] | None = None
+    _indexes: dict[tuple[str, str], SectionIndex] | None = None
+    # css -> compiled selector, built for each subclass when it is defined
+    # (see _selectors)
+    PUBLISHER: str = "mlabc"
+    SELECTORS: dict[str, SoupSieve] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.PUBLISHER = cls.__module__.rsplit(".", 1)[-1]
+        cls.SELECTORS = {**cls.SELECTORS, **precompile(cls.PUBLISHER, vars(cls))}
 
     def __init__(self, root: BeautifulSoup) -> None:
         self.root = root
 
+    def compiled(self, css: str) -> SoupSieve:
+        sel = self.SELECTORS.get(css)
+        if sel is None:
+            sel = compile_one(self.PUBLISHER, css, late=True)
+            type(self).SELECTORS[css] = sel
+        return sel
+
+    def view_compiled(self, css: str) -> SoupSieve:
+        """compiled for the TextViews: counts their lookups (--selector-stats)."""
+        if SELECTOR_STATS.enabled:
+            SELECTOR_STATS.looked_up(self.PUBLISHER, css)
+        return self.compiled(css)
+
+    def select(self, node: Tag, css: str) -> list[Tag]:
+        """node.select(css) with a precompiled selector."""
+        sel = self.compiled(css)
+        if not SELECTOR_STATS.enabled:
+            return sel.select(node)
+        start = time.perf_counter()
+        found = sel.select(node)
+        SELECTOR_STATS.selected(
+            self.PUBLISHER,
+            css,
+            time.perf_counter() - start,
+            len(found),
+        )
+        return found
+
+    def select_one(self, node: Tag, css: str) -> Tag | None:
+        """node.select_one(css) with a precompiled selector."""
+        sel = self.compiled(css)
+        if not SELECTOR_STATS.enabled:
+            return sel.select_one(node)
+        start = time.perf_counter()
+        found = sel.select_one(node)
+        SELECTOR_STATS.selected(
+            self.PUBLISHER,
+            css,
+            time.perf_counter() - start,
+            0 if found is None else 1,
+        )
+        return found
+
+    def view(self) -> TextView:
+        """A TextView that uses this class's selectors."""
+        return TextView(self.view_compiled)
+
+    @property
+    def byid(self) -> dict[str, Tag]:
+        """id -> element of the whole document, built on first use."""
+        if self._byid is None:
+            byid: dict[str, Tag] = {}
+            for tag in self.root.find_all(id=True):
+                byid.setdefault(str(tag["id"]), tag)  # first one like select
+            self._byid = byid
+        return self._byid
+
+    def section_name(self, heading: Tag) -> str:
+        """Normalized section name from its heading."""
+        return self.SPACE.sub(" ", heading.get_text()).strip().lower()
+
+    def sections(self, css: str = "div.section", heading: str = "h2") -> SectionIndex:
+        """Index of the css sections of the article named by their first heading.
+
+        Built on first use so results, methods ... share one scan.
+        """
+        if self._indexes is None:
+            self._indexes = {}
+        idx = self._indexes.get((css, heading))
+        if idx is None:
+            secs = self.select(self.article, css)
+            names = []
+            for sec in secs:
+                h = sec.find(heading)
+                names.append(self.section_name(h) if isinstance(h, Tag) else None)
+            idx = self._indexes[(css, heading)] = SectionIndex(secs, names)
+        return idx
+
+    def section_headings(self) -> list[tuple[str | None, list[str]]]:
+        """(name, classes) of the sections of the document (for DocStats).
+
+        Reuses what sections and flat_sections found for the accessors and
+        only indexes the div.section elements if neither was used.
+        """
+        if not self._indexes and not self._flat:
+            if getattr(self, "article", None) is None:
+                return []
+            self.sections()
+        ret: list[tuple[str | None, list[str]]] = []
+        for idx in (self._indexes or {}).values():
+            ret.extend(
+                (name, sec.get_attribute_list("class")) for sec, name in idx.entries
+            )
+        for flat in (self._flat or {}).values():
+            ret.extend((name, []) for name in flat if name)
+        return ret
+
+    def section_title(self, seclist: list[Tag]) -> str | None:
+        """Name of the section seclist was taken from."""
+        first = seclist[0]
+        for flat in (self._flat or {}).values():
+            for name, elements in flat.items():
+                if elements and elements[0] is first:
+                    return name
+        h = first.find(HEADING)
+        return self.section_name(h) if isinstance(h, Tag) else None
+
+    def flat_heading(self, tag: Tag) -> str | None:
+        """Section name if tag starts a new section of a flat layout."""
+        if tag.name == self.FLAT_HEADING:
+            return self.section_name(tag)
+        return None
+
+    def flat_sections(self, container: Tag | None = None) -> dict[str, list[Tag]]:
+        """FLAT_ELEMENTS children of container grouped under the heading before them.
+
+        One pass over the children of container (default: the article).
+        Elements before the first heading are under "". Use flat_paras and
+        TextView.select_all to get the text since these are the paragraphs
+        themselves rather than a section.
+        """
+        if container is None:
+            container = self.article
+        if self._flat is None:
+            self._flat = {}
+        ret = self._flat.get(id(container))
+        if ret is not None:
+            return ret
+        match = self.FLAT_ELEMENTS
+        test = self.compiled(match).match if isinstance(match, str) else match
+        ret = {}
+        target = ""
+        for d in container.contents:
+            if not isinstance(d, Tag):
+                continue
+            name = self.flat_heading(d)
+            if name is not None:
+                target = name
+            elif test(d):
+                ret.setdefault(target, []).append(d)
+        self._flat[id(container)] = ret
+        return ret
+
+    def flat_section(
+        self,
+        names: tuple[str, ...],
+        suffix: bool = False,
+        container: Tag | None = None,
+    ) -> list[Tag]:
+        """Elements of the flat section called one of names (in that order).
+
+        With suffix fall back to the first section whose name ends with one
+        of names.
+        """
+        flat = self.flat_sections(container)
+        for name in names:
+            if name in flat:
+                return flat[name]
+        if suffix:
+            for name, elements in flat.items():
+                if name.endswith(names):
+                    return elements
+        return []
+
+    def anchor(self, href: str) -> Tag | None:
+        """Resolve an internal link such as "#fig1" to its element."""
+        if href.startswith("#"):
+            return self.byid.get(href[1:])
+        return self.root.select_one(href)
+
     def find_title(
         self,
         sec: Tag,
@@ -224,25 +497,62 @@ class Clean:
         return []
 
     def tostr(self, seclist: list[Tag]) -> list[str]:
+        """Text of each paragraph of the sections.
 
-        txt = [
-            self.SPACE.sub(" ", p.get_text(" ", strip=True))
-            for sec in seclist
-            for p in sec.select("p")
-        ]
-        return txt
+        The soup is not modified: figures, tables and citations are replaced
+        with placeholders in a TextView (see replacements) so tostr can be
+        called any number of times on the same tree.
+        """
+        v = self.view()
+        self.replacements(v, seclist)
+        return self.paragraphs(v, seclist)
 
     def tostr2(self, sec: list[Tag]) -> list[str]:
-        def to_p(s: Tag) -> None:
-            a = self.root.new_tag("p")
-            a.string = s.text
-            s.replace_with(a)
-
+        """tostr with the h2, h3 and h4 headings as paragraphs."""
+        v = self.view()
         for s in sec:
-            for p in s.select("h2,h3,h4"):
-                to_p(p)
+            for h in v.select(s, "h2,h3,h4"):
+                a = self.root.new_tag("p")
+                a.string = v.text(h)
+                v.replace(h, a)
+        self.replacements(v, sec)
+        return self.paragraphs(v, sec)
+
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
+        """Replace figures, tables, citations etc. with placeholders in v."""
 
-        return self.tostr(sec)
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return self.paras(v, seclist, " ", strip=True)
+
+    def paras(
+        self,
+        v: TextView,
+        seclist: list[Tag],
+        separator: str = "",
+        strip: bool = False,
+        match: Match = "p",
+    ) -> list[str]:
+        """Text of every paragraph (css selector or function) in seclist."""
+        return [
+            self.SPACE.sub(" ", v.text(p, separator, strip))
+            for sec in seclist
+            for p in v.select(sec, match)
+        ]
+
+    def flat_paras(
+        self,
+        v: TextView,
+        seclist: list[Tag],
+        separator: str = "",
+        strip: bool = False,
+    ) -> list[str]:
+        """Text of each element of seclist (a flat_sections section)."""
+        txt = []
+        for el in seclist:
+            node = v.resolve(el)
+            if node is not None:
+                txt.append(self.SPACE.sub(" ", v.text(node, separator, strip)))
+        return txt
 
     def s_abstract(self) -> list[Tag]:
         if self.a is not _Plug:
@@ -310,18 +620,36 @@ class Clean:
         fmt: str,
         caption: str = "figcaption p",
         node: str = "p",
+        view: TextView | None = None,
     ) -> Tag:
-        captions = [c.get_text(" ", strip=True) for c in tag.select(caption)]
+        if view is None:
+            view = self.view()
+        captions = [view.text(c, " ", strip=True) for c in view.select(tag, caption)]
         txt = " ".join(captions)
         new_tag = self.root.new_tag(node)
         new_tag.string = fmt % txt
         return new_tag
 
-    def newfig(self, tag: Tag, caption: str = "figcaption p", node: str = "p") -> Tag:
-        return self._newfig(tag, self.FIGURE, caption=caption, node=node)
+    def newfig(
+        self,
+        tag: Tag,
+        caption: str = "figcaption p",
+        node: str = "p",
+        view: TextView | None = None,
+    ) -> Tag:
+        return self._newfig(tag, self.FIGURE, caption=caption, node=node, view=view)
+
+    def newtable(
+        self,
+        tag: Tag,
+        caption: str = "figcaption p",
+        node: str = "p",
+        view: TextView | None = None,
+    ) -> Tag:
+        return self._newfig(tag, self.TABLE, caption=caption, node=node, view=view)
+
 
-    def newtable(self, tag: Tag, caption: str = "figcaption p", node: str = "p") -> Tag:
-        return self._newfig(tag, self.TABLE, caption=caption, node=node)
+Clean.SELECTORS = precompile(Clean.PUBLISHER, vars(Clean))
 
 
 def make_jinja_env() -> Environment:
@@ -339,6 +667,9 @@ def make_jinja_env() -> Environment:
 class Generate:
     parser = "lxml"
     need_all = False
+    # (css selector, Clean subclass) for modules with several page layouts.
+    # The first selector that matches picks the Clean class (see create_clean).
+    layouts: list[tuple[str, type[Clean]]] = []
 
     def __init__(
         self,
@@ -349,6 +680,11 @@ class Generate:
         ) = None,  # pylint: disable=redefined-outer-name
         journal: str | None = None,
         partial: bool = False,
+        dedup: dict[tuple[type, str], str] | None = None,
+        profiler: Profiler | None = None,
+        docstats: DocStats | None = None,
+        shard: Shard | None = None,
+        queue: LeaseQueue | None = None,
         **kwargs: Any,
     ):
         self.issn = issn
@@ -356,6 +692,17 @@ class Generate:
         self._journal = journal
         self._onlynewer = onlynewer
         self.partial = partial
+        # (Generate class, sha256 of page) -> cleaned file; shared between
+        # Generate instances so identical pages are only cleaned once.
+        self.dedup = dedup
+        self.profiler = profiler
+        # opt-in heading/class statistics, shared between Generate instances
+        self.docstats = docstats
+        # only clean our part of the papers (see _shard)
+        self.shard = shard
+        self.queue = queue
+        self.layout_counts: Counter[str] = Counter()
+        self._dname: str | None = None
 
     @property
     def pmid2doi(self) -> dict[str, Paper]:
@@ -363,7 +710,7 @@ class Generate:
             return self._pmid2doi
 
         def check(doi, issn):
-            if self.issn in {"epmc", "elsevier"}:
+            if self.issn in FAKE_ISSN:
                 return True
             return doi and issn == self.issn
 
@@ -374,10 +721,10 @@ class Generate:
     def journal(self) -> str:
         if self._journal:
             return self._journal
-        if self.issn in {"epmc", "elsevier"}:
+        if self.issn in FAKE_ISSN:
             self._journal = self.issn
         else:
-            d = {p.issn: p.journal for p in self.pmid2doi.values() if p.journal}
+            d = issn2journal(self.pmid2doi)
             # d = read_issn()
             if self.issn in d:
                 # self._journal = d[self.issn][1]
@@ -386,10 +733,37 @@ class Generate:
                 self._journal = self.issn
         return self._journal
 
+    def layout(self, soup: BeautifulSoup) -> type[Clean]:
+        """Fingerprint the page layout with one selector check per layout.
+
+        If nothing matches the last layout is returned (whose constructor
+        will then complain).
+        """
+        for css, cls in self.layouts:
+            if soup.select_one(css) is not None:
+                name = cls.__name__
+                break
+        else:
+            cls = self.layouts[-1][1]
+            name = "unknown"
+        self.layout_counts[name] += 1
+        inc("layouts", layout=name, **self.labels)
+        return cls
+
     def create_clean(self, soup: BeautifulSoup, pmid: str) -> Clean:
-        raise NotImplementedError()
+        if not self.layouts:
+            raise NotImplementedError()
+        return self.layout(soup)(soup)
+
+    @property
+    def labels(self) -> dict[str, str]:
+        """Metric labels for this journal."""
+        return dict(module=type(self).__module__.rsplit(".", 1)[-1], issn=self.issn)
 
     def ensure_dir(self) -> str:
+        # called for every pmid (via clean_name) so only hit the filesystem once
+        if self._dname is not None:
+            return self._dname
         dname = join(data_dir(), "cleaned")
         if not os.path.isdir(dname):
             os.mkdir(dname)
@@ -398,18 +772,15 @@ class Generate:
         dname = join(dname, f"cleaned_{self.issn}_{name}")
         if not os.path.isdir(dname):
             os.mkdir(dname)
+        self._dname = dname
         return dname
 
     def get_xml_name(self, gdir: str, pmid: str) -> str:
         # pylint: disable=no-self-use
-        fname = join(data_dir(), gdir, f"{pmid}.html")
-        if not os.path.isfile(fname):
-            fname = join(data_dir(), gdir, f"{pmid}.xml")
-        return fname
+        return get_store(gdir).path(pmid)
 
     def get_soup(self, gdir: str, pmid: str) -> BeautifulSoup:
-        fname = self.get_xml_name(gdir, pmid)
-        with open(fname, "rb") as fp:
+        with get_store(gdir).open(pmid) as fp:
             soup = BeautifulSoup(fp, self.parser)
         return soup
 
@@ -429,22 +800,40 @@ class Generate:
         written = False
 
         for pmid in papers:
-            ok = self.generate_pmid(
-                gdir,
-                pmid,
-                overwrite=overwrite,
-                prefix=prefix,
-                num=num,
-            )
+            if self.shard is not None and not self.shard.owns(pmid):
+                continue
+            with self.lease(f"clean/{self.issn}/{pmid}") as mine:
+                if not mine:  # another node has it
+                    continue
+                ok = self.generate_pmid(
+                    gdir,
+                    pmid,
+                    overwrite=overwrite,
+                    prefix=prefix,
+                    num=num,
+                )
             written = written or ok
 
+        if len(self.layout_counts) > 1:
+            click.secho(
+                f"{self.issn} layouts: "
+                + ", ".join(f"{k} {v}" for k, v in self.layout_counts.most_common()),
+                fg="blue",
+            )
+
         if not written:
             click.secho("no data for %s" % self.issn, fg="red", file=sys.stderr)
             try:
                 os.rmdir(dname)
+                self._dname = None
             except OSError:
                 pass
 
+    def lease(self, key: str) -> AbstractContextManager[bool]:
+        if self.queue is None:
+            return nullcontext(True)
+        return self.queue.leased(key)
+
     def tokenize(self) -> Iterator[tuple[Literal["m", "a", "r"], str]]:
         gdir = "xml_%s" % self.issn
         for pmid in readxml(gdir):
@@ -468,6 +857,39 @@ class Generate:
         fname = join(dname, f"{pmid}_cleaned.txt")
         return fname
 
+    def profiling(self, pmid: str) -> AbstractContextManager[None]:
+        """Profile pmid if we were given a Profiler."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.profile(pmid, self.labels["module"], self.issn)
+
+    def sections(
+        self,
+        e: Clean,
+    ) -> tuple[list[Tag], list[Tag], list[Tag], list[Tag] | None]:
+        """abstract, methods, results and (if no methods or results) full text."""
+        labels = self.labels
+        with timer("abstract", **labels):
+            a = e.abstract()
+        with timer("methods", **labels):
+            m = e.methods()
+        with timer("results", **labels):
+            r = e.results()
+        ft = None
+        if not m and not r:
+            with timer("full_text", **labels):
+                ft = e.full_text()
+        self.collect(e, a, m, r)
+        return a, m, r, ft
+
+    def collect(self, e: Clean, a: list[Tag], m: list[Tag], r: list[Tag]) -> None:
+        if self.docstats is not None:
+            self.docstats.collect(
+                self.labels["module"],
+                e,
+                dict(abstract=a, methods=m, results=r),
+            )
+
     def generate_pmid(
         self,
         gdir: str,
@@ -481,60 +903,81 @@ class Generate:
         if exists and not overwrite:
             return True
         if exists and self._onlynewer:
-            xname = self.get_xml_name(gdir, pmid)
-            if os.path.exists(xname):
+            src = get_store(gdir).mtime(pmid)
+            if src is not None:
                 tgt = os.stat(fname).st_mtime
-                src = os.stat(xname).st_mtime
                 if tgt >= src:  # target newer that surc
                     return True
 
-        soup = self.get_soup(gdir, pmid)
-        e = self.create_clean(soup, pmid)
+        with self.profiling(pmid):
+            labels = self.labels
+            key = None
+            if self.dedup is not None:
+                data = get_store(gdir).read(pmid)
+                key = (type(self), digest(data))
+                if key in self.dedup:
+                    shutil.copyfile(self.dedup[key], fname)
+                    click.secho(f"copying {fname}", fg="cyan")
+                    inc("dedup", **labels)
+                    return True
+                with timer("parse", **labels):
+                    soup = BeautifulSoup(data, self.parser)
+            else:
+                with timer("parse", **labels):
+                    soup = self.get_soup(gdir, pmid)
+            with timer("clean", **labels):
+                e = self.create_clean(soup, pmid)
 
-        a = e.abstract()
-        m = e.methods()
-        r = e.results()
-        ft = e.full_text() if (not m and not r) else None
+            a, m, r, ft = self.sections(e)
 
-        if self.need_all:
-            if not a or not m or not r:
-                click.secho(
-                    "{}: missing: abs {}, methods {}, results {} doi={}".format(
-                        pmid,
-                        a is None or a == [],
-                        m is None or m == [],
-                        r is None or r == [],
-                        self.pmid2doi[pmid].doi,
-                    ),
-                    fg="red",
-                )
-                return False
+            if self.need_all:
+                if not a or not m or not r:
+                    inc("errors", kind="missing", **labels)
+                    click.secho(
+                        "{}: missing: abs {}, methods {}, results {} doi={}".format(
+                            pmid,
+                            a is None or a == [],
+                            m is None or m == [],
+                            r is None or r == [],
+                            self.pmid2doi[pmid].doi,
+                        ),
+                        fg="red",
+                    )
+                    return False
 
-        if exists:
-            click.secho("overwriting %s" % fname, fg="yellow")
-        else:
-            click.secho("generating %s" % fname, fg="magenta")
+            if exists:
+                click.secho("overwriting %s" % fname, fg="yellow")
+            else:
+                click.secho("generating %s" % fname, fg="magenta")
 
-        def con(seclist: list[Tag]) -> str:
-            if num:
-                return " ".join(reduce_nums(a) for a in e.tostr(seclist))
-            return " ".join(e.tostr(seclist))
+            def con(seclist: list[Tag]) -> str:
+                with timer("tostr", **labels):
+                    txt = e.tostr(seclist)
+                if num:
+                    with timer("reduce_nums", **labels):
+                        txt = [reduce_nums(a) for a in txt]
+                return " ".join(txt)
 
-        with open(fname, "w", encoding="utf-8") as fp:
+            lines = []
             if a:
-                w = con(a)
-                print("!~ABS~! %s" % w, file=fp)
+                lines.append("!~ABS~! %s" % con(a))
             if r:
-                w = con(r)
-                print("!~RES~! %s" % w, file=fp)
+                lines.append("!~RES~! %s" % con(r))
             if m:
-                w = con(m)
-                print("!~MM~! %s" % w, file=fp)
+                lines.append("!~MM~! %s" % con(m))
             if ft and (not r and not m):
-                w = con(ft)
-                print("!~FT~! %s" % w, file=fp)
+                lines.append("!~FT~! %s" % con(ft))
 
-        return True
+            with timer("write", **labels):
+                with open(fname, "w", encoding="utf-8") as fp:
+                    for line in lines:
+                        print(line, file=fp)
+            inc("cleaned", **labels)
+
+            if key is not None:
+                assert self.dedup is not None
+                self.dedup[key] = fname
+            return True
 
     def tohtmlx(
         self,
@@ -549,7 +992,7 @@ class Generate:
             env = make_jinja_env()
 
         def getfname() -> str:
-            if self.issn not in {"epmc", "elsevier"}:
+            if self.issn not in FAKE_ISSN:
                 name = self.journal
             else:
                 name = self.issn
@@ -577,11 +1020,18 @@ class Generate:
             if verbose:
                 print(paper.pmid, paper.issn, paper.doi)
 
-            soup = self.get_soup(gdir, paper.pmid)
+            labels = self.labels
             try:
-                e = self.create_clean(soup, paper.pmid)
-                missing = e.missing()
+                with self.profiling(paper.pmid):
+                    with timer("parse", **labels):
+                        soup = self.get_soup(gdir, paper.pmid)
+                    with timer("clean", **labels):
+                        e = self.create_clean(soup, paper.pmid)
+                    with timer("missing", **labels):
+                        missing = e.missing()
+                    self.collect(e, e.s_abstract(), e.s_methods(), e.s_results())
                 if missing:
+                    inc("errors", kind="missing", **labels)
                     click.secho(
                         f"missing {missing} for {paper.pmid} http://doi.org/{paper.doi}",
                         fg="magenta",
@@ -589,6 +1039,7 @@ class Generate:
                     )
                 papers.append((paper, e))
             except Exception as err:
+                inc("errors", kind="exception", **labels)
                 click.secho(
                     f"failed for {paper.pmid} http://doi.org/{paper.doi} {err}",
                     fg="red",
@@ -623,20 +1074,157 @@ class Generate:
         return t
 
 
+def make_session(
+    pool: int = 10,
+    retries: int = 3,
+    backoff: float = 1.0,
+    throttle: Throttle | None = None,
+    initial: float = 5.0,
+) -> requests.Session:
+    """Create a pooled session that retries 429 and 5xx responses with backoff.
+
+    With a throttle every request waits for its host's turn (initial is the
+    delay between requests for hosts the throttle has not seen yet).
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        # urllib3 would sleep for any Retry-After (even a day): these quick
+        # retries just back off, Download.backoff honours it up to a limit
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter: HTTPAdapter
+    if throttle is not None:
+        adapter = ThrottledAdapter(
+            throttle,
+            initial=initial,
+            pool_connections=pool,
+            pool_maxsize=pool,
+            max_retries=retry,
+        )
+    else:
+        adapter = HTTPAdapter(
+            pool_connections=pool,
+            pool_maxsize=pool,
+            max_retries=retry,
+        )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Kinds of download failure: the first word of the failed_<issn> stubs
+# (see Download.fetch and download --retry-failed).
+TRANSIENT = "transient"  # rate limited, server or network trouble
+PERMANENT = "permanent"  # e.g. 404: there is nothing to download
+LAYOUT = "layout"  # not the page we expected (check_soup)
+FAILURES = (TRANSIENT, PERMANENT, LAYOUT)
+
+TRANSIENT_STATUS = {408, 425, 429, 500, 502, 503, 504}
+# stubs written before they had a kind: HTTPError or ConnectionError messages,
+# anything else was a check_soup failure (the page or the AssertionError args)
+OLD_TRANSIENT = re.compile(
+    rb"^(?:(?:408|425|429|500|502|503|504) |HTTPSConnectionPool|HTTPConnectionPool"
+    rb"|\('Connection aborted|Connection reset|Read timed out|Max retries)",
+)
+OLD_HTTP_ERROR = re.compile(rb"^\d{3} (?:Client|Server) Error")
+
+DOWNLOAD_ERRORS = (
+    requests.exceptions.RequestException,
+    AssertionError,
+    WebDriverException,
+)
+
+
+def failure_kind(e: BaseException) -> str:
+    if isinstance(e, requests.exceptions.HTTPError):
+        status = e.response.status_code if e.response is not None else None
+        return TRANSIENT if status in TRANSIENT_STATUS else PERMANENT
+    if isinstance(
+        e,
+        (
+            RequestConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+            WebDriverException,
+        ),
+    ):
+        return TRANSIENT
+    if isinstance(e, AssertionError):
+        return LAYOUT
+    return PERMANENT  # e.g. TooManyRedirects, InvalidURL
+
+
+def stub_kind(data: bytes) -> str:
+    """The kind of failure recorded in a failed_<issn> stub."""
+    word, sep, _ = data[:20].partition(b":")
+    if sep and word.decode("ascii", "replace") in FAILURES:
+        return word.decode("ascii")
+    head = data[:200].lstrip()
+    if OLD_TRANSIENT.match(head):
+        return TRANSIENT
+    if OLD_HTTP_ERROR.match(head):
+        return PERMANENT  # e.g. 404 Client Error
+    return LAYOUT
+
+
 class Download:
     parser = "lxml"
     Referer = "http://google.com"
+    ext = ".html"
+    # extra attempts for transient failures after the session's own quick
+    # retries, waiting BACKOFF * 2**attempt seconds (with jitter, at most
+    # MAX_BACKOFF) or what Retry-After asks for
+    RETRIES = 2
+    BACKOFF = 30.0
+    MAX_BACKOFF = 600.0
 
     def __init__(
         self,
         issn: str,
         mx: int = 0,
         sleep: float = 10.0,
+        workers: int = 1,
+        session: requests.Session | None = None,
+        shard: Shard | None = None,
+        queue: LeaseQueue | None = None,
+        retry_failed: tuple[str, ...] = (),
+        throttle: Throttle | None = None,
         **kwargs: Any,
     ) -> None:
         self.issn = issn
         self.sleep = sleep
         self.mx = mx
+        self.workers = max(1, workers)
+        self.session_ = session
+        # only download our part of the papers (see _shard)
+        self.shard = shard
+        self.queue = queue
+        # failure kinds whose failed_ stubs are downloaded again
+        self.retry_failed = retry_failed
+        self.retrying: set[str] = set()
+        # adaptive per-host delays (see _throttle) instead of sleep seconds
+        # between requests, sleep is then only the delay for unknown hosts
+        self.throttle = throttle
+
+    @property
+    def session(self) -> requests.Session:
+        if self.session_ is None:
+            self.session_ = make_session(
+                pool=max(10, self.workers),
+                throttle=self.throttle,
+                initial=self.sleep,
+            )
+        return self.session_
+
+    @property
+    def pause(self) -> float:
+        """Seconds to sleep after each request."""
+        return 0.0 if self.throttle is not None else self.sleep
 
     def ensure_dirs(self) -> None:
         # pylint: disable=no-self-use
@@ -647,9 +1235,12 @@ class Download:
             if not os.path.isdir(target):
                 os.makedirs(target, exist_ok=True)
 
+    def want(self, paper: Paper) -> bool:
+        """Is this paper one of ours?"""
+        return bool(paper.doi) and paper.issn == self.issn
+
     def get_response(self, paper: Paper, header: dict[str, str]) -> Response:
-        # pylint: disable=no-self-use
-        resp = requests.get(f"http://doi.org/{paper.doi}", headers=header)
+        resp = self.session.get(f"http://doi.org/{paper.doi}", headers=header)
         return resp
 
     def check_soup(
@@ -671,15 +1262,111 @@ class Download:
         soup = BeautifulSoup(BytesIO(xml), self.parser)
         return soup
 
+    @property
+    def module(self) -> str:
+        """Name of the publisher module e.g. "wiley"."""
+        return type(self).__module__.rsplit(".", 1)[-1]
+
+    @property
+    def labels(self) -> dict[str, str]:
+        """Metric labels for this journal."""
+        return dict(module=self.module, issn=self.issn)
+
     def save_page(self, xml: bytes, targetd: str, paper: Paper) -> None:
-        with open(join(data_dir(), targetd, f"{paper.pmid}.html"), "wb") as fp:
-            fp.write(xml)
+        # compressed if there is a trained dictionary for this module
+        get_store(targetd).write(paper.pmid, xml, self.ext, module=self.module)
 
     def remove_page(self, targetd: str, paper: Paper) -> None:
-        try:
-            os.unlink(join(data_dir(), targetd, f"{paper.pmid}.html"))
-        except FileNotFoundError:
-            pass
+        get_store(targetd).remove(paper.pmid, self.ext)
+
+    def fetch_once(self, paper: Paper, header: dict[str, str]) -> bool:
+        fdir = "failed_%s" % self.issn
+        gdir = "xml_%s" % self.issn
+        labels = self.labels
+        with timer("fetch", **labels):
+            resp = self.get_response(paper, header)
+        resp.raise_for_status()
+        header["Referer"] = resp.url
+        xml = resp.content
+        with timer("save", **labels):
+            self.save_page(xml, gdir, paper)
+        with timer("parse", **labels):
+            soup = self.create_soup(paper, resp)
+
+        with timer("check_soup", **labels):
+            err = self.check_soup(paper, soup, resp)
+        if err:
+            inc("errors", kind="check_soup", failure=LAYOUT, **labels)
+            # keep the rejected page (for debugging) behind the stub's kind
+            self.save_page(f"{LAYOUT}: ".encode("ascii") + xml, fdir, paper)
+            self.remove_page(gdir, paper)
+            return False
+        if paper.pmid in self.retrying:
+            self.remove_page(fdir, paper)
+        inc("downloaded", **labels)
+        return True
+
+    def backoff(self, attempt: int, e: BaseException) -> float:
+        wait = retry_after(getattr(e, "response", None))
+        if wait is None:
+            wait = min(self.MAX_BACKOFF, self.BACKOFF * 2**attempt)
+            wait = wait / 2 + random.uniform(0, wait / 2)  # don't retry in step
+        return min(wait, self.MAX_BACKOFF)
+
+    def fetch(self, paper: Paper, header: dict[str, str]) -> bool:
+        """Download a single paper. Returns True if it is now done.
+
+        Transient failures are retried with backoff, the others (and
+        transient ones that persist) leave a "<kind>: <error>" stub in
+        failed_<issn>.
+        """
+        labels = self.labels
+        for attempt in range(self.RETRIES + 1):
+            try:
+                return self.fetch_once(paper, header)
+            except DOWNLOAD_ERRORS as e:
+                kind = failure_kind(e)
+                if kind == TRANSIENT and attempt < self.RETRIES:
+                    wait = self.backoff(attempt, e)
+                    inc("retries", **labels)
+                    click.secho(
+                        f"retrying {paper.pmid} in {wait:.0f}s: {e}",
+                        fg="yellow",
+                    )
+                    if self.queue is not None:
+                        # don't let another node take the paper meanwhile
+                        self.queue.renew(self.lease_key(paper), wait)
+                    time.sleep(wait)
+                    continue
+                inc("errors", kind=type(e).__name__, failure=kind, **labels)
+                click.secho(
+                    f"failed ({kind}) {paper.pmid} {paper.doi} {str(e)}",
+                    fg="red",
+                )
+                self.save_page(
+                    f"{kind}: {e}".encode("utf-8"), f"failed_{self.issn}", paper
+                )
+                self.remove_page(f"xml_{self.issn}", paper)
+                return False
+        raise AssertionError("unreachable")
+
+    def lease_key(self, paper: Paper) -> str:
+        return f"download/{self.issn}/{paper.pmid}"
+
+    def fetch_leased(self, paper: Paper, header: dict[str, str]) -> bool | None:
+        """fetch unless another node (see --queue) has the paper (None)."""
+        if self.queue is None:
+            return self.fetch(paper, header)
+        with self.queue.leased(self.lease_key(paper)) as mine:
+            if not mine:
+                return None
+            return self.fetch(paper, header)
+
+    def _fetch_wait(self, paper: Paper, header: dict[str, str]) -> bool | None:
+        ok = self.fetch_leased(paper, dict(header))
+        if self.pause > 0 and ok is not None:
+            time.sleep(self.pause)
+        return ok
 
     def run(self) -> None:
         header = {"User-Agent": USER_AGENT, "Referer": self.Referer}
@@ -689,12 +1376,24 @@ class Download:
 
         failed = set(readxml(fdir))
         done = set(readxml(gdir))
+        if self.retry_failed and failed:
+            store = get_store(fdir)
+            self.retrying = {
+                pmid
+                for pmid in failed
+                if stub_kind(store.read(pmid)) in self.retry_failed
+            }
+            failed -= self.retrying
+            if self.retrying:
+                print(f"{self.issn}: retrying {len(self.retrying)} failed")
 
         allpmid = failed | done
         todo = {
             p.pmid: p
             for p in read_suba_papers_csv()
-            if p.doi and p.issn == self.issn and p.pmid not in allpmid
+            if self.want(p)
+            and p.pmid not in allpmid
+            and (self.shard is None or self.shard.owns(p.pmid))
         }
         if len(failed) > 0 or len(done) > 0 or len(todo) > 0:
             print(
@@ -707,50 +1406,42 @@ class Download:
             return
         self.ensure_dirs()
         self.start()
-        for idx, paper in enumerate(lst):
-            try:
-                resp = self.get_response(paper, header)
-                if resp.status_code == 404:
-                    xml = b"failed404"
-                    failed.add(paper.pmid)
-                else:
-                    resp.raise_for_status()
-                    header["Referer"] = resp.url
-                    xml = resp.content
-                    self.save_page(xml, gdir, paper)
-                    soup = self.create_soup(paper, resp)
-
-                    err = self.check_soup(paper, soup, resp)
-                    if err:
-                        failed.add(paper.pmid)
-                        self.save_page(xml, fdir, paper)
-                        self.remove_page(gdir, paper)
-                    else:
-                        done.add(paper.pmid)
-
-            except (
-                RequestConnectionError,
-                AssertionError,
-                requests.exceptions.HTTPError,
-            ) as e:
-                xml = str(e).encode("utf-8")
-                click.secho(
-                    f"failed {paper.pmid} {paper.doi} {str(e)}",
-                    fg="red",
-                )
-                failed.add(paper.pmid)
-                self.save_page(xml, fdir, paper)
-                self.remove_page(gdir, paper)
 
-            # with open(join(data_dir(), targetd, f"{paper.pmid}.html"), "wb") as fp:
-            #     fp.write(xml)
+        others: set[str] = set()  # done by other nodes
 
+        def report(paper: Paper, ok: bool | None) -> None:
+            if ok is None:
+                others.add(paper.pmid)
+            elif ok:
+                done.add(paper.pmid)
+            else:
+                failed.add(paper.pmid)
             del todo[paper.pmid]
             print(
-                f"{len(failed)} failed, {len(done)} done, {len(todo)} todo: {paper.pmid}",
+                f"{len(failed)} failed, {len(done)} done, {len(todo)} todo: {paper.pmid}"
+                + (f" ({len(others)} by other nodes)" if others else ""),
             )
-            if self.sleep > 0 and idx < len(lst) - 1:
-                time.sleep(self.sleep)
+
+        try:
+            if self.workers > 1:
+                # each worker sleeps between its own requests
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    futures = {
+                        executor.submit(self._fetch_wait, paper, header): paper
+                        for paper in lst
+                    }
+                    for future in as_completed(futures):
+                        report(futures[future], future.result())
+            else:
+                for idx, paper in enumerate(lst):
+                    ok = self.fetch_leased(paper, header)
+                    report(paper, ok)
+                    if self.pause > 0 and idx < len(lst) - 1 and ok is not None:
+                        time.sleep(self.pause)
+        finally:
+            if self.throttle is not None:
+                # keep what we learned even if interrupted
+                self.throttle.save()
         self.end()
 
 
@@ -767,59 +1458,67 @@ class DownloadSelenium(Download):
         headless: bool = False,
         close: bool = True,
         driver: WebDriver | None = None,
+        browser_session: BrowserSession | None = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(issn, mx=mx, sleep=sleep, **kwargs)
+        self.workers = 1  # one browser can only do one thing at a time
         self.headless = headless
-        self.close = close
-        self.driver = driver
-        self.wait_: WebDriverWait | None = None
+        # a shared session belongs to the caller (see the download command)
+        self.close = close and browser_session is None
+        if browser_session is None:
+            browser_session = BrowserSession(headless=headless, driver=driver)
+        self.browser_session = browser_session
+        self.waits: dict[int, WebDriverWait] = {}
 
-    def start(self) -> None:
-        # pylint: disable=import-outside-toplevel
-        if self.driver is not None:
-            return
-        from selenium import webdriver
+    @property
+    def pause(self) -> float:
+        # the browser's requests don't go through the throttle
+        return self.sleep
 
-        options = webdriver.ChromeOptions()
-        if self.headless:
-            options.add_argument("headless")
-        print("starting Chrome")
-        self.driver = webdriver.Chrome(options=options)
-        # self.driver.implicitly_wait(10)  # seconds
+    @property
+    def driver(self) -> WebDriver:
+        return self.browser_session.driver
+
+    def start(self) -> None:
+        if self.Referer != Download.Referer:
+            self.browser_session.warm(self.Referer)
 
     def end(self) -> None:
-        if self.close and self.driver is not None:
-            self.driver.close()
+        if self.close:
+            self.browser_session.close()
 
     @property
     def wait(self) -> WebDriverWait:
-
-        if self.wait_ is not None:
-            return self.wait_
-        self.wait_ = WebDriverWait(self.driver, self.WAIT)
-        return self.wait_
+        # the session may have restarted Chrome
+        driver = self.driver
+        w = self.waits.get(id(driver))
+        if w is None:
+            w = self.waits[id(driver)] = WebDriverWait(driver, self.WAIT)
+        return w
 
     def wait_for_css(self, css: str) -> None:
         self.wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, css)))
 
-    def get_response(self, paper: Paper, header: dict[str, str]) -> Response:
+    def ready(self, driver: WebDriver) -> None:
+        """Wait until the page loaded in driver is complete."""
         # pylint: disable=import-outside-toplevel
         from selenium.common.exceptions import TimeoutException
 
-        assert self.driver is not None
-        url = f"https://doi.org/{paper.doi}"
-        self.driver.get(url)
         try:
             self.wait_for_css("html")
         except TimeoutException:
             assert False, "selenium timeout"  # trigger failure with
 
-        h = self.driver.find_element(by=By.TAG_NAME, value="html")
-
-        txt = h.get_attribute("outerHTML") or ""
-
-        return SeleniumResponse(
-            content=txt.encode("utf-8"),
-            url=self.driver.current_url or "<unknown>",
+    def get_response(self, paper: Paper, header: dict[str, str]) -> Response:
+        start = time.perf_counter()
+        txt, url = self.browser_session.get(
+            f"https://doi.org/{paper.doi}",
+            ready=self.ready,
+            **self.labels,
+        )
+        click.secho(
+            f"{paper.pmid}: {time.perf_counter() - start:.1f}s in browser",
+            fg="blue",
         )
+        return SeleniumResponse(content=txt.encode("utf-8"), url=url)
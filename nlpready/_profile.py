@@ -0,0 +1,153 @@
+"""Profile the slowest and most memory hungry papers of a run.
+
+Used by ``clean --profile-slowest N`` and ``tohtml --profile-slowest N``.
+Every paper is run under cProfile and tracemalloc but only the stats of the
+N slowest and the N most allocation heavy papers are kept and written to
+``{DATADIR}/profile``: ``slow-<module>-<pmid>.prof`` (pstats format, view with
+``python -m pstats`` or snakeviz), ``mem-<module>-<pmid>.txt`` (top allocation
+sites) with the raw ``.tracemalloc`` snapshot, and ``index.json``.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import heapq
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from os.path import join
+from typing import Iterator
+
+import click
+
+from ._utils import data_dir
+
+PROFILEDIR = "profile"
+
+
+@dataclass(order=True)
+class Profiled:
+    value: float
+    pmid: str = field(compare=False)
+    module: str = field(compare=False)
+    issn: str = field(compare=False)
+    seconds: float = field(compare=False)
+    peak: int = field(compare=False)  # bytes
+    stats: cProfile.Profile | tracemalloc.Snapshot | None = field(
+        compare=False,
+        default=None,
+        repr=False,
+    )
+
+
+class Profiler:
+    def __init__(self, n: int, directory: str | None = None, frames: int = 10):
+        self.n = n
+        self.directory = directory or join(data_dir(), PROFILEDIR)
+        self.frames = frames
+        self.slowest: list[Profiled] = []  # min heaps
+        self.heaviest: list[Profiled] = []
+        self.count = 0
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+
+    def _wanted(self, heap: list[Profiled], value: float) -> bool:
+        return len(heap) < self.n or value > heap[0].value
+
+    def _push(self, heap: list[Profiled], p: Profiled) -> None:
+        if len(heap) < self.n:
+            heapq.heappush(heap, p)
+        else:
+            heapq.heapreplace(heap, p)
+
+    @contextmanager
+    def profile(self, pmid: str, module: str, issn: str) -> Iterator[None]:
+        """Profile the body of a with statement.
+
+        The memory snapshot is taken on exit so anything still referenced
+        by the caller (e.g. the soup) shows up in it.
+        """
+        self.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        prof = cProfile.Profile()
+        start = time.perf_counter()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] - base
+            self.count += 1
+            if self._wanted(self.slowest, seconds):
+                self._push(
+                    self.slowest,
+                    Profiled(seconds, pmid, module, issn, seconds, peak, prof),
+                )
+            if self._wanted(self.heaviest, peak):
+                snapshot = tracemalloc.take_snapshot().filter_traces(
+                    [
+                        tracemalloc.Filter(False, tracemalloc.__file__),
+                        tracemalloc.Filter(False, __file__),
+                    ],
+                )
+                self._push(
+                    self.heaviest,
+                    Profiled(peak, pmid, module, issn, seconds, peak, snapshot),
+                )
+
+    def save(self, top: int = 30) -> None:
+        """Write the collected profiles and print a summary."""
+        if not self.count:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        index: dict[str, list[dict[str, object]]] = dict(slowest=[], heaviest=[])
+        click.secho(f"slowest of {self.count} papers:", fg="blue")
+        for p in sorted(self.slowest, reverse=True):
+            assert isinstance(p.stats, cProfile.Profile)
+            fname = join(self.directory, f"slow-{p.module}-{p.pmid}.prof")
+            p.stats.dump_stats(fname)
+            index["slowest"].append(dict(file=fname, **self.todict(p)))
+            click.echo(
+                f"{p.seconds:8.3f}s {p.peak/1e6:8.1f}MB {p.module} {p.issn} {p.pmid}",
+            )
+        click.secho("most memory:", fg="blue")
+        for p in sorted(self.heaviest, reverse=True):
+            assert isinstance(p.stats, tracemalloc.Snapshot)
+            fname = join(self.directory, f"mem-{p.module}-{p.pmid}")
+            p.stats.dump(fname + ".tracemalloc")
+            with open(fname + ".txt", "w", encoding="utf-8") as fp:
+                print(
+                    f"{p.module} {p.issn} {p.pmid}: peak {p.peak/1e6:.1f}MB"
+                    f" {p.seconds:.3f}s",
+                    file=fp,
+                )
+                for stat in p.stats.statistics("lineno")[:top]:
+                    print(stat, file=fp)
+            index["heaviest"].append(dict(file=fname + ".txt", **self.todict(p)))
+            click.echo(
+                f"{p.peak/1e6:8.1f}MB {p.seconds:8.3f}s {p.module} {p.issn} {p.pmid}",
+            )
+        with open(join(self.directory, "index.json"), "w", encoding="utf-8") as fp:
+            json.dump(index, fp, indent=2)
+        click.secho(f"profiles written to {self.directory}", fg="blue")
+
+    @staticmethod
+    def todict(p: Profiled) -> dict[str, object]:
+        return dict(
+            pmid=p.pmid,
+            module=p.module,
+            issn=p.issn,
+            seconds=p.seconds,
+            peak=p.peak,
+        )
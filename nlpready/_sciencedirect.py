@@ -0,0 +1,210 @@
+"""Rebuild ScienceDirect article pages without a browser.
+
+A ScienceDirect article page is a skeleton. The article is embedded as a
+JSON state blob (``<script type="application/json">`` or
+``window.__PRELOADED_STATE__ = {...}``) that javascript renders into the
+DOM. The body is sometimes in the blob and is otherwise fetched from
+``/sdfe/arp/pii/<pii>/body``.
+
+The content is a tree of ``{"#name": ..., "$": attrs, "$$": children,
+"_": text}`` nodes. :func:`render_page` turns it back into the markup the
+:class:`nlpready.cell.CELL` cleaner expects (``article .Head .title-text``,
+``.Abstracts``, ``div.Body section`` with ``h2`` titles, ``figure`` and
+``.tables`` with ``.captions``, ``a.workspace-trigger`` citations).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from html import escape
+from typing import Any
+from urllib.parse import unquote
+
+BODY_URL = "https://www.sciencedirect.com/sdfe/arp/pii/{pii}/body"
+
+PRELOADED = re.compile(
+    r"window\.__PRELOADED_STATE__\s*=\s*(\{.*?\})\s*;?\s*</script>",
+    re.DOTALL,
+)
+JSON_SCRIPT = re.compile(
+    r'<script[^>]*type="application/json"[^>]*>(.*?)</script>',
+    re.DOTALL,
+)
+
+REDIRECT = re.compile(r'name="redirectURL"[^>]*value="([^"]+)"')
+
+# ScienceDirect element name -> (tag, class)
+TAGS = {
+    "section": ("section", None),
+    "sections": ("div", "sections"),
+    "para": ("p", None),
+    "simple-para": ("p", None),
+    "abstract": ("div", "abstract"),
+    "abstract-sec": ("div", "abstract-sec"),
+    "figure": ("figure", None),
+    "table": ("div", "tables"),
+    "caption": ("span", "captions"),
+    "label": ("span", "label"),
+    "list": ("ul", None),
+    "list-item": ("li", None),
+    "italic": ("i", None),
+    "bold": ("b", None),
+    "sup": ("sup", None),
+    "inf": ("sub", None),
+    "display": ("div", "display"),
+}
+SKIP = {"link", "alt-text", "e-component", "table-footnote", "ce:source"}
+
+
+class SDError(ValueError):
+    """The page has no usable embedded article."""
+
+
+def find_state(html: str) -> dict[str, Any]:
+    """The embedded article JSON of a ScienceDirect page."""
+    m = PRELOADED.search(html)
+    candidates = [m.group(1)] if m else []
+    candidates.extend(JSON_SCRIPT.findall(html))
+    for txt in candidates:
+        try:
+            state = json.loads(txt)
+        except ValueError:
+            continue
+        if isinstance(state, dict) and isinstance(state.get("article"), dict):
+            return state
+    raise SDError("no article state")
+
+
+def pii(state: dict[str, Any]) -> str:
+    p = state["article"].get("pii")
+    if not p:
+        raise SDError("no pii")
+    return p
+
+
+def body_url(state: dict[str, Any]) -> str:
+    url = BODY_URL.format(pii=pii(state))
+    token = state["article"].get("entitledToken")
+    if token:
+        url += f"?entitledToken={token}"
+    return url
+
+
+def body_content(state: dict[str, Any]) -> list[dict[str, Any]] | None:
+    """Body nodes if they were delivered with the page."""
+    body = state.get("body")
+    if isinstance(body, dict):
+        content = body.get("content")
+        if content:
+            return content
+    return None
+
+
+def floats(body: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """id -> figure/table nodes that the body refers to with float-anchor."""
+    return {f["$"]["id"]: f for f in body.get("floats", []) if "id" in f.get("$", {})}
+
+
+class Renderer:
+    def __init__(self, floats_: dict[str, dict[str, Any]] | None = None) -> None:
+        self.floats = floats_ or {}
+        self.depth = 0
+        # figures anchored inside a paragraph go after it (no <p> in <p>)
+        self.pending: list[dict[str, Any]] | None = None
+
+    def nodes(self, nodes: list[dict[str, Any]] | None) -> str:
+        return "".join(self.node(n) for n in nodes or [])
+
+    def node(self, n: dict[str, Any]) -> str:
+        name = n.get("#name", "")
+        attrs = n.get("$", {})
+        if name == "__text__":
+            return escape(n.get("_", ""))
+        if name in SKIP:
+            return ""
+        if name == "float-anchor":
+            f = self.floats.get(attrs.get("refid", ""))
+            if f is not None and self.pending is not None:
+                self.pending.append(f)
+                return ""
+            return self.node(f) if f else ""
+        if name == "para" and self.pending is None:
+            self.pending = []
+            try:
+                p = self.element("p", None, attrs, n)
+                pending = self.pending
+            finally:
+                self.pending = None
+            return p + self.nodes(pending)
+        if name in {"cross-ref", "cross-refs"}:
+            refid = attrs.get("refid", "").split()[0] if attrs.get("refid") else ""
+            # bibliography references look like name="bbib12" on the live page
+            ref = f"b{refid}" if refid.startswith("bib") else refid
+            return (
+                f'<a class="workspace-trigger" name="{escape(ref)}">'
+                f"{self.inner(n)}</a>"
+            )
+        if name == "section-title":
+            h = "h2" if self.depth <= 1 else "h3"
+            return f"<{h}>{self.inner(n)}</{h}>"
+        if name == "section":
+            self.depth += 1
+            try:
+                return self.element("section", None, attrs, n)
+            finally:
+                self.depth -= 1
+        tag, cls = TAGS.get(name, ("span", None))
+        return self.element(tag, cls, attrs, n)
+
+    def element(
+        self,
+        tag: str,
+        cls: str | None,
+        attrs: dict[str, Any],
+        n: dict[str, Any],
+    ) -> str:
+        a = f' class="{cls}"' if cls else ""
+        if "id" in attrs:
+            a += f' id="{escape(str(attrs["id"]))}"'
+        return f"<{tag}{a}>{self.inner(n)}</{tag}>"
+
+    def inner(self, n: dict[str, Any]) -> str:
+        return escape(n.get("_", "")) + self.nodes(n.get("$$"))
+
+
+def text(n: dict[str, Any]) -> str:
+    return n.get("_", "") + "".join(text(c) for c in n.get("$$", []))
+
+
+def title(state: dict[str, Any]) -> str:
+    a = state["article"]
+    t = a.get("titleString")
+    if t:
+        return t
+    return text(a["title"]) if isinstance(a.get("title"), dict) else ""
+
+
+def redirect_url(html: str) -> str | None:
+    """doi.org sends us to linkinghub.elsevier.com which redirects with a form."""
+    m = REDIRECT.search(html)
+    return unquote(m.group(1)) if m else None
+
+
+def render_page(state: dict[str, Any], body: dict[str, Any] | None = None) -> str:
+    """Rebuild the article html from the page state and its body json."""
+    if body is None:
+        content = body_content(state)
+        body = state.get("body") if content else None
+    if not body or not body.get("content"):
+        raise SDError("no body")
+    r = Renderer(floats(body))
+    abstracts = state.get("abstracts", {}).get("content", [])
+    t = escape(title(state))
+    return (
+        f"<html><head><title>{t}</title></head><body>"
+        f'<article><h1 class="Head"><span class="title-text">{t}</span></h1>'
+        f'<div class="Abstracts">{r.nodes(abstracts)}</div>'
+        f'<div class="Body">{r.nodes(body["content"])}</div>'
+        "</article></body></html>"
+    )
@@ -0,0 +1,145 @@
+"""Precompiled css selectors of the Clean classes.
+
+``tag.select("div.section")`` compiles the selector through soupsieve's
+small LRU cache on every call. Every Clean subclass instead gets a
+``SELECTORS`` registry when it is defined: the string constants of its
+methods and class attributes that are valid selectors are compiled once
+(strings that are not selectors simply fail to compile and are skipped).
+Clean.select and Clean.select_one, and the TextViews of a Clean, look
+selectors up there; one that was missed (built at run time) is compiled on
+first use and added.
+
+``nlpready clean --selector-stats N`` also times every Clean.select and
+prints, per publisher (module), the N most expensive selectors, the compile
+cost and the selectors that had to be compiled late.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from collections import defaultdict
+from types import CodeType
+from typing import Any
+from typing import Iterator
+from typing import Mapping
+
+import click
+import soupsieve
+
+
+def constants(code: CodeType) -> Iterator[str]:
+    """String constants of code and of the functions defined in it."""
+    for c in code.co_consts:
+        if isinstance(c, str):
+            yield c
+        elif isinstance(c, (tuple, frozenset)):
+            yield from (s for s in c if isinstance(s, str))
+        elif isinstance(c, CodeType):
+            yield from constants(c)
+
+
+def strings(namespace: Mapping[str, Any]) -> Iterator[str]:
+    """Candidate selectors of a class body."""
+    for name, value in namespace.items():
+        if name.startswith("__") and isinstance(value, str):
+            continue  # __module__, __doc__ ...
+        if isinstance(value, (staticmethod, classmethod)):
+            value = value.__func__
+        elif isinstance(value, property):
+            value = value.fget
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, tuple):
+            yield from (s for s in value if isinstance(s, str))
+        code = getattr(value, "__code__", None)
+        if isinstance(code, CodeType):
+            yield from constants(code)
+
+
+class SelectorStats:
+    """Compile costs (always) and select costs (when enabled) per publisher."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.enabled = False
+        # (publisher, css) -> ...
+        self.compiles: dict[tuple[str, str], float] = defaultdict(float)
+        self.late: Counter[tuple[str, str]] = Counter()
+        self.calls: Counter[tuple[str, str]] = Counter()
+        self.seconds: dict[tuple[str, str], float] = defaultdict(float)
+        self.matches: Counter[tuple[str, str]] = Counter()
+        self.lookups: Counter[tuple[str, str]] = Counter()  # by TextViews
+
+    def compiled(self, publisher: str, css: str, seconds: float, late: bool) -> None:
+        with self.lock:
+            self.compiles[(publisher, css)] += seconds
+            if late:
+                self.late[(publisher, css)] += 1
+
+    def selected(self, publisher: str, css: str, seconds: float, n: int) -> None:
+        key = (publisher, css)
+        with self.lock:
+            self.calls[key] += 1
+            self.seconds[key] += seconds
+            self.matches[key] += n
+
+    def looked_up(self, publisher: str, css: str) -> None:
+        with self.lock:
+            self.lookups[(publisher, css)] += 1
+
+    def report(self, top: int = 10) -> None:
+        with self.lock:
+            publishers = sorted({p for p, _ in self.calls} | {p for p, _ in self.late})
+            for publisher in publishers:
+                keys = [k for k in self.compiles if k[0] == publisher]
+                ctime = sum(self.compiles[k] for k in keys)
+                calls = [k for k in self.calls if k[0] == publisher]
+                stime = sum(self.seconds[k] for k in calls)
+                click.secho(
+                    f"{publisher}: {len(keys)} selectors compiled in"
+                    f" {ctime * 1000:.1f}ms, {sum(self.calls[k] for k in calls)}"
+                    f" selects in {stime * 1000:.1f}ms",
+                    fg="blue",
+                )
+                calls.sort(key=lambda k: -self.seconds[k])
+                for k in calls[:top]:
+                    n = self.calls[k]
+                    click.echo(
+                        f"  {self.seconds[k] * 1000:9.1f}ms {n:7} calls"
+                        f" {self.seconds[k] / n * 1e6:8.1f}us/call"
+                        f" {self.matches[k] / n:6.1f} matches  {k[1]!r}",
+                    )
+                views = sum(v for k, v in self.lookups.items() if k[0] == publisher)
+                if views:
+                    click.echo(f"  {views} TextView lookups")
+                late = [k for k in self.late if k[0] == publisher]
+                for k in sorted(late):
+                    click.secho(
+                        f"  compiled late {self.late[k]}x: {k[1]!r}",
+                        fg="yellow",
+                    )
+
+
+STATS = SelectorStats()
+
+
+def compile_one(publisher: str, css: str, late: bool = False) -> soupsieve.SoupSieve:
+    start = time.perf_counter()
+    sel = soupsieve.compile(css)
+    STATS.compiled(publisher, css, time.perf_counter() - start, late)
+    return sel
+
+
+def precompile(publisher: str, namespace: Mapping[str, Any]) -> dict[str, Any]:
+    """css -> compiled selector for the selector strings of a class body."""
+    ret = {}
+    for s in set(strings(namespace)):
+        if not s or "\n" in s or len(s) > 200:
+            continue
+        try:
+            ret[s] = compile_one(publisher, s)
+        except (soupsieve.SelectorSyntaxError, ValueError):
+            continue
+    return ret
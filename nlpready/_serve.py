@@ -0,0 +1,466 @@
+"""Read-only HTTP API for the cleaned documents.
+
+``nlpready serve`` answers with JSON so consumers don't have to read
+``cleaned_*/<pmid>_cleaned.txt`` over NFS and parse the ``!~ABS~!``
+markers themselves:
+
+* ``GET /docs/<pmid>?sections=abstract,methods`` one document,
+* ``GET /docs?pmids=1,2,3`` or ``POST /docs`` with
+  ``{"pmids": [...], "sections": [...]}`` many documents,
+* ``GET /export?issn=...&year=2015-2020&sections=results`` every matching
+  document as a stream of JSON lines (documents without any of the
+  requested sections are skipped),
+* ``GET /stats`` index and cache statistics.
+
+The files are found through an SQLite index (``{DATADIR}/cleaned/index.sqlite``)
+of pmid, issn, journal, year and file. Every ``--rescan`` seconds the cleaned
+directories are listed again and only the files that were added, removed or
+rewritten (by their mtime) are updated in the index. Parsed documents are
+kept in an LRU cache keyed on the file's current mtime.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from os.path import join
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+import click
+
+from ._metrics import inc
+from ._metrics import timer
+from ._mlabc import read_suba_papers_csv
+from ._utils import data_dir
+
+INDEX = "index.sqlite"
+
+# line prefix in a cleaned file -> section
+MARKERS = {
+    "!~ABS~!": "abstract",
+    "!~RES~!": "results",
+    "!~MM~!": "methods",
+    "!~FT~!": "full_text",
+}
+SECTIONS = tuple(MARKERS.values())
+
+CLEANED_DIR = re.compile(r"^cleaned_([^_]+)_(.*)$")
+CLEANED_FILE = "_cleaned.txt"
+
+
+def parse_cleaned(txt: str) -> dict[str, str]:
+    """section -> text of a cleaned file."""
+    ret = {}
+    for line in txt.splitlines():
+        marker, _, text = line.partition(" ")
+        section = MARKERS.get(marker)
+        if section is not None:
+            ret[section] = text
+    return ret
+
+
+class Doc(NamedTuple):
+    pmid: str
+    issn: str
+    journal: str
+    year: int | None
+    path: str
+    mtime: float
+
+
+class CleanedIndex:
+    """pmid -> cleaned file index of {DATADIR}/cleaned stored as SQLite."""
+
+    BATCH = 900  # keep below SQLITE_MAX_VARIABLE_NUMBER
+
+    def __init__(self, directory: str | None = None, index: str | None = None) -> None:
+        self.directory = directory or join(data_dir(), "cleaned")
+        self.index = index or join(self.directory, INDEX)
+        self.lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._years: dict[str, int] | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.index, check_same_thread=False)
+            conn.execute(
+                "create table if not exists docs (pmid text primary key,"
+                " issn text, journal text, year integer, path text, mtime real)",
+            )
+            conn.execute("create index if not exists docs_issn on docs (issn)")
+            conn.execute("create index if not exists docs_year on docs (year)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def years(self) -> dict[str, int]:
+        if self._years is None:
+            self._years = {p.pmid: p.year for p in read_suba_papers_csv()}
+        return self._years
+
+    def scan(self) -> dict[str, tuple[str, str, str, float]]:
+        """pmid -> (issn, journal, path, mtime) of every cleaned file."""
+        found = {}
+        with os.scandir(self.directory) as dirs:
+            names = sorted(d.name for d in dirs if d.is_dir())
+        for name in names:
+            m = CLEANED_DIR.match(name)
+            if m is None:
+                continue
+            issn, journal = m.groups()
+            try:
+                with os.scandir(join(self.directory, name)) as it:
+                    for f in it:
+                        if not f.name.endswith(CLEANED_FILE):
+                            continue
+                        pmid = f.name[: -len(CLEANED_FILE)]
+                        found[pmid] = (issn, journal, f.path, f.stat().st_mtime)
+            except FileNotFoundError:  # removed while we were scanning
+                continue
+        return found
+
+    def update(self) -> int:
+        """Sync the index with the cleaned files, return how many changed.
+
+        The directories are scanned without holding the lock so lookups
+        carry on meanwhile.
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        found = self.scan()
+        with self.lock:
+            indexed = {
+                pmid: (path, mtime)
+                for pmid, path, mtime in self.conn.execute(
+                    "select pmid, path, mtime from docs",
+                )
+            }
+        changed = [
+            pmid
+            for pmid, (_, _, path, mtime) in found.items()
+            if indexed.get(pmid) != (path, mtime)
+        ]
+        removed = [(pmid,) for pmid in indexed if pmid not in found]
+        if not changed and not removed:
+            return 0
+        years = self.years() if changed else {}
+        rows = [
+            (pmid, *found[pmid][:2], years.get(pmid), *found[pmid][2:])
+            for pmid in changed
+        ]
+        with self.lock:
+            conn = self.conn
+            with conn:
+                conn.executemany(
+                    "insert or replace into docs values (?,?,?,?,?,?)", rows
+                )
+                conn.executemany("delete from docs where pmid = ?", removed)
+        self._years = None  # reread the papers CSV next time
+        return len(rows) + len(removed)
+
+    def lookup(self, pmids: Iterable[str]) -> dict[str, Doc]:
+        ret: dict[str, Doc] = {}
+        todo = sorted(set(pmids))
+        with self.lock:
+            for i in range(0, len(todo), self.BATCH):
+                batch = todo[i : i + self.BATCH]
+                qs = ",".join("?" * len(batch))
+                for row in self.conn.execute(
+                    f"select * from docs where pmid in ({qs})",
+                    batch,
+                ):
+                    doc = Doc(*row)
+                    ret[doc.pmid] = doc
+        return ret
+
+    def query(
+        self,
+        issns: list[str] | None = None,
+        years: tuple[int, int] | None = None,
+    ) -> list[Doc]:
+        where = []
+        args: list[Any] = []
+        if issns:
+            where.append(f"issn in ({','.join('?' * len(issns))})")
+            args.extend(issns)
+        if years is not None:
+            where.append("year between ? and ?")
+            args.extend(years)
+        sql = "select * from docs"
+        if where:
+            sql += " where " + " and ".join(where)
+        with self.lock:
+            return [
+                Doc(*row) for row in self.conn.execute(sql + " order by pmid", args)
+            ]
+
+    def stats(self) -> dict[str, Any]:
+        with self.lock:
+            (n,) = self.conn.execute("select count(*) from docs").fetchone()
+            (j,) = self.conn.execute("select count(distinct issn) from docs").fetchone()
+        return dict(documents=n, journals=j)
+
+
+class LRUCache:
+    """Thread safe LRU cache of parsed documents keyed on (path, mtime)."""
+
+    def __init__(self, size: int = 10000) -> None:
+        self.size = size
+        self.lock = threading.Lock()
+        self.data: OrderedDict[tuple[str, float], dict[str, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, doc: Doc) -> dict[str, str]:
+        # the file may have been rewritten in place since the index saw it
+        key = (doc.path, os.stat(doc.path).st_mtime)
+        with self.lock:
+            sections = self.data.get(key)
+            if sections is not None:
+                self.data.move_to_end(key)
+                self.hits += 1
+                return sections
+            self.misses += 1
+        with open(doc.path, encoding="utf-8") as fp:
+            sections = parse_cleaned(fp.read())
+        with self.lock:
+            self.data[key] = sections
+            if len(self.data) > self.size:
+                self.data.popitem(last=False)
+        return sections
+
+    def stats(self) -> dict[str, Any]:
+        with self.lock:
+            return dict(
+                size=len(self.data),
+                max_size=self.size,
+                hits=self.hits,
+                misses=self.misses,
+            )
+
+
+class CleanedAPI:
+    def __init__(self, index: CleanedIndex, cache: LRUCache) -> None:
+        self.index = index
+        self.cache = cache
+
+    def document(self, doc: Doc, sections: list[str] | None) -> dict[str, Any] | None:
+        try:
+            found = self.cache.get(doc)
+        except FileNotFoundError:  # removed since the last scan
+            return None
+        if sections:
+            found = {k: v for k, v in found.items() if k in sections}
+        return dict(
+            pmid=doc.pmid,
+            issn=doc.issn,
+            journal=doc.journal,
+            year=doc.year,
+            sections=found,
+        )
+
+    def documents(
+        self,
+        pmids: list[str],
+        sections: list[str] | None,
+    ) -> dict[str, Any]:
+        docs = self.index.lookup(pmids)
+        ret = []
+        missing = []
+        for pmid in pmids:
+            doc = docs.get(pmid)
+            d = None if doc is None else self.document(doc, sections)
+            if d is None:
+                missing.append(pmid)
+            else:
+                ret.append(d)
+        return dict(documents=ret, missing=missing)
+
+    def export(
+        self,
+        issns: list[str] | None,
+        years: tuple[int, int] | None,
+        sections: list[str] | None,
+    ) -> Iterator[dict[str, Any]]:
+        for doc in self.index.query(issns, years):
+            d = self.document(doc, sections)
+            if d is None or not d["sections"]:
+                continue
+            yield d
+
+
+def split(qs: dict[str, list[str]], key: str) -> list[str] | None:
+    values = [v.strip() for s in qs.get(key, []) for v in s.split(",") if v.strip()]
+    return values or None
+
+
+def year_range(s: str) -> tuple[int, int]:
+    """2019 or 2015-2020 (either end may be left out)."""
+    lo, sep, hi = s.partition("-")
+    if not sep:
+        return int(lo), int(lo)
+    return int(lo or 0), int(hi or 9999)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive for many small requests
+    api: CleanedAPI
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # pylint: disable=redefined-builtin
+        pass  # too noisy at high QPS; see --metrics
+
+    def send_json(self, data: Any, status: HTTPStatus = HTTPStatus.OK) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_lines(self, items: Iterator[Any]) -> None:
+        """Stream items as JSON lines with chunked transfer encoding."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        buf: list[bytes] = []
+        size = 0
+
+        def flush() -> None:
+            chunk = b"".join(buf)
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            buf.clear()
+
+        for item in items:
+            line = json.dumps(item).encode("utf-8") + b"\n"
+            buf.append(line)
+            size += len(line)
+            if size >= 1 << 16:
+                flush()
+                size = 0
+        if buf:
+            flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def error(self, status: HTTPStatus, msg: str) -> None:
+        self.send_json(dict(error=msg), status)
+
+    def sections(self, qs: dict[str, list[str]]) -> list[str] | None:
+        sections = split(qs, "sections")
+        if sections:
+            unknown = set(sections) - set(SECTIONS)
+            if unknown:
+                raise ValueError(f"unknown sections {sorted(unknown)}")
+        return sections
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        url = urlsplit(self.path)
+        qs = parse_qs(url.query)
+        parts = [p for p in url.path.split("/") if p]
+        endpoint = parts[0] if parts else ""
+        inc("serve_requests", endpoint=endpoint)
+        try:
+            with timer("serve", endpoint=endpoint):
+                self.get(endpoint, parts, qs)
+        except ValueError as e:
+            self.error(HTTPStatus.BAD_REQUEST, str(e))
+
+    def get(self, endpoint: str, parts: list[str], qs: dict[str, list[str]]) -> None:
+        if endpoint == "docs" and len(parts) == 2:
+            res = self.api.documents([parts[1]], self.sections(qs))
+            if not res["documents"]:
+                self.error(HTTPStatus.NOT_FOUND, f"no cleaned document for {parts[1]}")
+                return
+            self.send_json(res["documents"][0])
+        elif endpoint == "docs" and len(parts) == 1:
+            self.send_json(
+                self.api.documents(split(qs, "pmids") or [], self.sections(qs))
+            )
+        elif endpoint == "export":
+            year = qs.get("year")
+            self.send_lines(
+                self.api.export(
+                    split(qs, "issn"),
+                    year_range(year[0]) if year else None,
+                    self.sections(qs),
+                ),
+            )
+        elif endpoint == "stats":
+            self.send_json(
+                dict(index=self.api.index.stats(), cache=self.api.cache.stats()),
+            )
+        else:
+            self.error(HTTPStatus.NOT_FOUND, f"unknown endpoint {self.path}")
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        url = urlsplit(self.path)
+        inc("serve_requests", endpoint="docs")
+        if url.path.rstrip("/") != "/docs":
+            self.error(HTTPStatus.NOT_FOUND, f"unknown endpoint {self.path}")
+            return
+        try:
+            n = int(self.headers.get("Content-Length", 0))
+            req = json.loads(self.rfile.read(n) or b"{}")
+            pmids = [str(p) for p in req.get("pmids", [])]
+            sections = self.sections(dict(sections=req.get("sections") or []))
+        except (ValueError, AttributeError) as e:
+            self.error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        with timer("serve", endpoint="docs"):
+            self.send_json(self.api.documents(pmids, sections))
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    cache_size: int = 10000,
+    rescan: float = 60.0,
+) -> None:
+    index = CleanedIndex()
+    start = time.time()
+    n = index.update()
+    click.secho(
+        f"indexed {n} cleaned documents in {time.time() - start:.1f}s: {index.stats()}",
+        fg="blue",
+    )
+    api = CleanedAPI(index, LRUCache(cache_size))
+    handler = type("Handler", (Handler,), dict(api=api))
+    stop = threading.Event()
+
+    def rescanner() -> None:
+        while not stop.wait(rescan):
+            if index.update():
+                click.secho(f"reindexed: {index.stats()}", fg="blue")
+
+    with closing(index), ThreadingHTTPServer((host, port), handler) as server:
+        if rescan > 0:
+            threading.Thread(target=rescanner, daemon=True).start()
+        click.secho(f"serving cleaned documents on http://{host}:{port}", fg="green")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop.set()
@@ -0,0 +1,165 @@
+"""Split downloading and cleaning between several machines.
+
+``--shard i/N`` (0 <= i < N) makes ``download`` and ``clean`` only handle
+the papers whose pmid hashes to i (a stable hash, so every node agrees on
+the partition without talking to the others).
+
+``--queue FILE`` instead lets any number of nodes share the work: before a
+node downloads or cleans a pmid it takes a lease on it in FILE, an SQLite
+database on storage all nodes can reach. A lease that is not finished within
+``--lease`` seconds (the node died) can be taken by another node. A queue
+file records one job: finished pmids are not handed out again, so use a new
+file (or delete it) to redo the work. Whether a download succeeded is still
+decided by the xml_* and failed_* directories as without a queue.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+import click
+
+from ._metrics import inc
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+    index: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def owns(self, pmid: str) -> bool:
+        h = hashlib.blake2b(pmid.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(h, "big") % self.count == self.index
+
+
+def parse_shard(s: str) -> Shard:
+    """ "i/N" -> Shard(i, N)."""
+    i, sep, n = s.partition("/")
+    try:
+        shard = Shard(int(i), int(n))
+    except ValueError:
+        shard = None
+    if not sep or shard is None or not 0 <= shard.index < shard.count:
+        raise ValueError(f'shard must be "i/N" with 0 <= i < N: "{s}"')
+    return shard
+
+
+class LeaseQueue:
+    """pmid leases in an SQLite file shared between nodes."""
+
+    def __init__(self, fname: str, ttl: float = 600.0, owner: str | None = None):
+        self.fname = fname
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.lock = threading.Lock()  # the download workers share one connection
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.fname,
+                timeout=60.0,
+                isolation_level=None,  # we do our own begin immediate
+                check_same_thread=False,
+            )
+            conn.execute(
+                "create table if not exists leases (key text primary key,"
+                " owner text, expires real, done integer default 0)",
+            )
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def acquire(self, key: str) -> bool:
+        """Take the lease on key unless it is finished or leased by a live node."""
+        now = time.time()
+        with self.lock:
+            conn = self.conn
+            conn.execute("begin immediate")
+            try:
+                row = conn.execute(
+                    "select owner, expires, done from leases where key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    owner, expires, done = row
+                    if done or (owner != self.owner and expires > now):
+                        conn.execute("rollback")
+                        return False
+                    if owner != self.owner:
+                        inc("lease_reassigned")
+                        click.secho(f"{key}: lease of {owner} expired", fg="yellow")
+                conn.execute(
+                    "insert or replace into leases values (?, ?, ?, 0)",
+                    (key, self.owner, now + self.ttl),
+                )
+                conn.execute("commit")
+            except BaseException:
+                conn.execute("rollback")
+                raise
+        return True
+
+    @contextmanager
+    def leased(self, key: str) -> Iterator[bool]:
+        """with queue.leased(key) as mine: ... finishes the lease if mine."""
+        if not self.acquire(key):
+            yield False
+            return
+        try:
+            yield True
+        except BaseException:
+            self.release(key)
+            raise
+        self.finish(key)
+
+    def finish(self, key: str) -> None:
+        with self.lock:
+            self.conn.execute(
+                "update leases set done = 1 where key = ? and owner = ?",
+                (key, self.owner),
+            )
+
+    def renew(self, key: str, extra: float = 0.0) -> None:
+        """Keep our lease on key for another extra + ttl seconds."""
+        with self.lock:
+            self.conn.execute(
+                "update leases set expires = ? where key = ? and owner = ? and done = 0",
+                (time.time() + extra + self.ttl, key, self.owner),
+            )
+
+    def release(self, key: str) -> None:
+        """Give the lease back unfinished (e.g. on interrupt)."""
+        with self.lock:
+            self.conn.execute(
+                "delete from leases where key = ? and owner = ? and done = 0",
+                (key, self.owner),
+            )
+
+    def stats(self) -> dict[str, int]:
+        now = time.time()
+        with self.lock:
+            (done,) = self.conn.execute(
+                "select count(*) from leases where done = 1",
+            ).fetchone()
+            (leased,) = self.conn.execute(
+                "select count(*) from leases where done = 0 and expires > ?",
+                (now,),
+            ).fetchone()
+        return dict(done=done, leased=leased)
@@ -0,0 +1,647 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import random
+import tarfile
+import threading
+import time
+import zipfile
+from io import BytesIO
+from os.path import join
+from typing import Any
+from typing import BinaryIO
+from typing import Iterable
+from typing import Iterator
+
+from ._utils import data_dir
+
+# Documents are stored as {DATADIR}/{xml,failed}_<ISSN>/<PMID>.{html,xml}.
+# These directories can also be read directly from an (uncompressed) tar or a
+# zip archive placed in {DATADIR}. e.g. as created by bin/xmltar.sh or bin/zip.sh.
+# Documents may also be zstd compressed (<PMID>.html.zst) with a dictionary
+# trained for each publisher module and stored in {DATADIR}/zstd/<module>.dict
+
+EXTS = (".html", ".xml")
+ARCHIVES = (".tar", ".zip")
+ZSTD = ".zst"
+DICTDIR = "zstd"
+BLOBDIR = "blobs"
+
+
+def split_name(fname: str) -> tuple[str, str, bool] | None:
+    """Return (pmid, ext, compressed) for a document filename."""
+    compressed = fname.endswith(ZSTD)
+    if compressed:
+        fname = fname[: -len(ZSTD)]
+    pmid, ext = os.path.splitext(fname)
+    if ext not in EXTS:
+        return None
+    return pmid, ext, compressed
+
+
+class Codec:
+    """zstd compression using per publisher module dictionaries.
+
+    Decompression finds the dictionary from the id stored in the zstd frame
+    so readers don't need to know which module wrote the document.
+    """
+
+    LEVEL = 19
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._bymodule: dict[str, Any] = {}
+        self._byid: dict[int, Any] | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def zstd() -> Any:
+        # pylint: disable=import-outside-toplevel
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError(
+                "compressed documents need zstandard: pip install zstandard",
+            ) from e
+        return zstandard
+
+    def dict_name(self, module: str) -> str:
+        return join(self.directory, f"{module}.dict")
+
+    def load(self, fname: str) -> Any:
+        zstd = self.zstd()
+        with open(fname, "rb") as fp:
+            d = zstd.ZstdCompressionDict(fp.read())
+        return d
+
+    def for_module(self, module: str) -> Any | None:
+        """Current trained dictionary for module (or None)."""
+        with self._lock:
+            if module not in self._bymodule:
+                fname = self.dict_name(module)
+                self._bymodule[module] = (
+                    self.load(fname) if os.path.exists(fname) else None
+                )
+            return self._bymodule[module]
+
+    def for_id(self, dict_id: int) -> Any:
+        with self._lock:
+            if self._byid is None:
+                self._byid = {}
+                if os.path.isdir(self.directory):
+                    for f in os.listdir(self.directory):
+                        if f.endswith(".dict"):
+                            d = self.load(join(self.directory, f))
+                            self._byid[d.dict_id()] = d
+            if dict_id not in self._byid:
+                raise ValueError(f"no zstd dictionary with id={dict_id}")
+            return self._byid[dict_id]
+
+    def compress(self, data: bytes, module: str | None) -> bytes | None:
+        """Compress data if we have a dictionary for module."""
+        if module is None or not os.path.isdir(self.directory):
+            return None
+        d = self.for_module(module)
+        if d is None:
+            return None
+        zstd = self.zstd()
+        return zstd.ZstdCompressor(level=self.LEVEL, dict_data=d).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        zstd = self.zstd()
+        dict_id = zstd.get_frame_parameters(data).dict_id
+        if dict_id:
+            dctx = zstd.ZstdDecompressor(dict_data=self.for_id(dict_id))
+        else:
+            dctx = zstd.ZstdDecompressor()
+        return dctx.decompress(data)
+
+    def train(self, samples: list[bytes], module: str, size: int = 112640) -> Any:
+        zstd = self.zstd()
+        d = zstd.train_dictionary(size, samples, level=self.LEVEL)
+        os.makedirs(self.directory, exist_ok=True)
+        fname = self.dict_name(module)
+        if os.path.exists(fname):
+            # keep old dictionary: documents may still be compressed with it
+            old = self.load(fname)
+            os.replace(fname, join(self.directory, f"{module}.{old.dict_id()}.dict"))
+        with open(fname, "wb") as fp:
+            fp.write(d.as_bytes())
+        with self._lock:
+            self._bymodule[module] = d
+            self._byid = None
+        return d
+
+
+_CODECS: dict[str, Codec] = {}
+
+
+def codec() -> Codec:
+    ddir = data_dir()
+    if ddir not in _CODECS:
+        _CODECS[ddir] = Codec(join(ddir, DICTDIR))
+    return _CODECS[ddir]
+
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """Content addressed storage: {DATADIR}/blobs/<ab>/<sha256>.
+
+    Documents in xml_<issn> directories are hard links to their blob so
+    the same page downloaded under several ISSNs is only stored once and
+    all readers see ordinary files. Enabled once the blobs directory exists
+    (see ``nlpready dedup``).
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    @property
+    def enabled(self) -> bool:
+        return os.path.isdir(self.directory)
+
+    def path(self, h: str) -> str:
+        return join(self.directory, h[:2], h)
+
+    def put(self, data: bytes) -> str:
+        blob = self.path(digest(data))
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            tmp = f"{blob}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as fp:
+                fp.write(data)
+            os.replace(tmp, blob)
+        return blob
+
+    def link(self, blob: str, fname: str) -> None:
+        """Replace fname with a hard link to blob."""
+        tmp = f"{fname}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.link(blob, tmp)
+        os.replace(tmp, fname)
+
+    def dedup(
+        self,
+        files: Iterable[str],
+        dry_run: bool = False,
+    ) -> tuple[int, int, int]:
+        """Replace files by links to their blob.
+
+        Returns (number of files, number of unique files, bytes reclaimed).
+        """
+        seen: dict[str, tuple[int, int]] = {}  # sha256 -> (dev, inode) of blob
+        nfiles = saved = 0
+        for fname in files:
+            nfiles += 1
+            st = os.stat(fname)
+            with open(fname, "rb") as fp:
+                h = digest(fp.read())
+            blob = self.path(h)
+            if h not in seen:
+                if os.path.exists(blob):
+                    bst = os.stat(blob)
+                    seen[h] = (bst.st_dev, bst.st_ino)
+                else:
+                    if not dry_run:  # first copy becomes the blob
+                        os.makedirs(os.path.dirname(blob), exist_ok=True)
+                        os.link(fname, blob)
+                    seen[h] = (st.st_dev, st.st_ino)
+                    continue
+            if (st.st_dev, st.st_ino) == seen[h]:
+                continue
+            if st.st_nlink == 1:
+                saved += st.st_size
+            if not dry_run:
+                self.link(blob, fname)
+        return nfiles, len(seen), saved
+
+    def gc(self, dry_run: bool = False) -> tuple[int, int]:
+        """Remove blobs that are no longer referenced. Returns (count, bytes)."""
+        n = size = 0
+        if not self.enabled:
+            return n, size
+        for d in os.listdir(self.directory):
+            for f in os.listdir(join(self.directory, d)):
+                blob = join(self.directory, d, f)
+                st = os.stat(blob)
+                if st.st_nlink == 1:
+                    n += 1
+                    size += st.st_size
+                    if not dry_run:
+                        os.unlink(blob)
+        return n, size
+
+
+_BLOBS: dict[str, BlobStore] = {}
+
+
+def blobstore() -> BlobStore:
+    ddir = data_dir()
+    if ddir not in _BLOBS:
+        _BLOBS[ddir] = BlobStore(join(ddir, BLOBDIR))
+    return _BLOBS[ddir]
+
+
+class Store:
+    """A collection of documents keyed by pubmed id."""
+
+    writable = False
+
+    def names(self, ext: str | None = None) -> Iterator[str]:
+        """Stored pubmed ids (optionally only those with extension ext)."""
+        raise NotImplementedError()
+
+    def find(self, pmid: str) -> str | None:
+        """Return the extension of the stored pmid (or None if missing)."""
+        raise NotImplementedError()
+
+    def exists(self, pmid: str) -> bool:
+        return self.find(pmid) is not None
+
+    def read(self, pmid: str) -> bytes:
+        raise NotImplementedError()
+
+    def open(self, pmid: str) -> BinaryIO:
+        return BytesIO(self.read(pmid))
+
+    def mtime(self, pmid: str) -> float | None:
+        raise NotImplementedError()
+
+    def path(self, pmid: str) -> str:
+        """A descriptive name for the document."""
+        raise NotImplementedError()
+
+    def write(
+        self,
+        pmid: str,
+        data: bytes,
+        ext: str = ".html",
+        module: str | None = None,
+    ) -> None:
+        raise OSError(f"{self} is read only")
+
+    def remove(self, pmid: str, ext: str = ".html") -> None:
+        raise OSError(f"{self} is read only")
+
+
+class DirStore(Store):
+    writable = True
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def __repr__(self) -> str:
+        return f"DirStore({self.directory!r})"
+
+    def names(self, ext: str | None = None) -> Iterator[str]:
+        if not os.path.isdir(self.directory):
+            return
+        for f in os.listdir(self.directory):
+            t = split_name(f)
+            if t is not None and (ext is None or t[1] == ext):
+                yield t[0]
+
+    def filename(self, pmid: str) -> str | None:
+        for ext in EXTS:
+            for z in ("", ZSTD):
+                fname = join(self.directory, f"{pmid}{ext}{z}")
+                if os.path.isfile(fname):
+                    return fname
+        return None
+
+    def find(self, pmid: str) -> str | None:
+        fname = self.filename(pmid)
+        if fname is None:
+            return None
+        t = split_name(os.path.basename(fname))
+        return t[1] if t else None
+
+    def path(self, pmid: str) -> str:
+        return self.filename(pmid) or join(self.directory, f"{pmid}{EXTS[-1]}")
+
+    def read(self, pmid: str) -> bytes:
+        fname = self.path(pmid)
+        with open(fname, "rb") as fp:
+            data = fp.read()
+        if fname.endswith(ZSTD):
+            data = codec().decompress(data)
+        return data
+
+    def open(self, pmid: str) -> BinaryIO:
+        fname = self.path(pmid)
+        if fname.endswith(ZSTD):
+            return BytesIO(self.read(pmid))
+        return open(fname, "rb")
+
+    def mtime(self, pmid: str) -> float | None:
+        fname = self.filename(pmid)
+        if fname is None:
+            return None
+        return os.stat(fname).st_mtime
+
+    def write(
+        self,
+        pmid: str,
+        data: bytes,
+        ext: str = ".html",
+        module: str | None = None,
+    ) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fname = join(self.directory, f"{pmid}{ext}")
+        zdata = codec().compress(data, module)
+        if zdata is not None:
+            data = zdata
+            fname += ZSTD
+        self.remove(pmid, ext)
+        blobs = blobstore()
+        if blobs.enabled:
+            blobs.link(blobs.put(data), fname)
+        else:
+            with open(fname, "wb") as fp:
+                fp.write(data)
+
+    def remove(self, pmid: str, ext: str = ".html") -> None:
+        for z in ("", ZSTD):
+            try:
+                os.unlink(join(self.directory, f"{pmid}{ext}{z}"))
+            except FileNotFoundError:
+                pass
+
+    def samples(self, n: int) -> list[bytes]:
+        """Random sample of documents for training."""
+        pmids = list(self.names())
+        return [self.read(pmid) for pmid in random.sample(pmids, min(n, len(pmids)))]
+
+    def files(self) -> Iterator[str]:
+        """Full path of every document file."""
+        if not os.path.isdir(self.directory):
+            return
+        for f in os.listdir(self.directory):
+            if split_name(f) is not None:
+                yield join(self.directory, f)
+
+    def compress(self, module: str) -> tuple[int, int]:
+        """Compress all uncompressed documents. Returns (before, after) sizes."""
+        before = after = 0
+        blobs = blobstore()
+        for f in os.listdir(self.directory):
+            t = split_name(f)
+            if t is None or t[2]:
+                continue
+            fname = join(self.directory, f)
+            with open(fname, "rb") as fp:
+                data = fp.read()
+            zdata = codec().compress(data, module)
+            if zdata is None:
+                break
+            st = os.stat(fname)
+            times = (st.st_atime_ns, st.st_mtime_ns)  # keep mtime
+            if blobs.enabled:  # stay deduplicated (as in write)
+                blobs.link(blobs.put(zdata), fname + ZSTD)
+                os.utime(fname + ZSTD, ns=times)
+            else:
+                tmp = fname + ZSTD + ".tmp"
+                with open(tmp, "wb") as fp:
+                    fp.write(zdata)
+                os.utime(tmp, ns=times)
+                os.replace(tmp, fname + ZSTD)
+            os.unlink(fname)
+            before += len(data)
+            after += len(zdata)
+        return before, after
+
+
+# (offset or zip member name, size, mtime, ext) of each pmid for
+# each directory in the archive
+Index = dict[str, dict[str, tuple[int | str, int, float, str]]]
+
+
+def split_member(name: str) -> tuple[str, str, str] | None:
+    """Return (directory, pmid, ext) for an archive member like data/xml_X/123.html."""
+    parts = name.rstrip("/").split("/")
+    if len(parts) < 2:
+        return None
+    d = parts[-2]
+    if not d.startswith(("xml_", "failed_")):
+        return None
+    t = split_name(parts[-1])
+    if t is None:
+        return None
+    pmid, ext, compressed = t
+    return d, pmid, ext + ZSTD if compressed else ext
+
+
+class Archive:
+    """Random access to the documents in a tar or zip file.
+
+    A member offset index is built on first use and saved next to the
+    archive as ``<archive>.idx``. It is rebuilt if the archive changes.
+    """
+
+    def __init__(self, fname: str) -> None:
+        self.fname = fname
+        self.is_zip = fname.endswith(".zip")
+        self.index: Index = self.load_index()
+        self._zip: zipfile.ZipFile | None = None
+        self._fd: int | None = None
+        # pread is thread safe, zip access is guarded by a lock
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"Archive({self.fname!r})"
+
+    def _key(self) -> tuple[int, int]:
+        st = os.stat(self.fname)
+        return st.st_size, st.st_mtime_ns
+
+    def load_index(self) -> Index:
+        idx = self.fname + ".idx"
+        key = self._key()
+        if os.path.exists(idx):
+            with open(idx, "rb") as fp:
+                k, index = pickle.load(fp)
+            if k == key:
+                return index
+        index = self.build_index()
+        try:
+            with open(idx + ".tmp", "wb") as fp:
+                pickle.dump((key, index), fp)
+            os.replace(idx + ".tmp", idx)
+        except OSError:  # read only? just rebuild next time
+            pass
+        return index
+
+    def build_index(self) -> Index:
+        index: Index = {}
+        if self.is_zip:
+            with zipfile.ZipFile(self.fname) as zf:
+                for info in zf.infolist():
+                    t = split_member(info.filename)
+                    if t is None:
+                        continue
+                    d, pmid, ext = t
+                    # zips have their own index so just keep the member name
+                    index.setdefault(d, {})[pmid] = (
+                        info.filename,
+                        info.file_size,
+                        time.mktime(info.date_time + (0, 0, -1)),
+                        ext,
+                    )
+            return index
+        try:
+            tar = tarfile.open(self.fname, "r:")  # no compression
+        except tarfile.ReadError as e:
+            raise ValueError(
+                f"{self.fname}: only uncompressed tar files can be randomly accessed",
+            ) from e
+        with tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                t = split_member(member.name)
+                if t is None:
+                    continue
+                d, pmid, ext = t
+                index.setdefault(d, {})[pmid] = (
+                    member.offset_data,
+                    member.size,
+                    float(member.mtime),
+                    ext,
+                )
+        return index
+
+    def read(self, d: str, pmid: str) -> bytes:
+        offset, size, _, ext = self.index[d][pmid]
+        if isinstance(offset, str):  # zip member name
+            with self._lock:
+                if self._zip is None:
+                    self._zip = zipfile.ZipFile(self.fname)
+                data = self._zip.read(offset)
+        else:
+            if self._fd is None:
+                with self._lock:
+                    if self._fd is None:
+                        self._fd = os.open(self.fname, os.O_RDONLY)
+            data = os.pread(self._fd, size, offset)
+        if ext.endswith(ZSTD):
+            data = codec().decompress(data)
+        return data
+
+
+class ArchiveStore(Store):
+    def __init__(self, archive: Archive, d: str) -> None:
+        self.archive = archive
+        self.d = d
+        self.entries = archive.index.get(d, {})
+
+    def __repr__(self) -> str:
+        return f"ArchiveStore({self.archive.fname!r}, {self.d!r})"
+
+    def names(self, ext: str | None = None) -> Iterator[str]:
+        if ext is None:
+            yield from self.entries
+        else:
+            for pmid, e in self.entries.items():
+                if e[3].removesuffix(ZSTD) == ext:
+                    yield pmid
+
+    def find(self, pmid: str) -> str | None:
+        e = self.entries.get(pmid)
+        return e[3].removesuffix(ZSTD) if e else None
+
+    def read(self, pmid: str) -> bytes:
+        return self.archive.read(self.d, pmid)
+
+    def mtime(self, pmid: str) -> float | None:
+        e = self.entries.get(pmid)
+        return e[2] if e else None
+
+    def path(self, pmid: str) -> str:
+        e = self.entries.get(pmid)
+        return f"{self.archive.fname}:{self.d}/{pmid}{e[3] if e else ''}"
+
+
+class MultiStore(Store):
+    """Directory store layered over any archives. Writes go to the directory."""
+
+    writable = True
+
+    def __init__(self, stores: list[Store]) -> None:
+        self.stores = stores
+
+    def __repr__(self) -> str:
+        return f"MultiStore({self.stores!r})"
+
+    def _which(self, pmid: str) -> Store:
+        for s in self.stores:
+            if s.exists(pmid):
+                return s
+        return self.stores[0]
+
+    def names(self, ext: str | None = None) -> Iterator[str]:
+        seen: set[str] = set()
+        for s in self.stores:
+            for pmid in s.names(ext):
+                if pmid not in seen:
+                    seen.add(pmid)
+                    yield pmid
+
+    def find(self, pmid: str) -> str | None:
+        for s in self.stores:
+            ext = s.find(pmid)
+            if ext is not None:
+                return ext
+        return None
+
+    def read(self, pmid: str) -> bytes:
+        return self._which(pmid).read(pmid)
+
+    def open(self, pmid: str) -> BinaryIO:
+        return self._which(pmid).open(pmid)
+
+    def mtime(self, pmid: str) -> float | None:
+        return self._which(pmid).mtime(pmid)
+
+    def path(self, pmid: str) -> str:
+        return self._which(pmid).path(pmid)
+
+    def write(
+        self,
+        pmid: str,
+        data: bytes,
+        ext: str = ".html",
+        module: str | None = None,
+    ) -> None:
+        self.stores[0].write(pmid, data, ext, module)
+
+    def remove(self, pmid: str, ext: str = ".html") -> None:
+        self.stores[0].remove(pmid, ext)
+
+
+_ARCHIVES: dict[str, list[Archive]] = {}
+
+
+def archives() -> list[Archive]:
+    """All tar/zip archives in the data directory (cached)."""
+    ddir = data_dir()
+    if ddir not in _ARCHIVES:
+        found = []
+        if os.path.isdir(ddir):
+            for f in sorted(os.listdir(ddir)):
+                if f.endswith(ARCHIVES):
+                    found.append(Archive(join(ddir, f)))
+        _ARCHIVES[ddir] = found
+    return _ARCHIVES[ddir]
+
+
+def get_store(d: str) -> Store:
+    """Return the document store for a directory such as "xml_<issn>"."""
+    dstore = DirStore(join(data_dir(), d))
+    astores: list[Store] = [ArchiveStore(a, d) for a in archives() if d in a.index]
+    if not astores:
+        return dstore
+    return MultiStore([dstore, *astores])
@@ -16,6 +16,7 @@ from tabulate import tabulate  # type: ignore
 from ._mlabc import read_issn
 from ._mlabc import read_suba_papers_csv
 from ._mlabc import USER_AGENT
+from ._store import get_store
 from ._utils import data_dir
 
 if TYPE_CHECKING:
@@ -27,12 +28,8 @@ def _glob(d, g):
 
 
 def get_dir(xmld: str, ext: str = ".xml") -> list[str]:
-    res = []
-    for f in glob.glob(_glob(f"{xmld}", f"*{ext}")):
-        _, fname = os.path.split(f)
-        pmid, _ = os.path.splitext(fname)
-        res.append(pmid)
-    return res
+    # handles compressed and archived documents
+    return list(get_store(os.path.basename(xmld)).names(ext))
 
 
 def getext(xmld: str) -> str:
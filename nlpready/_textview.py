@@ -0,0 +1,150 @@
+"""Read-only text extraction with replacements.
+
+Clean.tostr used to rewrite the soup in place (figures, tables and
+citations replaced with placeholders) before collecting the paragraph
+text. A TextView records the replacements instead and answers select and
+get_text as if they had been made, so the tree is never modified and can
+be shared between several consumers (threads, templates, repeated calls).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Callable
+from typing import Iterator
+from typing import TYPE_CHECKING
+from typing import Union
+
+import soupsieve
+from bs4 import NavigableString
+from bs4 import Tag
+
+if TYPE_CHECKING:
+    from bs4 import PageElement
+
+Match = Union[str, Callable[[Tag], bool]]
+
+
+@lru_cache(maxsize=512)
+def compiled(css: str) -> soupsieve.SoupSieve:
+    return soupsieve.compile(css)
+
+
+class TextView:
+    """A view of a (sub)tree with some elements replaced.
+
+    ``v.replace(tag, "CITATION")`` is the non-mutating version of
+    ``tag.replace_with("CITATION")``; ``v.select(sec, css)`` and ``v.text(p)``
+    are ``sec.select(css)`` and ``p.text`` on the tree as it would be after
+    the replacements.
+    """
+
+    def __init__(
+        self, compile_: Callable[[str], soupsieve.SoupSieve] = compiled
+    ) -> None:
+        # id(original tag) -> replacement (None means removed)
+        self.subs: dict[int, NavigableString | Tag | None] = {}
+        # keep the replaced tags alive so their ids stay unique
+        self.replaced: list[Tag] = []
+        # css -> compiled selector (Clean.compiled for its precompiled ones)
+        self.compile = compile_
+
+    def replace(self, tag: Tag, new: str | Tag | None) -> None:
+        if isinstance(new, str) and not isinstance(new, NavigableString):
+            new = NavigableString(new)
+        self.subs[id(tag)] = new
+        self.replaced.append(tag)
+
+    def remove(self, tag: Tag) -> None:
+        """Non-mutating tag.decompose()."""
+        self.replace(tag, None)
+
+    def children(self, node: Tag) -> Iterator[PageElement]:
+        for c in node.contents:
+            if id(c) in self.subs:
+                new = self.subs[id(c)]
+                if new is not None:
+                    yield new
+            else:
+                yield c
+
+    def descendants(self, node: Tag) -> Iterator[PageElement]:
+        """Descendants of node in document order."""
+        stack = list(reversed(list(self.children(node))))
+        while stack:
+            el = stack.pop()
+            yield el
+            if isinstance(el, Tag):
+                stack.extend(reversed(list(self.children(el))))
+
+    def select(self, node: Tag, match: Match) -> list[Tag]:
+        """node.select(css) or, for a function, node.find_all(function).
+
+        Replacement tags are matched on their own (they have no parents).
+        """
+        if not self.subs:
+            if isinstance(match, str):
+                return self.compile(match).select(node)
+            return node.find_all(match)
+        test = self.compile(match).match if isinstance(match, str) else match
+        return [el for el in self.descendants(node) if isinstance(el, Tag) and test(el)]
+
+    def select_all(self, nodes: list[Tag], match: Match) -> list[Tag]:
+        """select over several nodes, including each node that matches itself.
+
+        Clean.flat_sections returns the paragraphs, figures ... of a section
+        themselves rather than a container of them.
+        """
+        test = self.compile(match).match if isinstance(match, str) else match
+        found = []
+        for node in nodes:
+            new = self.resolve(node)
+            if not isinstance(new, Tag):
+                continue
+            if test(new):
+                found.append(new)
+            found.extend(self.select(new, match))
+        return found
+
+    def resolve(self, node: PageElement) -> PageElement | None:
+        """node or what it has been replaced with."""
+        return self.subs.get(id(node), node)
+
+    def select_one(self, node: Tag, css: str) -> Tag | None:
+        found = self.select(node, css)
+        return found[0] if found else None
+
+    def text(self, node: PageElement, separator: str = "", strip: bool = False) -> str:
+        """node.get_text(separator, strip)."""
+        if not isinstance(node, Tag) or not self.subs:
+            return node.get_text(separator, strip)
+        types = node.interesting_string_types
+        if types is None:
+            types = node.MAIN_CONTENT_STRING_TYPES
+        strings = []
+        for el in self.descendants(node):
+            if not isinstance(el, NavigableString):
+                continue
+            if isinstance(types, type):
+                if type(el) is not types:
+                    continue
+            elif type(el) not in types:
+                continue
+            text: str = el
+            if strip:
+                text = el.strip()
+                if not text:
+                    continue
+            strings.append(text)
+        return separator.join(strings)
+
+    def string(self, node: PageElement) -> str | None:
+        """node.string."""
+        if isinstance(node, NavigableString):
+            return node
+        if not isinstance(node, Tag):
+            return None
+        children = list(self.children(node))
+        if len(children) != 1:
+            return None
+        return self.string(children[0])
@@ -0,0 +1,268 @@
+"""Adaptive per-host request rate for the downloads.
+
+Instead of a fixed ``--sleep`` between requests every host (doi.org, each
+publisher) gets its own delay that is adjusted AIMD style (like TCP
+congestion control) from the responses: every healthy, fast response speeds
+the host up a little (additive increase of the request rate), a 429 or 503
+halves the rate and honours Retry-After, other server errors, connection
+errors and responses much slower than usual slow it down. The delays are
+shared by all the journals (and download threads) of a run and saved in
+``{DATADIR}/throttle.json`` so the next run starts at the learned rate.
+
+The throttle sits in the HTTPAdapter of the download session (see
+make_session), so every request and every redirect hop is paced, including
+the modules' own get_response. Selenium downloads keep the fixed sleep.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from os.path import join
+from typing import Any
+from urllib.parse import urlsplit
+
+import click
+from requests import PreparedRequest
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestConnectionError
+from requests.exceptions import Timeout
+
+from ._metrics import inc
+from ._metrics import metrics
+from ._utils import data_dir
+
+THROTTLEFILE = "throttle.json"
+
+CONGESTED = {429, 503}
+
+
+def retry_after(resp: Any) -> float | None:
+    """Seconds to wait from a Retry-After header (seconds or HTTP date)."""
+    headers = getattr(resp, "headers", None)
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostRate:
+    __slots__ = ("interval", "latency", "baseline", "next", "updated")
+
+    def __init__(
+        self,
+        interval: float,
+        latency: float | None = None,
+        updated: float = 0.0,
+    ) -> None:
+        self.interval = interval  # seconds between requests
+        self.latency = latency  # moving average of the response time
+        # the usual latency: follows drops at once, rises slowly. Not saved:
+        # a fast spell in an old run must not make every response "slow"
+        self.baseline: float | None = None
+        self.next = 0.0  # time the next request may start
+        self.updated = updated
+
+    @classmethod
+    def fromdict(cls, d: dict[str, Any]) -> HostRate:
+        return cls(float(d["interval"]), d.get("latency"), d.get("updated", 0.0))
+
+    def todict(self) -> dict[str, Any]:
+        return dict(
+            interval=self.interval,
+            latency=self.latency,
+            updated=self.updated,
+        )
+
+
+class Throttle:
+    MIN_INTERVAL = 0.2
+    MAX_INTERVAL = 300.0
+    STEP = 0.01  # requests/s added after each healthy response
+    DECREASE = 0.5  # rate multiplied by this on 429/503
+    ERROR_DECREASE = 0.75  # ... on other server errors and connection errors
+    SLOW_DECREASE = 0.9  # ... on a response much slower than the baseline
+    SLOW = 2.0  # "much slower" is this times the baseline latency ...
+    SLACK = 0.5  # ... plus this many seconds
+    EWMA = 0.2
+    BASELINE_EWMA = 0.05  # how fast the baseline follows a rising latency
+
+    def __init__(self, fname: str | None = None) -> None:
+        self.fname = fname or join(data_dir(), THROTTLEFILE)
+        self.lock = threading.Lock()
+        self.hosts: dict[str, HostRate] = {}
+        self.changed = False
+        if os.path.exists(self.fname):
+            try:
+                with open(self.fname, encoding="utf-8") as fp:
+                    for host, d in json.load(fp).items():
+                        self.hosts[host] = HostRate.fromdict(d)
+            except (ValueError, TypeError, KeyError) as e:
+                click.secho(f"ignoring {self.fname}: {e}", fg="yellow")
+
+    def host(self, host: str, initial: float) -> HostRate:
+        rate = self.hosts.get(host)
+        if rate is None:
+            interval = min(max(initial, self.MIN_INTERVAL), self.MAX_INTERVAL)
+            rate = self.hosts[host] = HostRate(interval)
+        return rate
+
+    def wait(self, host: str, initial: float = 5.0) -> float:
+        """Sleep until host may be asked again. Returns the seconds slept."""
+        with self.lock:
+            rate = self.host(host, initial)
+            now = time.time()
+            start = max(now, rate.next)
+            rate.next = start + rate.interval  # reserve our slot
+        delay = start - now
+        if delay > 0:
+            metrics().observe("throttle_wait", delay, host=host)
+            time.sleep(delay)
+        return delay
+
+    def slower(self, rate: HostRate, factor: float, host: str, why: str) -> None:
+        rate.interval = min(self.MAX_INTERVAL, rate.interval / factor)
+        inc("throttle_backoff", host=host, reason=why)
+
+    def observe(
+        self,
+        host: str,
+        status: int | None,
+        seconds: float | None,
+        wait: float | None = None,
+        congested: int = 0,
+    ) -> None:
+        """Adjust host's rate after a response (status None: no response).
+
+        seconds is the response time, None if unknown (e.g. it includes the
+        session's own retries). congested is the number of 429/503 responses
+        those retries saw before this one.
+        """
+        with self.lock:
+            rate = self.host(host, self.MIN_INTERVAL)
+            now = time.time()
+            if status in CONGESTED or congested:
+                self.slower(rate, self.DECREASE, host, "congested")
+                if wait:  # Retry-After
+                    rate.next = max(rate.next, now + wait)
+            elif status is None or status >= 500:
+                self.slower(rate, self.ERROR_DECREASE, host, "error")
+            else:
+                slow = (
+                    seconds is not None
+                    and rate.baseline is not None
+                    and seconds > self.SLOW * rate.baseline + self.SLACK
+                )
+                if slow:
+                    self.slower(rate, self.SLOW_DECREASE, host, "slow")
+                else:
+                    rate.interval = max(
+                        self.MIN_INTERVAL,
+                        1.0 / (1.0 / rate.interval + self.STEP),
+                    )
+                if seconds is not None:
+                    self.update_latency(rate, seconds)
+            rate.updated = now
+            self.changed = True
+
+    def update_latency(self, rate: HostRate, seconds: float) -> None:
+        if rate.latency is None:
+            rate.latency = seconds
+        else:
+            rate.latency += self.EWMA * (seconds - rate.latency)
+        if rate.baseline is None or rate.latency < rate.baseline:
+            rate.baseline = rate.latency
+        else:
+            rate.baseline += self.BASELINE_EWMA * (rate.latency - rate.baseline)
+
+    def save(self) -> None:
+        with self.lock:
+            if not self.changed:
+                return
+            data = {h: r.todict() for h, r in sorted(self.hosts.items())}
+            self.changed = False
+        tmp = f"{self.fname}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump(data, fp, indent=2)
+        os.replace(tmp, self.fname)
+
+    def report(self, since: float = 0.0) -> None:
+        with self.lock:
+            for host, rate in sorted(self.hosts.items()):
+                if rate.updated < since:
+                    continue
+                latency = f"{rate.latency:.2f}s" if rate.latency is not None else "-"
+                click.secho(
+                    f"{host}: one request every {rate.interval:.1f}s"
+                    f" (latency {latency})",
+                    fg="blue",
+                )
+
+
+_THROTTLE: Throttle | None = None
+_LOCK = threading.Lock()
+
+
+def throttle() -> Throttle:
+    """The throttle shared by all downloads of this process."""
+    global _THROTTLE  # pylint: disable=global-statement
+    with _LOCK:
+        if _THROTTLE is None:
+            _THROTTLE = Throttle()
+        return _THROTTLE
+
+
+def retry_history(resp: Response) -> tuple[Any, ...]:
+    """The attempts urllib3 retried before resp (RequestHistory tuples)."""
+    retries = getattr(resp.raw, "retries", None)
+    return tuple(getattr(retries, "history", None) or ())
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """HTTPAdapter that paces requests with a Throttle."""
+
+    def __init__(
+        self,
+        throttle_: Throttle,
+        initial: float = 5.0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.throttle = throttle_
+        self.initial = initial  # delay for hosts we know nothing about
+
+    def send(  # type: ignore[override]
+        self,
+        request: PreparedRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Response:
+        host = urlsplit(request.url or "").hostname or ""
+        self.throttle.wait(host, self.initial)
+        start = time.perf_counter()
+        try:
+            resp = super().send(request, *args, **kwargs)
+        except (RequestConnectionError, Timeout):
+            self.throttle.observe(host, None, time.perf_counter() - start)
+            raise
+        history = retry_history(resp)
+        self.throttle.observe(
+            host,
+            resp.status_code,
+            # the time of a retried request includes urllib3's sleeps
+            None if history else time.perf_counter() - start,
+            retry_after(resp),
+            sum(1 for h in history if h.status in CONGESTED),
+        )
+        return resp
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Paper:
     pmid: str
     year: int
@@ -23,7 +23,7 @@ class Paper:
         )
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class NCBIPaper(Paper):
     abstract: str | None
     authors: list[tuple[str | None, str | None, str | None]]
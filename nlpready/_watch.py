@@ -0,0 +1,281 @@
+"""Keep metadata, downloads and cleaned documents up to date.
+
+``nlpready watch PMIDS.csv`` runs ``journals`` -> ``download`` -> ``clean``
+-> ``tohtml`` incrementally in a loop instead of as a nightly batch. Every
+``--interval`` seconds it checks
+
+* the pmid CSV: when it changed the NCBI metadata of the new pmids is
+  fetched (appended to the papers CSV like ``journals``),
+* the papers CSV: journals that gained papers get their downloads
+  scheduled,
+* the download directories: journals with new downloads (from this process
+  or any other) are cleaned (existing clean files are kept) and their
+  ``tohtml`` report is refreshed.
+
+Progress goes to a JSON state file (``{DATADIR}/watch.json``) that is
+rewritten after each step: it shows what the watcher is doing and a
+restarted watcher resumes the journals that were still scheduled.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import Counter
+from os.path import join
+from typing import Any
+from typing import Callable
+from typing import TYPE_CHECKING
+
+import click
+
+from ._metrics import inc
+from ._metrics import timer
+from ._mlabc import FAKE_ISSN
+from ._mlabc import issn2journal
+from ._mlabc import pmid2doi
+from ._mlabc import read_suba_papers_csv
+from ._mlabc import readxml
+from ._utils import data_dir
+from ._utils import getconfig
+
+if TYPE_CHECKING:
+    from ._browser import BrowserSession
+    from ._cli import NLPMod
+    from ._throttle import Throttle
+
+STATEFILE = "watch.json"
+
+
+def fingerprint(fname: str) -> list[float] | None:
+    """(mtime, size) of fname or None if it doesn't exist."""
+    try:
+        st = os.stat(fname)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime, st.st_size]
+
+
+class Watcher:
+    def __init__(
+        self,
+        csvfile: str,
+        modules: dict[str, NLPMod],
+        refresh: Callable[[list[str], list[str]], None],
+        *,
+        header: bool = True,
+        pcol: int = 0,
+        email: str | None = None,
+        api_key: str | None = None,
+        sleep: float = 10.0,
+        mx: int = 0,
+        workers: int | None = None,
+        browser_session: BrowserSession | None = None,
+        statefile: str | None = None,
+        throttle: Throttle | None = None,
+    ) -> None:
+        """modules is module name -> getmod(name); refresh(mods, issns) rebuilds
+        the tohtml reports of those journals.
+        """
+        self.csvfile = csvfile
+        self.modules = modules
+        self.refresh = refresh
+        self.header = header
+        self.pcol = pcol
+        self.email = email
+        self.api_key = api_key
+        self.sleep = sleep
+        self.mx = mx
+        self.workers = workers
+        self.browser_session = browser_session
+        self.statefile = statefile or join(data_dir(), STATEFILE)
+        self.throttle = throttle
+        self.issn2mod = {issn: m for m, d in modules.items() for issn in d["issn"]}
+        self.state = self.load()
+
+    def load(self) -> dict[str, Any]:
+        state: dict[str, Any] = dict(
+            csv=None,
+            papers_csv=None,
+            papers={},  # issn -> papers in the papers CSV
+            downloads={},  # issn -> downloaded documents that have been cleaned
+            pending_download=[],
+            pending_clean=[],
+            errors={},
+            cycles=0,
+            phase="starting",
+            last={},
+        )
+        if os.path.exists(self.statefile):
+            with open(self.statefile, encoding="utf-8") as fp:
+                state.update(json.load(fp))
+        for key in ("pending_download", "pending_clean"):
+            # e.g. a different --mod than last time
+            state[key] = [i for i in state[key] if i in self.issn2mod]
+        state["pid"] = os.getpid()
+        state["started"] = time.time()
+        return state
+
+    def save(self, phase: str | None = None) -> None:
+        if phase is not None:
+            self.state["phase"] = phase
+        self.state["updated"] = time.time()
+        tmp = f"{self.statefile}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump(self.state, fp, indent=2)
+        os.replace(tmp, self.statefile)
+
+    def schedule(self, key: str, issns: list[str]) -> None:
+        pending = self.state[key]
+        pending.extend(i for i in sorted(issns) if i not in pending)
+
+    def metadata(self) -> int:
+        """Fetch the NCBI metadata of new pmids, return how many were added."""
+        fp = fingerprint(self.csvfile)
+        if fp is None or fp == self.state["csv"]:
+            return 0
+        # pylint: disable=import-outside-toplevel
+        from ._download import getmeta
+        from ._download import read_done
+
+        conf = getconfig()
+        self.save(f"metadata {self.csvfile}")
+        before = len(read_done(conf.suba_csv))
+        getmeta(
+            self.csvfile,
+            pubmeds=conf.suba_csv,
+            email=self.email or conf.email,
+            api_key=self.api_key or conf.api_key,
+            header=self.header,
+            pcol=self.pcol,
+            sleep=0.37,
+        )
+        self.state["csv"] = fp
+        return len(read_done(conf.suba_csv)) - before
+
+    def new_papers(self) -> list[str]:
+        """Schedule the downloads of the journals that gained papers."""
+        conf = getconfig()
+        fp = fingerprint(conf.suba_csv)
+        if fp is None or fp == self.state["papers_csv"]:
+            return []
+        counts = Counter(p.issn for p in read_suba_papers_csv())
+        old = self.state["papers"]
+        issns = [i for i, n in counts.items() if i in self.issn2mod and n != old.get(i)]
+        if issns:
+            # the catch-all modules may want any new paper
+            issns.extend(i for i in self.issn2mod if i in FAKE_ISSN)
+        self.state["papers"] = {i: n for i, n in counts.items() if i in self.issn2mod}
+        self.state["papers_csv"] = fp
+        self.schedule("pending_download", issns)
+        return issns
+
+    def download(self) -> int:
+        n = 0
+        pending = self.state["pending_download"]
+        while pending:
+            issn = pending[0]
+            m = self.issn2mod[issn]
+            self.save(f"download {m} {issn}")
+            kwargs: dict[str, Any] = dict(
+                browser_session=self.browser_session,
+                throttle=self.throttle,
+            )
+            if self.workers:
+                kwargs["workers"] = self.workers
+            try:
+                with timer("watch_download", module=m, issn=issn):
+                    self.modules[m]["download"](
+                        issn,
+                        sleep=self.sleep,
+                        mx=self.mx,
+                        **kwargs,
+                    )
+                self.state["errors"].pop(issn, None)
+            except Exception as e:  # pylint: disable=broad-except
+                # one broken journal must not stop the others
+                self.error(issn, "download", e)
+            pending.pop(0)
+            n += 1
+        return n
+
+    def new_downloads(self) -> list[str]:
+        """Schedule the cleaning of the journals with new downloads."""
+        seen = self.state["downloads"]
+        issns = []
+        for issn in self.issn2mod:
+            n = sum(1 for _ in readxml(f"xml_{issn}"))
+            if n and n != seen.get(issn):
+                issns.append(issn)
+        self.schedule("pending_clean", issns)
+        return issns
+
+    def clean(self) -> list[str]:
+        pending = self.state["pending_clean"]
+        if not pending:
+            return []
+        p2i = pmid2doi()
+        journals = issn2journal(p2i)
+        done = []
+        while pending:
+            issn = pending[0]
+            m = self.issn2mod[issn]
+            self.save(f"clean {m} {issn}")
+            n = sum(1 for _ in readxml(f"xml_{issn}"))
+            try:
+                with timer("watch_clean", module=m, issn=issn):
+                    g = self.modules[m]["Generate"](
+                        issn,
+                        pmid2doi=p2i,
+                        journal=journals.get(issn),
+                    )
+                    g.run(overwrite=False, prefix=m)
+                self.state["downloads"][issn] = n
+                done.append(issn)
+            except Exception as e:  # pylint: disable=broad-except
+                self.error(issn, "clean", e)
+            pending.pop(0)
+        if done:
+            self.save("report " + ",".join(done))
+            try:
+                self.refresh(sorted({self.issn2mod[i] for i in done}), done)
+            except Exception as e:  # pylint: disable=broad-except
+                self.error("tohtml", "report", e)
+        return done
+
+    def error(self, key: str, phase: str, e: Exception) -> None:
+        inc("watch_errors", phase=phase)
+        click.secho(f"{phase} {key} failed: {e}", fg="red", err=True)
+        self.state["errors"][key] = dict(phase=phase, error=str(e), time=time.time())
+
+    def cycle(self) -> dict[str, Any]:
+        """One pass over metadata, downloads and cleaning."""
+        start = time.time()
+        last: dict[str, float] = dict(
+            new_pmids=self.metadata(),
+            journals=len(self.new_papers()),
+            downloaded=self.download(),
+        )
+        self.new_downloads()
+        last["cleaned"] = len(self.clean())
+        last["seconds"] = time.time() - start
+        self.state["cycles"] += 1
+        self.state["last"] = last
+        self.save("idle")
+        return last
+
+    def run(self, interval: float = 60.0, once: bool = False) -> None:
+        self.save()
+        while True:
+            last = self.cycle()
+            if any(last[k] for k in ("new_pmids", "downloaded", "cleaned")):
+                click.secho(
+                    f"{last['new_pmids']} new pmids, {last['downloaded']} journals"
+                    f" downloaded, {last['cleaned']} cleaned"
+                    f" in {last['seconds']:.0f}s",
+                    fg="green",
+                )
+            if once:
+                return
+            time.sleep(interval)
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-from collections import defaultdict
+from typing import Any
 from typing import TYPE_CHECKING
 
-import requests
 
 from ._mlabc import Clean
 from ._mlabc import Download
@@ -13,6 +12,7 @@ from ._mlabc import Response
 if TYPE_CHECKING:
     from bs4 import BeautifulSoup, Tag
     from ._mlabc import Paper
+    from ._textview import TextView
 
 ISSN = {
     "1059-1524": "Mol. Biol. Cell",
@@ -21,97 +21,74 @@ ISSN = {
 }
 
 
+def has_class(d: Tag, cls: str) -> bool:
+    return d.has_attr("class") and cls in d["class"]
+
+
+def ok_elem(tag: Tag) -> bool:
+    return tag.name in {"p", "figure"} or has_class(tag, "article-table-content")
+
+
 class ASCB(Clean):
+    FLAT_ELEMENTS = staticmethod(ok_elem)
+
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article__body")[0]
+        a = self.select(root, "div.article__body")[0]
         assert a
         self.article = a
+        self.fulltext = self.select(self.article, "div.hlFld-Fulltext")[0]
 
         sections = {"results", "materials and methods"}
-        res = {k.lower(): v for k, v in self._full_text()}
-
-        assert set(res) & sections
-        self.resultsd = res
-
-    def _full_text(self) -> list[tuple[str, list[Tag]]]:
-        target = None
-        targets = []
-        objs = defaultdict(list)
-        a = self.article.select("div.hlFld-Fulltext")[0]
-
-        def has_class(d, cls):
-            return d.has_attr("class") and cls in d["class"]
-
-        for d in a.contents:
-            if not isinstance(d, Tag):
-                continue
-            if d.name == "h2":
-                target = d.text.strip()
-                targets.append(target)
-            elif (
-                d.name == "p"
-                or d.name == "figure"
-                or has_class(d, "article-table-content")
-            ):
-                if target:
-                    objs[target].append(d)
-        return [(t, objs[t]) for t in targets]
+        assert set(self.flat_sections(self.fulltext)) & sections
 
     def results(self) -> list[Tag]:
-        return self.resultsd.get("results") or []
+        return self.flat_section(("results",), container=self.fulltext)
 
     def methods(self) -> list[Tag]:
-        return self.resultsd.get("materials and methods") or []
+        return self.flat_section(("materials and methods",), container=self.fulltext)
 
     def abstract(self) -> list[Tag]:
-        s = self.article.select("div.abstractSection.abstractInFull")
+        s = self.select(self.article, "div.abstractSection.abstractInFull")
         if s:
             v = s[0]
-            return v.select("p") or [v]
+            return self.select(v, "p") or [v]
         return []
 
     def full_text(self) -> list[Tag]:
-        return [tag for _, lt in self._full_text() for tag in lt]
+        # everything after the first heading
+        return [
+            tag
+            for name, lt in self.flat_sections(self.fulltext).items()
+            if name
+            for tag in lt
+        ]
 
     def title(self) -> str | None:
-        s = self.root.select("h1.citation__title")
+        s = self.select(self.root, "h1.citation__title")
         if s:
             return s[0].text.strip()
         return super().title()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
-        def has_class(d, cls):
-            return d.has_attr("class") and cls in d["class"]
-
-        ss = []
-        for sec in seclist:
-            for section in sec:
-                if not isinstance(section, Tag):
-                    continue
-                for a in section.select("a.tab-link"):
-                    a.replace_with("CITATION")
-
-                if section.name == "figure":
-                    ss.append(self.newfig(section))
-                elif has_class(section, "article-table-content"):
-                    ss.append(self.newtable(section, caption="caption"))
-                else:
-                    for s in section.select("figure"):
-                        s.replace_with(self.newfig(s))
-                    ss.append(section)
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
+        for a in v.select_all(seclist, "a.tab-link"):
+            v.replace(a, "CITATION")
+        for f in v.select_all(seclist, "figure"):
+            v.replace(f, self.newfig(f, view=v))
+        for t in v.select_all(seclist, "div.article-table-content"):
+            v.replace(t, self.newtable(t, caption="caption", view=v))
 
-        txt = [self.SPACE.sub(" ", p.text) for p in ss]
-        return txt
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return self.flat_paras(v, seclist)
 
 
-def download_ascb(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_ascb(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "https://www.molbiolcell.org"
 
         def get_response(self, paper: Paper, header: dict[str, str]) -> Response:
             if paper.issn == "1557-7430":
-                return requests.get(
+                return self.session.get(
                     f"https://www.liebertpub.com/doi/full/{paper.doi}",
                     headers=header,
                 )
@@ -127,7 +104,7 @@ def download_ascb(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import Iterator
 from typing import TYPE_CHECKING
 
 import click
 
+from ._docstats import DocStats
 from ._mlabc import Clean
 from ._mlabc import Download
 from ._mlabc import Generate
@@ -13,6 +15,7 @@ from ._mlabc import XRef
 if TYPE_CHECKING:
     from bs4 import BeautifulSoup, Tag
     from ._mlabc import Paper, Response
+    from ._textview import TextView
 
 ISSN = {
     "1040-4651": "Plant Cell",
@@ -24,7 +27,7 @@ ISSN = {
 }
 
 
-def download_aspb(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_aspb(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://www.plantcell.org"
 
@@ -44,23 +47,23 @@ def download_aspb(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
                 return xml
             return None  # OK!
 
-    download = D(issn, sleep=sleep, mx=mx)
+    download = D(issn, sleep=sleep, mx=mx, **kwargs)
     download.run()
 
 
 class ASPB(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article.fulltext-view")
+        a = self.select(root, "div.article.fulltext-view")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        for s in self.article.select("div.section"):
+        for s in self.select(self.article, "div.section"):
             cls = s.attrs.get("class", [])
             if "results" in cls:
                 return [s]
-        for s in self.article.select("div.section"):
+        for s in self.select(self.article, "div.section"):
             n = s.find("h2")
             if n:
                 txt = n.text.lower()
@@ -69,13 +72,13 @@ class ASPB(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        for s in self.article.select("div.section"):
+        for s in self.select(self.article, "div.section"):
             cls = s.attrs.get("class", [])
             if "materials-methods" in cls:
                 return [s]
             if "methods" in cls:
                 return [s]
-        for s in self.article.select("div.section"):
+        for s in self.select(self.article, "div.section"):
             n = s.find("h2")
             if n:
                 txt = n.text.lower()
@@ -84,11 +87,11 @@ class ASPB(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        for s in self.article.select("div.section"):
+        for s in self.select(self.article, "div.section"):
             if "abstract" in s.attrs["class"]:
                 return [s]
 
-        for s in self.article.select("div.section"):
+        for s in self.select(self.article, "div.section"):
             t = s.find("h2")
             if not t or not hasattr(t, "string") or not t.string:
                 continue
@@ -97,20 +100,19 @@ class ASPB(Clean):
                 return [s]
         return []
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("a.xref-bibr"):
-                a.replace_with("CITATION")
-            for a in sec.select("div.fig.pos-float"):
-                a.replace_with(self.newfig(a, caption=".fig-caption p"))
-
-        return super().tostr(seclist)
+            for a in v.select(sec, "a.xref-bibr"):
+                v.replace(a, "CITATION")
+            for a in v.select(sec, "div.fig.pos-float"):
+                v.replace(a, self.newfig(a, caption=".fig-caption p", view=v))
 
     def title(self) -> str | None:
-        s = self.root.select("#page-title")
+        s = self.select(self.root, "#page-title")
         if s:
             return s[0].text.strip()
-        s = self.root.select(
+        s = self.select(
+            self.root,
             "h1.highwire-cite-title",
         )  # philo trans of royal society B.
         if s:
@@ -120,18 +122,18 @@ class ASPB(Clean):
 
     def xrefs(self) -> list[XRef]:
         def xref(s: Tag) -> Iterator[XRef]:
-            for c in s.select("li div[data-doi]"):
+            for c in self.select(s, "li div[data-doi]"):
                 cite = c.find("cite")
                 if not cite or not isinstance(cite, Tag):
                     continue
-                title = cite.select(".cit-article-title")[0].text
+                title = self.select(cite, ".cit-article-title")[0].text
                 yield dict(doi=c.attrs["data-doi"], title=title)
 
-        for s in self.article.select("div.section"):
+        for s in self.select(self.article, "div.section"):
             if "ref-list" in s.attrs["class"]:
                 return list(xref(s))
 
-        for s in self.article.select("div.section"):
+        for s in self.select(self.article, "div.section"):
             t = s.find("h2")
             if not t or not hasattr(t, "string") or not t.string:
                 continue
@@ -142,25 +144,15 @@ class ASPB(Clean):
 
 
 class GenerateASPB(Generate):
-    cc: set[str] = set()
-
     def create_clean(self, soup: BeautifulSoup, pmid: str) -> Clean:
-        aspb = ASPB(soup)
-        a = soup.select("div.article.fulltext-view")[0]
-        for sec in a.select("div.section"):
-            for c in sec.attrs["class"]:
-                self.cc.add(c)
-            n = sec.find("h2")
-            if n:
-                txt = n.text  # .lower()
-                self.cc.add(txt)
-        return aspb
+        return ASPB(soup)
 
 
 def gen_aspb(issn: str) -> None:
-    e = GenerateASPB(issn)
+    stats = DocStats()
+    e = GenerateASPB(issn, docstats=stats)
     e.run()
-    print(e.cc)
+    stats.report()
 
 
 def html_aspb(issn: str) -> None:
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 import click
-import requests
 
 from ._mlabc import Clean
 from ._mlabc import Download
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from bs4 import Tag, BeautifulSoup
     from ._mlabc import Response
     from ._mlabc import Paper
+    from ._textview import TextView
 
 ISSN = {
     "0916-8451": "Biosci. Biotechnol. Biochem.",
@@ -26,17 +27,18 @@ ISSN = {
 class BBB(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("article.article")
+        a = self.select(root, "article.article")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        secs = self.article.select(
+        secs = self.select(
+            self.article,
             ".hlFld-Fulltext .NLM_sec-type_results.NLM_sec_level_1",
         )
         if secs:
             return [secs[0]]
-        secs = self.article.select(".hlFld-Fulltext .NLM_sec_level_1")
+        secs = self.select(self.article, ".hlFld-Fulltext .NLM_sec_level_1")
         for sec in secs:
             h2 = sec.find("h2")
             if h2:
@@ -47,17 +49,19 @@ class BBB(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select(
+        secs = self.select(
+            self.article,
             ".hlFld-Fulltext .NLM_sec-type_materials|methods.NLM_sec_level_1",
         )
         if secs:
             return [secs[0]]
-        secs = self.article.select(
+        secs = self.select(
+            self.article,
             ".hlFld-Fulltext .MaterialsAndMethods.NLM_sec_level_1",
         )
         if secs:
             return [secs[0]]
-        secs = self.article.select(".hlFld-Fulltext .NLM_sec_level_1")
+        secs = self.select(self.article, ".hlFld-Fulltext .NLM_sec_level_1")
         for sec in secs:
             h2 = sec.find("h2")
             if h2:
@@ -74,35 +78,33 @@ class BBB(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select(".hlFld-Abstract .abstractInFull")
+        secs = self.select(self.article, ".hlFld-Abstract .abstractInFull")
         if not secs:
-            secs = self.article.select(".hlFld-Abstract #abstractBox")
+            secs = self.select(self.article, ".hlFld-Abstract #abstractBox")
         return [secs[0]] if secs else []
 
     def title(self) -> str | None:
-        t = self.root.select(".NLM_article-title.hlFld-title")
+        t = self.select(self.root, ".NLM_article-title.hlFld-title")
         if not t:
-            t = self.article.select(".hlFld-title")
+            t = self.select(self.article, ".hlFld-title")
         if t:
             return t[0].text.strip()
         print("no title")
         return super().title()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("p span.ref-lnk"):
-                a.replace_with(" (CITATION)")
+            for a in v.select(sec, "p span.ref-lnk"):
+                v.replace(a, " (CITATION)")
 
-            for a in sec.select("div.figure"):
-                a.replace_with(self.newfig(a, caption=".figureInfo p"))
+            for a in v.select(sec, "div.figure"):
+                v.replace(a, self.newfig(a, caption=".figureInfo p", view=v))
 
-            for a in sec.select("div.tableView"):
-                a.replace_with(self.newtable(a, caption=".tableCaption p"))
+            for a in v.select(sec, "div.tableView"):
+                v.replace(a, self.newtable(a, caption=".tableCaption p", view=v))
 
-            for a in sec.select("div.hidden"):
-                a.decompose()
-
-        return super().tostr(seclist)
+            for a in v.select(sec, "div.hidden"):
+                v.remove(a)
 
 
 class GenerateBBB(Generate):
@@ -116,17 +118,17 @@ def gen_bbb(issn):
     g.run()
 
 
-def download_bbb(issn: str, sleep: float = 5.0, mx: int = 0):
+def download_bbb(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any):
     class D(Download):
         Referer = "https://www.tandfonline.com"
 
         def get_response(self, paper, header):
-            resp = requests.get(f"http://doi.org/{paper.doi}", headers=header)
+            resp = self.session.get(f"http://doi.org/{paper.doi}", headers=header)
             if resp.url.find("/doi/full/") < 0:
                 url = resp.url.replace("/doi/abs/", "/doi/full/")
                 print("redirect", url)
                 header["Referer"] = resp.url
-                resp = requests.get(url, headers=header)
+                resp = self.session.get(url, headers=header)
             return resp
 
         def check_soup(
@@ -142,7 +144,7 @@ def download_bbb(issn: str, sleep: float = 5.0, mx: int = 0):
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 import click
-import requests
 
 from ._mlabc import Clean
 from ._mlabc import Download
@@ -12,6 +12,7 @@ from ._mlabc import Generate
 if TYPE_CHECKING:
     from bs4 import Tag, BeautifulSoup
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 
 ISSN = {"1470-8728": "Biochem. J.", "0264-6021": "Biochem. J."}
@@ -20,58 +21,29 @@ ISSN = {"1470-8728": "Biochem. J.", "0264-6021": "Biochem. J."}
 class BIOJ(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article.fulltext-view")
+        a = self.select(root, "div.article.fulltext-view")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("div.section.results")
-        if secs:
-            return [secs[0]]
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2:
-                txt = h2.text.lower().strip()
-                if txt in {"results", "results and discussion"}:
-                    return [sec]
-
-        return []
+        return self.sections().find(self.RESULTS, classes=("results",))
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("div.section.materials-methods")
-        if secs:
-            return [secs[0]]
-        secs = self.article.select("div.section.methods")
-        if secs:
-            return [secs[0]]
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2:
-                txt = h2.text.lower().strip()
-                if txt in {
-                    "methods",
-                    "experimental procedures",
-                    "materials and methods",
-                    "material and methods",
-                }:  # spelling!
-                    return [sec]
-
-        return []
+        return self.sections().find(
+            self.METHODS, classes=("materials-methods", "methods")
+        )
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("div.section.abstract")
-        return [secs[0]] if secs else []
+        return self.sections().find(classes=("abstract",))
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("p a.xref-bibr"):
-                a.replace_with("CITATION")
-            for a in sec.select("div.fig.pos-float"):
-                a.replace_with(self.newfig(a, caption=".fig-caption p"))
-            for a in sec.select("div.table.pos-float"):
-                a.replace_with(self.newtable(a, caption=".table-caption p"))
-
-        return super().tostr(seclist)
+            for a in v.select(sec, "p a.xref-bibr"):
+                v.replace(a, "CITATION")
+            for a in v.select(sec, "div.fig.pos-float"):
+                v.replace(a, self.newfig(a, caption=".fig-caption p", view=v))
+            for a in v.select(sec, "div.table.pos-float"):
+                v.replace(a, self.newtable(a, caption=".table-caption p", view=v))
 
 
 class GenerateBIOJ(Generate):
@@ -85,14 +57,14 @@ def gen_bioj(issn: str) -> None:
     gad.run()
 
 
-def download_bioj(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_bioj(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://www.biochemj.org"
 
         def get_response(self, paper, header):
-            resp = requests.get(f"http://doi.org/{paper.doi}", headers=header)
+            resp = self.session.get(f"http://doi.org/{paper.doi}", headers=header)
             if not resp.url.endswith(".full"):
-                resp = requests.get(resp.url + ".full", headers=header)
+                resp = self.session.get(resp.url + ".full", headers=header)
             return resp
 
         def check_soup(
@@ -116,7 +88,7 @@ def download_bioj(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
+from bs4 import Tag
+
 from ._mlabc import Clean
 from ._mlabc import Download
 from ._mlabc import Generate
 
 if TYPE_CHECKING:
-    from bs4 import Tag, BeautifulSoup
+    from bs4 import BeautifulSoup
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 
 # BMC Plant Biology
@@ -31,14 +35,16 @@ ISSN = {
 class PMCPB(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select(".FulltextWrapper section.Abstract")
+        a = self.select(root, ".FulltextWrapper section.Abstract")
         assert a, a
-        self.article = a[0].parent
+        parent = a[0].parent
+        assert isinstance(parent, Tag), parent
+        self.article = parent
 
     def results(self) -> list[Tag]:
         if self.article is None:
             return []
-        secs = self.article.select("section.Section1")
+        secs = self.select(self.article, "section.Section1")
         for sec in secs:
             h2 = sec.find("h2")
             if h2:
@@ -51,7 +57,7 @@ class PMCPB(Clean):
     def methods(self) -> list[Tag]:
         if self.article is None:
             return []
-        secs = self.article.select("section.Section1")
+        secs = self.select(self.article, "section.Section1")
         for sec in secs:
             h2 = sec.find("h2")
             if h2:
@@ -70,36 +76,32 @@ class PMCPB(Clean):
     def abstract(self) -> list[Tag]:
         if self.article is None:
             return []
-        secs = self.article.select("section.Abstract")
+        secs = self.select(self.article, "section.Abstract")
         return [secs[0]] if secs else []
 
     def title(self) -> str | None:
-        t = self.root.select(".FulltextWrapper .MainTitleSection h1")
+        t = self.select(self.root, ".FulltextWrapper .MainTitleSection h1")
         return t[0].text.strip()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("p figure,div.Para figure"):
+            for a in v.select(sec, "p figure,div.Para figure"):
 
                 if "FigureTable" in a["class"]:
-                    a.replace_with(self.newtable(a, node="span"))
+                    v.replace(a, self.newtable(a, node="span", view=v))
                 else:
-                    a.replace_with(self.newfig(a, node="span"))
+                    v.replace(a, self.newfig(a, node="span", view=v))
 
-            for a in sec.select("span.CitationRef"):
-                a.replace_with("CITATION")
+            for a in v.select(sec, "span.CitationRef"):
+                v.replace(a, "CITATION")
 
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
         def paraordiv(tag):
             return tag.name == "p" or (
                 tag.name == "div" and tag.has_attr("class") and "Para" in tag["class"]
             )
 
-        txt = [
-            self.SPACE.sub(" ", p.text)
-            for sec in seclist
-            for p in sec.find_all(paraordiv)
-        ]
-        return txt
+        return self.paras(v, seclist, match=paraordiv)
 
 
 class GeneratePMCPB(Generate):
@@ -113,7 +115,7 @@ def gen_bmcpb(issn: str) -> None:
     g.run()
 
 
-def download_bmcpb(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_bmcpb(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "https://bmcplantbiol.biomedcentral.com"
 
@@ -127,7 +129,7 @@ def download_bmcpb(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
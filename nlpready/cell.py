@@ -5,20 +5,31 @@ import os
 import time
 from io import StringIO
 from os.path import join
+from typing import Any
 from typing import TYPE_CHECKING
 
 import click
+import requests
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support import expected_conditions as EC
 
+from ._browser import BrowserSession
+from ._metrics import inc
 from ._mlabc import Clean
 from ._mlabc import DownloadSelenium
 from ._mlabc import dump
 from ._mlabc import Generate
 from ._mlabc import read_suba_papers_csv
 from ._mlabc import readxml
+from ._mlabc import SeleniumResponse
+from ._sciencedirect import body_content
+from ._sciencedirect import body_url
+from ._sciencedirect import find_state
+from ._sciencedirect import redirect_url
+from ._sciencedirect import render_page
+from ._sciencedirect import SDError
 from ._utils import data_dir
 
 
@@ -26,6 +37,7 @@ if TYPE_CHECKING:
     from bs4 import Tag
     from ._mlabc import Paper
     from ._mlabc import Response
+    from ._textview import TextView
 
 ISSN = {
     "1097-4172": "Cell",
@@ -79,15 +91,78 @@ ISSN = {
 
 
 class DownloadCell(DownloadSelenium):
-    def wait(self):
+    """Rebuild pages from their embedded JSON, with the browser as fallback.
 
-        w = super().wait()
-        w.until(
+    Most ScienceDirect pages can be fetched with plain (pooled, concurrent)
+    HTTP and rendered from their article JSON (see _sciencedirect). Only
+    pages where that fails are loaded in Chrome, which is started on first
+    use. ``browser=True`` always uses Chrome.
+    """
+
+    def __init__(
+        self,
+        issn: str,
+        mx: int = 0,
+        sleep: float = 10.0,
+        workers: int = 1,
+        browser: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(issn, mx=mx, sleep=sleep, **kwargs)
+        self.browser = browser
+        if not browser:
+            self.workers = max(1, workers)
+
+    def start(self) -> None:
+        if self.browser:
+            super().start()
+
+    @property
+    def pause(self) -> float:
+        # the JSON requests are paced by the throttle (if any)
+        if self.browser or self.throttle is None:
+            return self.sleep
+        return 0.0
+
+    def wait_for_css(self, css: str) -> None:
+        super().wait_for_css(css)
+        self.wait.until(
             EC.presence_of_element_located(
                 (By.CSS_SELECTOR, "article div.Body section,div.fullText section"),
             ),
         )
-        return w
+
+    def get_json_response(self, paper: Paper, header: dict[str, str]) -> Response:
+        resp = self.session.get(f"https://doi.org/{paper.doi}", headers=header)
+        resp.raise_for_status()
+        url = redirect_url(resp.text)
+        if url is not None:
+            resp = self.session.get(url, headers=header)
+            resp.raise_for_status()
+        state = find_state(resp.text)
+        body = None
+        if body_content(state) is None:
+            r = self.session.get(
+                body_url(state),
+                headers=dict(header, Referer=resp.url, Accept="application/json"),
+            )
+            r.raise_for_status()
+            body = r.json()
+        page = render_page(state, body)
+        return SeleniumResponse(content=page.encode("utf-8"), url=resp.url)
+
+    def get_response(self, paper: Paper, header: dict[str, str]) -> Response:
+        if not self.browser:
+            try:
+                return self.get_json_response(paper, header)
+            except (SDError, KeyError, TypeError, requests.RequestException) as e:
+                inc("fallbacks", kind=type(e).__name__, **self.labels)
+                click.secho(
+                    f"{paper.pmid}: no JSON article ({e}), using browser",
+                    fg="yellow",
+                )
+        # the browser session serializes the workers
+        return super().get_response(paper, header)
 
     def check_soup(
         self,
@@ -117,6 +192,9 @@ def download_cell(
     headless: bool = True,
     close: bool = True,
     driver=None,
+    workers: int = 4,
+    browser: bool = False,
+    **kwargs: Any,
 ) -> None:
     downloader = DownloadCell(
         issn,
@@ -125,6 +203,9 @@ def download_cell(
         headless=headless,
         close=close,
         driver=driver,
+        workers=workers,
+        browser=browser,
+        **kwargs,
     )
 
     downloader.run()
@@ -212,13 +293,13 @@ def old_download_cell(
 class CELL(Clean):
     def __init__(self, root: BeautifulSoup):
         super().__init__(root)
-        a = root.select("article")
+        a = self.select(root, "article")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
 
-        secs = self.article.select("div.Body section")
+        secs = self.select(self.article, "div.Body section")
         for sec in secs:
             if self.find_title(
                 sec,
@@ -231,7 +312,7 @@ class CELL(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("div.Body section")
+        secs = self.select(self.article, "div.Body section")
         for sec in secs:
             if self.find_title(
                 sec,
@@ -248,40 +329,41 @@ class CELL(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select(".Abstracts")
+        secs = self.select(self.article, ".Abstracts")
         return [secs[0]] if secs else []
 
     def title(self) -> str | None:
-        t = self.article.select(".Head .title-text")
+        t = self.select(self.article, ".Head .title-text")
         if t:
             return t[0].text.strip()
         return super().title()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("p a.workspace-trigger"):
+            for a in v.select(sec, "p a.workspace-trigger"):
                 if a.attrs["name"].startswith("bbib"):
-                    a.replace_with("CITATION")
+                    v.replace(a, "CITATION")
+
+            for a in v.select(sec, "figure"):
+                v.replace(a, self.newfig(a, caption=".captions p", view=v))
+            for a in v.select(sec, ".tables"):
+                v.replace(a, self.newtable(a, caption=".captions p", view=v))
 
-            for a in sec.select("figure"):
-                a.replace_with(self.newfig(a, caption=".captions p"))
-            for a in sec.select(".tables"):
-                a.replace_with(self.newtable(a, caption=".captions p"))
-        txt = [self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.select("p")]
-        return txt
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return self.paras(v, seclist)
 
 
 class CELL2(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.fullText")
+        a = self.select(root, "div.fullText")
 
         a0 = a[0]
         assert a0, a0
         self.article = a0
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("section")
+        secs = self.select(self.article, "section")
         for sec in secs:
             h2 = sec.find("h2")
             if h2:
@@ -291,7 +373,7 @@ class CELL2(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("section")
+        secs = self.select(self.article, "section")
         for sec in secs:
             if sec.has_attr("class"):
                 if "materials-methods" in sec["class"]:
@@ -304,36 +386,28 @@ class CELL2(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("section.abstract")
+        secs = self.select(self.article, "section.abstract")
         for sec in secs:
             return [sec]
         return []
 
     def title(self) -> str | None:
-        for t in self.root.select("h1.articleTitle"):
+        for t in self.select(self.root, "h1.articleTitle"):
             txt = t.text.strip()
             if txt:
                 return txt
         return super().title()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("p span.bibRef"):
-                a.replace_with("CITATION")
-            for a in sec.select("div.floatDisplay"):
-                a.replace_with(self.newfig(a, caption=".caption p"))
-
-        return super().tostr(seclist)
+            for a in v.select(sec, "p span.bibRef"):
+                v.replace(a, "CITATION")
+            for a in v.select(sec, "div.floatDisplay"):
+                v.replace(a, self.newfig(a, caption=".caption p", view=v))
 
 
 class GenerateCell(Generate):
-    def create_clean(self, soup: BeautifulSoup, pmid: str) -> Clean:
-        e: Clean
-        try:
-            e = CELL(soup)
-        except Exception:  # pylint: disable=broad-except
-            e = CELL2(soup)
-        return e
+    layouts = [("article", CELL), ("div.fullText", CELL2)]
 
 
 def gen_cell(issn: str) -> None:
@@ -380,31 +454,31 @@ def cmds():
         show_default=True,
         help="only download these journals",
     )
-    def download(sleep, mx, issn, head, noclose):
+    @click.option(
+        "--browser",
+        default=False,
+        is_flag=True,
+        help="always use the browser instead of the page JSON",
+    )
+    def download(sleep, mx, issn, head, noclose, browser):
         """Download XML for CELL Journals."""
-        # pylint: disable=import-outside-toplevel
-        from selenium import webdriver
-
-        options = webdriver.ChromeOptions()
-        if not head:
-            options.add_argument("headless")
-        driver = webdriver.Chrome(chrome_options=options)
+        session = BrowserSession(headless=not head)
         for i in issn.split(","):
             download_cell(
                 issn=i,
                 sleep=sleep,
                 mx=mx,
-                headless=not head,
-                close=False,
-                driver=driver,
+                browser=browser,
+                browser_session=session,
             )
         if noclose:
             # pylint: disable=import-outside-toplevel
             import code
 
+            driver = session.driver  # noqa: F841 pylint: disable=unused-variable
             code.interact(local=locals())
         else:
-            driver.close()
+            session.close()
 
     # @cli.command()
     # @click.option("--issn", default=DEFAULT, show_default=True)
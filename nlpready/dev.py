@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 from ._mlabc import Clean
@@ -10,6 +11,7 @@ if TYPE_CHECKING:
     from bs4 import BeautifulSoup, Tag
     from ._mlabc import Paper
     from ._mlabc import Response
+    from ._textview import TextView
 
 ISSN = {"0950-1991": "Development", "1477-9129": "Development"}
 
@@ -17,12 +19,12 @@ ISSN = {"0950-1991": "Development", "1477-9129": "Development"}
 class Dev(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article.fulltext-view")[0]
+        a = self.select(root, "div.article.fulltext-view")[0]
         assert a, a
         self.article = a
 
     def title(self) -> str | None:
-        t = self.root.select("#page-title")
+        t = self.select(self.root, "#page-title")
         if t:
             return t[0].text.strip()
         return super().title()
@@ -31,7 +33,7 @@ class Dev(Clean):
         # secs = self.article.select('div.section.results-discussion')
         # if secs:
         #     return secs[0]
-        for sec in self.article.select("div.section"):
+        for sec in self.select(self.article, "div.section"):
             h2 = sec.find("h2")
             if h2 and hasattr(h2, "string") and h2.string:
                 txt = h2.string.lower()
@@ -48,7 +50,7 @@ class Dev(Clean):
         #     secs = self.article.select('div.section.materials-methods')
         # if secs:
         #     return secs[0]
-        for sec in self.article.select("div.section"):
+        for sec in self.select(self.article, "div.section"):
             f = sec.find("h2")
             if not f or not f.text:
                 continue
@@ -57,26 +59,28 @@ class Dev(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("div.section.abstract")
+        secs = self.select(self.article, "div.section.abstract")
         return [secs[0]] if secs else []
 
-    def tostr(self, seclist) -> list[str]:
+    def replacements(self, v: TextView, seclist) -> None:
         for sec in seclist:
-            for a in sec.select("p a.xref-ref"):
-                a.replace_with("CITATION")
+            for a in v.select(sec, "p a.xref-ref"):
+                v.replace(a, "CITATION")
 
-            for a in sec.select("div.fig"):
-                a.replace_with(self.newfig(a, caption=".fig-caption p"))
+            for a in v.select(sec, "div.fig"):
+                v.replace(a, self.newfig(a, caption=".fig-caption p", view=v))
 
+    def paragraphs(self, v: TextView, seclist) -> list[str]:
         def p(tag):
-            return tag.name == "p" or (tag.name == "div" and "fig" in tag["class"])
+            return tag.name == "p" or (
+                tag.name == "div" and "fig" in tag.get_attribute_list("class")
+            )
 
         # txt = [self.SPACE.sub(' ', p.text) for p in sec.select('p')]
-        txt = [self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.find_all(p)]
-        return txt
+        return self.paras(v, seclist, match=p)
 
 
-def download_dev(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_dev(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://dev.biologists.org"
 
@@ -90,7 +94,7 @@ def download_dev(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 from ._mlabc import Clean
@@ -9,6 +10,7 @@ from ._mlabc import Generate
 if TYPE_CHECKING:
     from bs4 import BeautifulSoup, Tag
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 
 # http://genesdev.cshlp.org
@@ -22,12 +24,12 @@ ISSN = {
 class Elife(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("main")
+        a = self.select(root, "main")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        for sec in self.article.select("section.article-section"):
+        for sec in self.select(self.article, "section.article-section"):
             h2 = sec.find("h2")
             if h2 and h2.text:
                 txt = h2.text.lower().strip()
@@ -37,7 +39,7 @@ class Elife(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        for sec in self.article.select("section.article-section"):
+        for sec in self.select(self.article, "section.article-section"):
             h2 = sec.find("h2")
             if h2 and h2.text:
                 txt = h2.text.lower().strip()
@@ -52,31 +54,32 @@ class Elife(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("#abstract")
+        secs = self.select(self.article, "#abstract")
         return [secs[0]] if secs else []
 
     def title(self) -> str | None:
-        return self.article.select("h1.content-header__title")[0].text.strip()
+        return self.select(self.article, "h1.content-header__title")[0].text.strip()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.asset-viewer-inline"):
+            for a in v.select(sec, "div.asset-viewer-inline"):
                 idattr = a.attrs.get("id")
                 if not idattr:
                     continue
 
                 if idattr.startswith("fig"):
-                    a.replace_with(self.newfig(a))
+                    v.replace(a, self.newfig(a, view=v))
                 elif idattr.startswith("tbl"):
-                    a.replace_with(self.newtable(a))
+                    v.replace(a, self.newtable(a, view=v))
         for sec in seclist:
-            for a in sec.select("p a"):
+            for a in v.select(sec, "p a"):
                 href = a.attrs.get("href")
                 if not href or not href.startswith("#bib"):
                     continue
-                a.replace_with("CITATION")
-        txt = [self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.select("p")]
-        return txt
+                v.replace(a, "CITATION")
+
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return self.paras(v, seclist)
 
 
 class GenerateElife(Generate):
@@ -90,7 +93,7 @@ def gen_elife(issn: str) -> None:
     elife.run()
 
 
-def download_elife(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_elife(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "https://elifesciences.org"
 
@@ -104,7 +107,7 @@ def download_elife(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
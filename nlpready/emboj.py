@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 from ._mlabc import Clean
@@ -9,6 +10,7 @@ from ._mlabc import Generate
 if TYPE_CHECKING:
     from bs4 import Tag, BeautifulSoup
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 
 ISSN = {
@@ -23,21 +25,21 @@ ISSN = {
 class EMBOJ(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article.fulltext-view")
+        a = self.select(root, "div.article.fulltext-view")
         assert a, a
         self.article = a[0]
 
     def title(self) -> str | None:
-        s = self.root.select("#embo-page-title")
+        s = self.select(self.root, "#embo-page-title")
         if s:
             return s[0].text.strip()
         return super().title()
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("div.section.results-discussion")
+        secs = self.select(self.article, "div.section.results-discussion")
         if secs:
             return [secs[0]]
-        for sec in self.article.select("div.section"):
+        for sec in self.select(self.article, "div.section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -47,12 +49,12 @@ class EMBOJ(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("div.section.methods")
+        secs = self.select(self.article, "div.section.methods")
         if not secs:
-            secs = self.article.select("div.section.materials-methods")
+            secs = self.select(self.article, "div.section.materials-methods")
         if secs:
             return [secs[0]]
-        for sec in self.article.select("div.section"):
+        for sec in self.select(self.article, "div.section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -61,26 +63,26 @@ class EMBOJ(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("div.section.abstract")
+        secs = self.select(self.article, "div.section.abstract")
         # print(secs)
         return [secs[0]] if secs else []
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.fig.pos-float"):
-                a.replace_with(self.newfig(a, caption=".fig-caption p"))
-            for a in sec.select("div.table.pos-float"):
-                a.replace_with(self.newtable(a, caption=".table-caption"))
-            for a in sec.select("p a.xref-ref"):
-                a.replace_with("CITATION")
-            for a in sec.select("p a.xref-fig"):
-                a.replace_with("FIG-REF")
+            for a in v.select(sec, "div.fig.pos-float"):
+                v.replace(a, self.newfig(a, caption=".fig-caption p", view=v))
+            for a in v.select(sec, "div.table.pos-float"):
+                v.replace(a, self.newtable(a, caption=".table-caption", view=v))
+            for a in v.select(sec, "p a.xref-ref"):
+                v.replace(a, "CITATION")
+            for a in v.select(sec, "p a.xref-fig"):
+                v.replace(a, "FIG-REF")
 
-        txt = [self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.select("p")]
-        return txt
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return self.paras(v, seclist)
 
 
-def download_emboj(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_emboj(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://emboj.embopress.org"
 
@@ -94,7 +96,7 @@ def download_emboj(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper, resp.url)
             return None
 
-    e = D(issn, sleep=sleep, mx=mx)
+    e = D(issn, sleep=sleep, mx=mx, **kwargs)
     e.run()
 
 
@@ -2,19 +2,36 @@ from __future__ import annotations
 
 import csv
 import gzip
+import hashlib
 import os
+import re
+import sqlite3
+import tarfile
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from glob import glob
+from os.path import join
+from typing import Any
+from typing import Iterable
+from typing import Iterator
 from typing import TYPE_CHECKING
 
 import click
 from requests import Session
 
 from ._mlabc import Clean
+from ._mlabc import Download
 from ._mlabc import Generate
+from ._mlabc import make_session
 from ._mlabc import read_suba_papers_csv
+from ._store import get_store
 
 
 if TYPE_CHECKING:
     from bs4 import Tag, BeautifulSoup
+    from ._mlabc import Paper, Response
+    from ._textview import TextView
 
 ISSN = {"epmc": "epmc"}
 
@@ -24,11 +41,21 @@ XML = (
 )
 
 
+_SESSION: Session | None = None
+
+
+def epmc_session() -> Session:
+    global _SESSION  # pylint: disable=global-statement
+    if _SESSION is None:
+        _SESSION = make_session()
+    return _SESSION
+
+
 def epmc(pmcid: str, session: Session | None = None) -> bytes | None:
-    """Given a PUBMED id return the Europmc XML as bytes."""
+    """Given a PMC id return the Europmc XML as bytes."""
     url = XML.format(pmcid=pmcid)
     if session is None:
-        session = Session()
+        session = epmc_session()
     resp = session.get(url)
     if resp.status_code == 404:
         return None
@@ -40,7 +67,8 @@ class EPMC(Clean):
 
     def title(self) -> str | None:
 
-        titles = self.root.select(
+        titles = self.select(
+            self.root,
             "article > front > article-meta > title-group > article-title",
         )
         if not titles:
@@ -48,74 +76,207 @@ class EPMC(Clean):
         return " ".join([t.get_text(" ", strip=True) for t in titles])
 
     def abstract(self) -> list[Tag]:
-        abstracts = self.root.select("article > front > article-meta > abstract")
+        abstracts = self.select(self.root, "article > front > article-meta > abstract")
         return list(abstracts)
 
     def methods(self) -> list[Tag]:
-        for sec in self.root.select("article > body > sec > title"):
+        for sec in self.select(self.root, "article > body > sec > title"):
             if sec.string and "method" in sec.string.lower():
                 return [sec]
         return []
 
     def results(self) -> list[Tag]:
-        for sec in self.root.select("article > body > sec > title"):
+        for sec in self.select(self.root, "article > body > sec > title"):
             if sec.string and "result" in sec.string.lower():
                 return [sec]
         return []
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
-        return [sec.get_text(" ", strip=True) for sec in seclist]
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return [v.text(sec, " ", strip=True) for sec in seclist]
 
 
 # PMC ids at ftp://ftp.ncbi.nlm.nih.gov/pub/pmc/ see https://www.ncbi.nlm.nih.gov/pmc/pmctopmid/
 
+PMCIDS = "PMC-ids.csv.gz"
+
+MISSING_PMCIDS = (
+    f"please download {PMCIDS} (~85MB) file with:"
+    f' "wget ftp://ftp.ncbi.nlm.nih.gov/pub/pmc/{PMCIDS}"'
+)
+
+
+def file_hash(fname: str) -> str:
+    h = hashlib.sha256()
+    with open(fname, "rb") as fp:
+        while chunk := fp.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class PMCIndex:
+    """pmid <-> pmcid <-> doi index of PMC-ids.csv.gz stored as SQLite.
+
+    The index is built once and rebuilt automatically whenever the
+    (sha256) hash of the source file changes.
+    """
+
+    BATCH = 900  # keep below SQLITE_MAX_VARIABLE_NUMBER
+
+    def __init__(self, src: str = PMCIDS, index: str | None = None) -> None:
+        if not os.path.exists(src):
+            raise RuntimeError(MISSING_PMCIDS)
+        self.src = src
+        self.index = index or os.path.splitext(src)[0] + ".sqlite"
+        self._conn: sqlite3.Connection | None = None
+
+    def _stat(self) -> str:
+        st = os.stat(self.src)
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    def _meta(self, conn: sqlite3.Connection) -> dict[str, str]:
+        try:
+            return dict(conn.execute("select key, value from meta").fetchall())
+        except sqlite3.DatabaseError:
+            return {}
+
+    def is_current(self) -> bool:
+        if not os.path.exists(self.index):
+            return False
+        with closing(sqlite3.connect(self.index)) as conn:
+            meta = self._meta(conn)
+        if not meta:
+            return False
+        if meta.get("stat") == self._stat():  # cheap check first
+            return True
+        if meta.get("sha256") != file_hash(self.src):
+            return False
+        # same content just touched: remember new stat
+        with closing(sqlite3.connect(self.index)) as conn, conn:
+            conn.execute(
+                "update meta set value=? where key='stat'",
+                (self._stat(),),
+            )
+        return True
+
+    def build(self) -> None:
+        click.secho(f"building index {self.index} from {self.src}", fg="blue")
+        tmp = self.index + ".tmp"
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+        def rows() -> Iterator[tuple[str | None, str | None, str | None]]:
+            with gzip.open(self.src, "rt", encoding="utf-8") as fp:
+                R = csv.reader(fp)
+                next(R)  # skip header
+                for row in R:
+                    doi, pmcid, pmid = row[7:10]
+                    if pmcid or pmid:
+                        yield pmid or None, pmcid or None, doi or None
+
+        with closing(sqlite3.connect(tmp)) as conn, conn:
+            conn.execute("create table meta (key text primary key, value text)")
+            conn.execute("create table ids (pmid text, pmcid text, doi text)")
+            conn.executemany("insert into ids values (?,?,?)", rows())
+            conn.execute("create index ids_pmid on ids (pmid)")
+            conn.execute("create index ids_pmcid on ids (pmcid)")
+            conn.execute("create index ids_doi on ids (doi)")
+            conn.executemany(
+                "insert into meta values (?,?)",
+                [("sha256", file_hash(self.src)), ("stat", self._stat())],
+            )
+        os.replace(tmp, self.index)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if not self.is_current():
+                self.build()
+            self._conn = sqlite3.connect(f"file:{self.index}?mode=ro", uri=True)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _lookup(self, key: str, value: str, ids: Iterable[str]) -> dict[str, str]:
+        ret: dict[str, str] = {}
+        todo = sorted(set(ids))
+        for i in range(0, len(todo), self.BATCH):
+            batch = todo[i : i + self.BATCH]
+            qs = ",".join("?" * len(batch))
+            for k, v in self.conn.execute(
+                f"select {key}, {value} from ids"
+                f" where {key} in ({qs}) and {value} is not null order by rowid",
+                batch,
+            ):
+                ret.setdefault(k, v)  # first one wins
+        return ret
+
+    def pmid2pmcid(self, pmids: Iterable[str]) -> dict[str, str]:
+        return self._lookup("pmid", "pmcid", pmids)
+
+    def pmcid2pmid(self, pmcids: Iterable[str]) -> dict[str, str]:
+        return self._lookup("pmcid", "pmid", pmcids)
+
+    def pmid2doi(self, pmids: Iterable[str]) -> dict[str, str]:
+        return self._lookup("pmid", "doi", pmids)
+
 
 def pmc_subset(fname: str) -> None:
     """Create a PMCID subset from PMC-ids.csv.gz."""
     pmids = {p.pmid for p in read_suba_papers_csv()}
+    index = PMCIndex()
     with open(fname, "w", encoding="utf-8") as out:
         W = csv.writer(out)
         W.writerow(["pmid", "pmcid"])
-        with gzip.open("PMC-ids.csv.gz", "rt") as fp:
-            R = csv.reader(fp)
-            next(R)  # skip header
-            for row in R:
-                pmcid, pmid = row[8:10]
-                if pmcid and pmid in pmids:
-                    W.writerow([pmid, pmcid])
-
-
-def getpmcids(
-    pmids: set[str],
-    fname: str = "PMC-ids-partial.csv",
-) -> dict[str, str]:
+        for pmid, pmcid in sorted(index.pmid2pmcid(pmids).items()):
+            W.writerow([pmid, pmcid])
+    index.close()
+
+
+def getpmcids(pmids: set[str]) -> dict[str, str]:
     """Map pubmed ids to the "open access" fulltext PMC ids."""
-    ret: dict[str, str] = {}
-    pmids = set(pmids)
-    if os.path.exists(fname):
-        with open(fname) as fp:
-            R = csv.reader(fp)
-            next(R)
-            for pmid, pmcid in R:
-                ret[pmid] = pmcid
+    index = PMCIndex()
+    try:
+        return index.pmid2pmcid(pmids)
+    finally:
+        index.close()
 
-        return ret
 
-    if not os.path.exists("PMC-ids.csv.gz"):
-        raise RuntimeError(
-            "please download PMC-ids.csv.gz (~85MB) file with:"
-            ' "wget ftp://ftp.ncbi.nlm.nih.gov/pub/pmc/PMC-ids.csv.gz"',
-        )
-    with gzip.open("PMC-ids.csv.gz", "rt") as fp:
-        R = csv.reader(fp)
-        next(R)  # skip header
-        for row in R:
-            pmcid, pmid = row[8:10]
-            if pmcid and pmid in pmids:
-                assert pmid not in ret, pmid
-                ret[pmid] = pmcid
+class DownloadEPMC(Download):
+    """Download fullTextXML from Europe PMC using the metafile's pmcid column."""
+
+    parser = "lxml-xml"
+    Referer = "https://europepmc.org"
+    ext = ".xml"
+
+    def want(self, paper: Paper) -> bool:
+        return bool(paper.pmcid)
+
+    def get_response(self, paper: Paper, header: dict[str, str]) -> Response:
+        return self.session.get(XML.format(pmcid=paper.pmcid), headers=header)
+
+    def check_soup(
+        self,
+        paper: Paper,
+        soup: BeautifulSoup,
+        resp: Response,
+    ) -> bytes | None:
+        if not soup.select("article > body"):
+            return b"failed! no body"
+        return None
 
-    return ret
+
+def download_epmc(
+    issn: str = "epmc",
+    sleep: float = 0.5,
+    mx: int = 0,
+    workers: int = 4,
+    **kwargs: Any,
+) -> None:
+    o = DownloadEPMC(issn, sleep=sleep, mx=mx, workers=workers, **kwargs)
+    o.run()
 
 
 class GenerateEPMC(Generate):
@@ -125,6 +286,107 @@ class GenerateEPMC(Generate):
         return EPMC(soup)
 
 
+# PMC open access bulk packages from https://ftp.ncbi.nlm.nih.gov/pub/pmc/oa_bulk/
+# e.g. oa_comm_xml.PMC000xxxxxx.baseline.<date>.tar.gz with members
+# PMC000xxxxxx/PMC1234567.xml (older packages use <dir>/<name>.nxml)
+
+PMCID = re.compile(r"PMC\d+")
+
+_WANTED: dict[str, str] = {}
+
+
+def _init_ingest(wanted: dict[str, str]) -> None:
+    global _WANTED  # pylint: disable=global-statement
+    _WANTED = wanted
+
+
+def member_pmcid(name: str) -> str | None:
+    dname, fname = os.path.split(name)
+    stem, ext = os.path.splitext(fname)
+    if ext not in {".nxml", ".xml"}:
+        return None
+    m = PMCID.fullmatch(stem) or PMCID.search(dname)
+    return m.group(0) if m else None
+
+
+def ingest_archive(
+    archive: str,
+    gdir: str,
+    fdir: str,
+    overwrite: bool = False,
+) -> tuple[str, int, int]:
+    """Stream an OA tar.gz package writing the articles we want into gdir.
+
+    gdir and fdir are store names such as "xml_epmc" (see get_store) so the
+    articles are compressed and deduplicated like downloads.
+    """
+    found = written = 0
+    gstore = get_store(gdir)
+    fstore = get_store(fdir)
+    with tarfile.open(archive, "r|gz") as tar:  # stream: no seeking
+        for member in tar:
+            if not member.isfile():
+                continue
+            pmcid = member_pmcid(member.name)
+            if pmcid is None or pmcid not in _WANTED:
+                continue
+            found += 1
+            pmid = _WANTED[pmcid]
+            if not overwrite and gstore.exists(pmid):
+                continue
+            fp = tar.extractfile(member)
+            if fp is None:
+                continue
+            gstore.write(pmid, fp.read(), ".xml", module="epmc")
+            written += 1
+            fstore.remove(pmid, ".xml")  # no longer a failure
+    return archive, found, written
+
+
+def oa_archives(paths: Iterable[str]) -> list[str]:
+    ret = []
+    for path in paths:
+        if os.path.isdir(path):
+            ret.extend(sorted(glob(join(path, "**", "*.tar.gz"), recursive=True)))
+        else:
+            ret.append(path)
+    return ret
+
+
+def ingest(
+    paths: Iterable[str],
+    issn: str = "epmc",
+    overwrite: bool = False,
+    processes: int | None = None,
+) -> None:
+    """Ingest PMC OA bulk packages into xml_epmc."""
+    wanted = {p.pmcid.upper(): p.pmid for p in read_suba_papers_csv() if p.pmcid}
+    archives = oa_archives(paths)
+    click.secho(f"{len(wanted)} pmcids wanted from {len(archives)} archives", fg="blue")
+    if not wanted or not archives:
+        return
+    gdir = f"xml_{issn}"
+    fdir = f"failed_{issn}"
+    total = 0
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_ingest,
+        initargs=(wanted,),
+    ) as executor:
+        futures = [
+            executor.submit(ingest_archive, archive, gdir, fdir, overwrite)
+            for archive in archives
+        ]
+        for future in as_completed(futures):
+            archive, found, written = future.result()
+            total += written
+            click.secho(
+                f"{os.path.basename(archive)}: {found} found, {written} written",
+                fg="green",
+            )
+    click.secho(f"{total} articles written to {gdir}", fg="blue")
+
+
 def gen_epmc(issn: str = "epmc") -> None:
     o = GenerateEPMC(issn)
     o.run()
@@ -145,13 +407,32 @@ def cli():
 @click.option("--fname", help="output filename", default="PMC-ids-partial.csv")
 def subset(fname: str):
     """Generate subset of PMC-ids.csv.gz."""
-    if not os.path.exists("PMC-ids.csv.gz"):
-        raise RuntimeError(
-            "please download PMC-ids.csv.gz (~85MB) file with:"
-            ' "wget ftp://ftp.ncbi.nlm.nih.gov/pub/pmc/PMC-ids.csv.gz"',
-        )
     pmc_subset(fname)
 
 
+@cli.command(name="ingest")
+@click.option("--overwrite", is_flag=True, help="overwrite existing downloads")
+@click.option(
+    "--processes",
+    type=int,
+    help="number of archives to process in parallel [default: #cpus]",
+)
+@click.argument("archives", nargs=-1, type=click.Path(exists=True))
+def ingest_cmd(archives: tuple[str, ...], overwrite: bool, processes: int | None):
+    """Ingest PMC open access bulk .tar.gz packages (or directories of them)."""
+    ingest(archives, overwrite=overwrite, processes=processes)
+
+
+@cli.command()
+@click.option("--force", is_flag=True, help="rebuild even if up to date")
+def index(force: bool):
+    """Build the pmid/pmcid/doi index of PMC-ids.csv.gz."""
+    idx = PMCIndex()
+    if force or not idx.is_current():
+        idx.build()
+    else:
+        click.secho(f"{idx.index} is up to date", fg="green")
+
+
 if __name__ == "__main__":
     cli()
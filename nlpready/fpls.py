@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections import defaultdict
+from typing import Any
 from typing import TYPE_CHECKING
 
 from bs4 import BeautifulSoup
@@ -13,6 +13,7 @@ from ._mlabc import Generate
 if TYPE_CHECKING:
     from ._mlabc import Paper
     from ._mlabc import Response
+    from ._textview import TextView
 
 ISSN = {
     "1664-462X": "Front Plant Sci",
@@ -20,83 +21,46 @@ ISSN = {
 }
 
 
+def ok_elem(tag: Tag) -> bool:
+    return tag.name == "p" or (
+        tag.name == "div" and "FigureDesc" in tag.get_attribute_list("class")
+    )
+
+
 class FPLS(Clean):
+    FLAT_ELEMENTS = staticmethod(ok_elem)
+
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = self.root.select("div.article-section div.JournalFullText")
+        a = self.select(self.root, "div.article-section div.JournalFullText")
         assert a, a
         self.article = a[0]
-        self.search()
-
-    def search(self) -> None:
-
-        objs = defaultdict(list)
-        target = None
-        for d in self.article.contents:
-            if not isinstance(d, Tag):
-                continue
-            if d.name == "h2":
-                target = d.text.lower().strip()
-            elif d.name == "p":
-                if target:
-                    objs[target].append(d)
-            elif d.name == "div" and "FigureDesc" in d["class"]:
-                if target:
-                    p = self.newfig(d, caption="p")
-                    d.replace_with(p)
-                    objs[target].append(p)
-
-        res: dict[str, list[Tag]] = {}
-        sections = {
-            "results",
-            "materials and methods",
-            "results and discussion",
-            "material and methods",
-        }  # spelling!
-        for k in objs:
-            if k in sections:
-                res[k] = objs[k]
-        # assert set(res) == sections, (set(res))
-        self.resultsd: dict[str, list[Tag]] = res
 
     def results(self) -> list[Tag]:
-        return (
-            self.resultsd.get("results")
-            or self.resultsd.get(
-                "results and discussion",
-            )
-            or []
-        )
+        return self.flat_section(("results", "results and discussion"))
 
     def methods(self) -> list[Tag]:
-        return (
-            self.resultsd.get("materials and methods")
-            or self.resultsd.get(
-                "material and methods",
-            )
-            or []
-        )
+        return self.flat_section(("materials and methods", "material and methods"))
 
     def abstract(self) -> list[Tag]:
-        secs = self.root.select("div.article-section div.JournalAbstract p")
+        secs = self.select(self.root, "div.article-section div.JournalAbstract p")
         return list(secs) if secs else []
 
     def title(self) -> str | None:
-        return self.root.select("div.article-section div.JournalAbstract h1")[
+        return self.select(self.root, "div.article-section div.JournalAbstract h1")[
             0
         ].text.strip()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
-        for sec in seclist:
-            for p in sec:
-                if not isinstance(p, Tag):
-                    continue
-                for a in p.select("a"):
-                    href = a.attrs.get("href")
-                    if href and href.startswith("#B"):
-                        a.replace_with("CITATION")
-        txt = [self.SPACE.sub(" ", p.text) for sec in seclist for p in sec]
-        return txt
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
+        for d in v.select_all(seclist, "div.FigureDesc"):
+            v.replace(d, self.newfig(d, caption="p", view=v))
+        for a in v.select_all(seclist, "a"):
+            href = a.attrs.get("href")
+            if isinstance(href, str) and href.startswith("#B"):
+                v.replace(a, "CITATION")
+
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return self.flat_paras(v, seclist)
 
 
 class GenerateFPLS(Generate):
@@ -110,7 +74,7 @@ def gen_fpls(issn: str) -> None:
     g.run()
 
 
-def download_fpls(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_fpls(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "https://www.frontiersin.org"
 
@@ -125,7 +89,7 @@ def download_fpls(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
-import requests
 
 from ._mlabc import Clean
 from ._mlabc import Download
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from bs4 import Tag, BeautifulSoup
     from ._mlabc import Paper
     from ._mlabc import Response
+    from ._textview import TextView
 
 # http://genesdev.cshlp.org
 
@@ -23,55 +24,27 @@ ISSN = {"0890-9369": "Genes Dev."}
 class GAD(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article.fulltext-view")
+        a = self.select(root, "div.article.fulltext-view")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("div.section.results")
-        if secs:
-            return [secs[0]]
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2:
-                txt = h2.text.lower().strip()
-                if txt in {"results", "results and discussion"}:
-                    return [sec]
-
-        return []
+        return self.sections().find(self.RESULTS, classes=("results",))
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("div.section.materials-methods")
-        if secs:
-            return [secs[0]]
-        secs = self.article.select("div.section.methods")
-        if secs:
-            return [secs[0]]
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2:
-                txt = h2.text.lower().strip()
-                if txt in {
-                    "methods",
-                    "experimental procedures",
-                    "materials and methods",
-                    "material and methods",
-                }:  # spelling!
-                    return [sec]
-
-        return []
+        return self.sections().find(
+            self.METHODS, classes=("materials-methods", "methods")
+        )
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("div.section.abstract")
-        return [secs[0]] if secs else []
+        return self.sections().find(classes=("abstract",))
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.fig.pos-float"):
-                a.replace_with(self.newfig(a, caption=".fig-caption p"))
-            for a in sec.select("p a.xref-bibr"):
-                a.replace_with("CITATION")
-        return super().tostr(seclist)
+            for a in v.select(sec, "div.fig.pos-float"):
+                v.replace(a, self.newfig(a, caption=".fig-caption p", view=v))
+            for a in v.select(sec, "p a.xref-bibr"):
+                v.replace(a, "CITATION")
 
 
 class GenerateGAD(Generate):
@@ -85,14 +58,14 @@ def gen_gad(issn: str) -> None:
     gad.run()
 
 
-def download_gad(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_gad(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://genesdev.cshlp.org"
 
         def get_response(self, paper, header):
-            resp = requests.get(f"http://doi.org/{paper.doi}", headers=header)
+            resp = self.session.get(f"http://doi.org/{paper.doi}", headers=header)
             if not resp.url.endswith(".full"):
-                resp = requests.get(resp.url + ".full", headers=header)
+                resp = self.session.get(resp.url + ".full", headers=header)
             return resp
 
         def check_soup(
@@ -110,7 +83,7 @@ def download_gad(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
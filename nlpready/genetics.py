@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 from ._mlabc import Clean
@@ -11,6 +12,7 @@ if TYPE_CHECKING:
     from bs4 import Tag, BeautifulSoup
     from ._mlabc import Paper
     from ._mlabc import Response
+    from ._textview import TextView
 
 ISSN = {
     "0016-6731": "Genetics",
@@ -24,56 +26,36 @@ class Genetics(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
         # a = root.select("div.article.fulltext-view")
-        a = root.select(ARTICLE)
+        a = self.select(root, ARTICLE)
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("div.section.results")
-        if secs:
-            return [secs[0]]
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2 and h2.text:
-                txt = h2.text.lower().strip()
-                if txt in {"results", "results and discussion"}:
-                    return [sec]
-        return []
+        return self.sections().find(self.RESULTS, classes=("results",))
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("div.section.methods")
-        if secs:
-            return [secs[0]]
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2:
-                txt = h2.text.lower().strip()
-                if txt in {
-                    "methods",
-                    "experimental procedures",
-                    "materials and methods",
-                }:
-                    return [sec]
-
-        return []
+        return self.sections().find(self.METHODS, classes=("methods",))
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("section.abstract")
+        secs = self.select(self.article, "section.abstract")
         return [secs[0]] if secs else []
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.table.pos-float"):
-                a.replace_with(self.newtable(a, caption=".table-caption p"))
-            for a in sec.select("div.fig.pos-float"):
-                # print(a, file=sys.stderr)
-                a.replace_with(self.newfig(a))
-            for a in sec.select("p a.xref-bibr"):
-                a.replace_with("CITATION")
-        return super().tostr(seclist)
-
-
-def download_genetics(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+            for a in v.select(sec, "div.table.pos-float"):
+                v.replace(a, self.newtable(a, caption=".table-caption p", view=v))
+            for a in v.select(sec, "div.fig.pos-float"):
+                v.replace(a, self.newfig(a, view=v))
+            for a in v.select(sec, "p a.xref-bibr"):
+                v.replace(a, "CITATION")
+
+
+def download_genetics(
+    issn: str,
+    sleep: float = 5.0,
+    mx: int = 0,
+    **kwargs: Any,
+) -> None:
     class D(DownloadSelenium):
         Referer = "http://www.genetics.org"
 
@@ -92,7 +74,7 @@ def download_genetics(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
                 assert a, (a, resp.url, paper.doi)
             return None
 
-    download = D(issn, sleep=sleep, mx=mx)
+    download = D(issn, sleep=sleep, mx=mx, **kwargs)
     download.run()
 
 
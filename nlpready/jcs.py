@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 from ._mlabc import Clean
@@ -9,6 +10,7 @@ from ._mlabc import Generate
 if TYPE_CHECKING:
     from bs4 import Tag, BeautifulSoup
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 
 ISSN = {
@@ -23,57 +25,29 @@ ISSN = {
 class JCS(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article.fulltext-view")
+        a = self.select(root, "div.article.fulltext-view")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("div.section.results")
-        if secs:
-            return [secs[0]]
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2:
-                txt = h2.text.lower().strip()
-                if txt in {"results", "results and discussion"}:
-                    return [sec]
-
-        return []
+        return self.sections().find(self.RESULTS, classes=("results",))
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("div.section.materials-methods")
-        if secs:
-            return [secs[0]]
-        secs = self.article.select("div.section.methods")
-        if secs:
-            return [secs[0]]
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2:
-                txt = h2.text.lower().strip()
-                if txt in {
-                    "methods",
-                    "experimental procedures",
-                    "materials and methods",
-                    "material and methods",
-                }:  # spelling!
-                    return [sec]
-
-        return []
+        return self.sections().find(
+            self.METHODS, classes=("materials-methods", "methods")
+        )
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("div.section.abstract")
-        return [secs[0]] if secs else []
+        return self.sections().find(classes=("abstract",))
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.table.pos-float"):
-                a.replace_with(self.newtable(a, caption=".table-caption p"))
-            for a in sec.select("div.fig.pos-float"):
-                a.replace_with(self.newfig(a, caption=".fig-caption p"))
-            for a in sec.select("p a.xref-bibr"):
-                a.replace_with("CITATION")
-        return super().tostr(seclist)
+            for a in v.select(sec, "div.table.pos-float"):
+                v.replace(a, self.newtable(a, caption=".table-caption p", view=v))
+            for a in v.select(sec, "div.fig.pos-float"):
+                v.replace(a, self.newfig(a, caption=".fig-caption p", view=v))
+            for a in v.select(sec, "p a.xref-bibr"):
+                v.replace(a, "CITATION")
 
 
 class GenerateJCS(Generate):
@@ -87,7 +61,7 @@ def gen_jcs(issn: str) -> None:
     jcs.run()
 
 
-def download_jcs(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_jcs(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://jcs.biologists.org"
 
@@ -101,7 +75,7 @@ def download_jcs(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
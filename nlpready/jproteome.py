@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
-import requests
 
 from ._mlabc import Clean
 from ._mlabc import Download
@@ -11,6 +11,7 @@ from ._mlabc import Generate
 if TYPE_CHECKING:
     from bs4 import Tag, BeautifulSoup
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 ISSN = {
     "1535-3907": "J. Proteome Res.",
@@ -23,12 +24,14 @@ ISSN = {
 class JProteome(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("article.article")
+        a = self.select(root, "article.article")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("#articleBody .hlFld-Fulltext .NLM_sec_level_1")
+        secs = self.select(
+            self.article, "#articleBody .hlFld-Fulltext .NLM_sec_level_1"
+        )
         for sec in secs:
             h2 = sec.find("h2")
             if h2:
@@ -45,7 +48,9 @@ class JProteome(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("#articleBody .hlFld-Fulltext .NLM_sec_level_1")
+        secs = self.select(
+            self.article, "#articleBody .hlFld-Fulltext .NLM_sec_level_1"
+        )
         for sec in secs:
             h2 = sec.find("h2")
             if h2:
@@ -63,21 +68,22 @@ class JProteome(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("#articleBody .hlFld-Abstract #abstractBox")
+        secs = self.select(self.article, "#articleBody .hlFld-Abstract #abstractBox")
         return [secs[0]] if secs else []
 
     def title(self) -> str | None:
-        return self.article.select("h1.articleTitle")[0].text.strip()
+        return self.select(self.article, "h1.articleTitle")[0].text.strip()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.figure"):
-                a.replace_with(self.newfig(a, caption=".caption p"))
-            for a in sec.select("div.NLM_table-wrap"):
-                a.replace_with(self.newtable(a, caption=".NLM_caption"))
-            for a in sec.select("div.NLM_p a.ref"):
-                a.replace_with(" CITATION ")
-
+            for a in v.select(sec, "div.figure"):
+                v.replace(a, self.newfig(a, caption=".caption p", view=v))
+            for a in v.select(sec, "div.NLM_table-wrap"):
+                v.replace(a, self.newtable(a, caption=".NLM_caption", view=v))
+            for a in v.select(sec, "div.NLM_p a.ref"):
+                v.replace(a, " CITATION ")
+
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
         def paraordiv(tag):
 
             ret = tag.name == "p" or (
@@ -86,12 +92,7 @@ class JProteome(Clean):
 
             return ret
 
-        txt = [
-            self.SPACE.sub(" ", p.text)
-            for sec in seclist
-            for p in sec.find_all(paraordiv)
-        ]
-        return txt
+        return self.paras(v, seclist, match=paraordiv)
 
 
 class GenerateJProteome(Generate):
@@ -105,18 +106,23 @@ def gen_jproteome(issn: str) -> None:
     g.run()
 
 
-def download_jproteome(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_jproteome(
+    issn: str,
+    sleep: float = 5.0,
+    mx: int = 0,
+    **kwargs: Any,
+) -> None:
     class D(Download):
         Referer = "https://pubs.acs.org"
 
         def get_response(self, paper, header):
-            resp = requests.get(f"http://doi.org/{paper.doi}", headers=header)
+            resp = self.session.get(f"http://doi.org/{paper.doi}", headers=header)
             # pylint: disable=chained-comparison
             if resp.url.find("/doi/abs/") > 0 and resp.url.find("/doi/full/") < 0:
                 url = resp.url.replace("/doi/abs/", "/doi/full/")
                 print("redirect", url)
                 header["Referer"] = resp.url
-                resp = requests.get(url, headers=header)
+                resp = self.session.get(url, headers=header)
             return resp
 
         def check_soup(
@@ -129,7 +135,7 @@ def download_jproteome(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
-import requests
 
 from ._mlabc import Clean
 from ._mlabc import Download
@@ -11,6 +11,7 @@ from ._mlabc import Generate
 if TYPE_CHECKING:
     from bs4 import Tag, BeautifulSoup
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 
 ISSN = {
@@ -30,49 +31,30 @@ ISSN = {
 class MCP(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article.fulltext-view")
+        a = self.select(root, "div.article.fulltext-view")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2:
-                txt = h2.text.lower().strip()
-                if txt in {"results", "results and discussion"}:
-                    return [sec]
-
-        return []
+        return self.sections().find(self.RESULTS)
 
     def methods(self) -> list[Tag]:
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2:
-                txt = h2.text.lower().strip()
-                if txt in {
-                    "methods",
-                    "experimental procedures",
-                    "materials and methods",
-                    "material and methods",
-                }:  # spelling!
-                    return [sec]
-
-        return []
+        return self.sections().find(self.METHODS)
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("div.section.abstract")
-        return [secs[0]] if secs else []
+        return self.sections().find(classes=("abstract",))
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.table.pos-float"):
-                a.replace_with(self.newtable(a, caption=".table-caption"))
-            for a in sec.select("div.fig.pos-float"):
-                a.replace_with(self.newfig(a, caption=".fig-caption p"))
-            for a in sec.select("p a.xref-bibr"):
-                a.replace_with("CITATION")
-        txt = [self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.select("p")]
-        return txt
+            for a in v.select(sec, "div.table.pos-float"):
+                v.replace(a, self.newtable(a, caption=".table-caption", view=v))
+            for a in v.select(sec, "div.fig.pos-float"):
+                v.replace(a, self.newfig(a, caption=".fig-caption p", view=v))
+            for a in v.select(sec, "p a.xref-bibr"):
+                v.replace(a, "CITATION")
+
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return self.paras(v, seclist)
 
 
 class GenerateMCP(Generate):
@@ -86,14 +68,14 @@ def gen_mcp(issn: str) -> None:
     mcp.run()
 
 
-def download_mcp(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_mcp(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://www.mcponline.org"
 
         def get_response(self, paper, header):
-            resp = requests.get(f"http://doi.org/{paper.doi}", headers=header)
+            resp = self.session.get(f"http://doi.org/{paper.doi}", headers=header)
             if not resp.url.endswith(".full"):
-                resp = requests.get(resp.url + ".full", headers=header)
+                resp = self.session.get(resp.url + ".full", headers=header)
             return resp
 
         def check_soup(
@@ -111,7 +93,7 @@ def download_mcp(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
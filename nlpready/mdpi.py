@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
-import requests
 from bs4 import Tag
 
 from ._mlabc import Clean
@@ -16,6 +16,7 @@ if TYPE_CHECKING:
     from ._mlabc import Response
     from bs4 import BeautifulSoup
     from ._mlabc import Paper
+    from ._textview import TextView
 
 ISSN = {
     "1422-0067": "Int J Mol Sci",
@@ -24,15 +25,34 @@ ISSN = {
 
 
 class MDPI(Clean):
+    FIGREF = "div.html-p a.html-fig"
+    _figure_owners: dict[str, int] | None = None
+
     def __init__(self, root: BeautifulSoup):
         super().__init__(root)
-        a = root.select("article")
+        a = self.select(root, "article")
         assert a, a
         self.article = a[0]
-        self.figures: dict[str, Tag] = {}
+
+    @property
+    def figure_owners(self) -> dict[str, int]:
+        """figure href -> id() of the section whose text gets the figure.
+
+        A figure goes with the first of abstract, results and methods (the
+        order of the cleaned file) that refers to it. Built once and never
+        changed so tostr gives the same output however often it is called.
+        """
+        if self._figure_owners is None:
+            owners: dict[str, int] = {}
+            for seclist in (self.abstract(), self.results(), self.methods()):
+                for sec in seclist:
+                    for a in self.select(sec, self.FIGREF):
+                        owners.setdefault(str(a["href"]), id(sec))
+            self._figure_owners = owners
+        return self._figure_owners
 
     def results(self) -> list[Tag]:
-        for sec in self.article.select(".html-body section"):
+        for sec in self.select(self.article, ".html-body section"):
             if sec.attrs.get("type") == "results":
                 return [sec]
             h2 = sec.find("h2")
@@ -45,7 +65,7 @@ class MDPI(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        for sec in self.article.select(".html-body section"):
+        for sec in self.select(self.article, ".html-body section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -62,27 +82,34 @@ class MDPI(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.root.select("article div.html-front #html-abstract")
+        secs = self.select(self.root, "article div.html-front #html-abstract")
         return [secs[0]] if secs else []
 
     def title(self) -> str | None:
-        secs = self.root.select("article div.html-front #html-article-title")
+        secs = self.select(self.root, "article div.html-front #html-article-title")
         return secs[0].text.strip()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
-        figs = []
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.html-p a.html-bibr"):
-                a.replace_with(" CITATION ")
+            for a in v.select(sec, "div.html-p a.html-bibr"):
+                v.replace(a, " CITATION ")
 
-            for a in sec.select("div.html-p a.html-fig"):
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        owners = self.figure_owners
+        ours = {id(sec) for sec in seclist}
+        figs: dict[str, Tag] = {}
+        for sec in seclist:
+            for a in v.select(sec, self.FIGREF):
                 href = str(a["href"])
-                if href not in self.figures:
-                    n = self.root.select(href)[0]
-                    self.figures[href] = n.select(".html-fig_description")[0]
-                    figs.append(href)
+                # once per document: only in the section that owns it
+                if href not in figs and owners.get(href, id(sec)) in ours:
+                    n = self.anchor(href)
+                    assert n is not None, href
+                    desc = self.select_one(n, ".html-fig_description")
+                    assert desc is not None, href
+                    figs[href] = desc
 
-                a.replace_with(" FIG-REF ")
+                v.replace(a, " FIG-REF ")
 
         # for a in sec.select('.html-fig-wrap'):
         #     # figures are placed by some javascript I think... so this doesn't work
@@ -90,32 +117,24 @@ class MDPI(Clean):
         #     p.string = '[[FIGURE]]'
         #     a.replace_with(p)
 
-        figs = [
-            self.FIGURE % self.SPACE.sub(" ", self.figures[href].text) for href in figs
-        ]
+        figtxt = [self.FIGURE % self.SPACE.sub(" ", v.text(n)) for n in figs.values()]
 
-        txt = [
-            self.SPACE.sub(" ", p.text)
-            for sec in seclist
-            for p in sec.select("div.html-p")
-        ]
+        txt = self.paras(v, seclist, match="div.html-p")
         if not txt:
-            txt = [
-                self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.select("p")
-            ]
+            txt = self.paras(v, seclist)
         if not txt:
             txt = [
                 " ".join(
                     [
-                        self.SPACE.sub(" ", p.string)
+                        self.SPACE.sub(" ", v.string(p))
                         for sec in seclist
-                        for p in sec.contents
+                        for p in v.children(sec)
                         if isinstance(p, Tag)
                     ],
                 ),
             ]
 
-        return txt + figs
+        return txt + figtxt
 
 
 class GenerateMDPI(Generate):
@@ -129,14 +148,14 @@ def gen_mdpi(issn: str) -> None:
     mdpi.run()
 
 
-def download_mdpi(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_mdpi(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://www.mdpi.com"
 
         def get_response(self, paper, header):
-            resp = requests.get(f"http://doi.org/{paper.doi}", headers=header)
+            resp = self.session.get(f"http://doi.org/{paper.doi}", headers=header)
             if not resp.url.endswith("/htm"):
-                resp = requests.get(resp.url + "/htm", headers=header)
+                resp = self.session.get(resp.url + "/htm", headers=header)
             return resp
 
     def check_soup(
@@ -154,7 +173,7 @@ def download_mdpi(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
         assert a and len(a) == 1, (paper.pmid, resp.url)
         return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 from ._mlabc import Clean
@@ -10,6 +11,7 @@ if TYPE_CHECKING:
 
     from bs4 import BeautifulSoup, Tag
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 
 ISSN = {
@@ -20,19 +22,20 @@ ISSN = {
 class MPMI(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("table .pubContent")
+        a = self.select(root, "table .pubContent")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        secs = self.article.select(
+        secs = self.select(
+            self.article,
             ".hlFld-Fulltext .NLM_sec-type_results.NLM_sec_level_1",
         )
         if secs:
             return [secs[0]]
-        secs = self.article.select(".hlFld-Fulltext .NLM_sec_level_1")
+        secs = self.select(self.article, ".hlFld-Fulltext .NLM_sec_level_1")
         for sec in secs:
-            h2 = sec.select("table tr th")
+            h2 = self.select(sec, "table tr th")
             if h2:
                 txt = h2[0].text.lower().strip()
                 if txt in {"results", "results and discussion"}:
@@ -41,19 +44,21 @@ class MPMI(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select(
+        secs = self.select(
+            self.article,
             ".hlFld-Fulltext .NLM_sec-type_materials|methods.NLM_sec_level_1",
         )
         if secs:
             return [secs[0]]
-        secs = self.article.select(
+        secs = self.select(
+            self.article,
             ".hlFld-Fulltext .MaterialsAndMethods.NLM_sec_level_1",
         )
         if secs:
             return [secs[0]]
-        secs = self.article.select(".hlFld-Fulltext .NLM_sec_level_1")
+        secs = self.select(self.article, ".hlFld-Fulltext .NLM_sec_level_1")
         for sec in secs:
-            h2 = sec.select("table tr th")
+            h2 = self.select(sec, "table tr th")
             if h2:
                 txt = h2[0].text.lower().strip()
                 if txt in {
@@ -68,25 +73,23 @@ class MPMI(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select(".hlFld-Abstract .abstractInFull")
+        secs = self.select(self.article, ".hlFld-Abstract .abstractInFull")
         return [secs[0]] if secs else []
 
     def title(self) -> str | None:
-        return self.article.select(".hlFld-Abstract .hlFld-Title")[0].text.strip()
+        return self.select(self.article, ".hlFld-Abstract .hlFld-Title")[0].text.strip()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.figure"):
+            for a in v.select(sec, "div.figure"):
                 p = self.root.new_tag("p")  # , **{'class': 'NLM_p'})
 
                 p.string = "[[FIGURE]]"
-                a.replace_with(p)
-            for a in sec.select("p span.ref-lnk"):
-                a.replace_with("CITATION")
-            for a in sec.select("p a.ref.bibr"):
-                a.replace_with("CITATION")
-
-        return super().tostr(seclist)
+                v.replace(a, p)
+            for a in v.select(sec, "p span.ref-lnk"):
+                v.replace(a, "CITATION")
+            for a in v.select(sec, "p a.ref.bibr"):
+                v.replace(a, "CITATION")
 
 
 class GenerateMPMI(Generate):
@@ -100,7 +103,7 @@ def gen_mpmi(issn: str) -> None:
     g.run()
 
 
-def download_mpmi(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_mpmi(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "https://apsjournals.apsnet.org"
 
@@ -114,7 +117,7 @@ def download_mpmi(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 from ._mlabc import Clean
@@ -28,7 +29,8 @@ ISSN = {
 class Nature(Clean):
 
     def results(self) -> list[Tag]:
-        for sec in self.root.select(
+        for sec in self.select(
+            self.root,
             "article div.c-article-body > div > section[data-title]",
         ):
             if (
@@ -39,7 +41,8 @@ class Nature(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        for sec in self.root.select(
+        for sec in self.select(
+            self.root,
             "article div.c-article-body > div > section[data-title]",
         ):
             if (
@@ -50,10 +53,10 @@ class Nature(Clean):
         return []
 
     def abstract(self):
-        return list(self.root.select('article section[data-title="Abstract"] p'))
+        return list(self.select(self.root, 'article section[data-title="Abstract"] p'))
 
     def title(self) -> str | None:
-        title = self.root.select("article [data-article-title]")
+        title = self.select(self.root, "article [data-article-title]")
         if not title:
             return None
         return title[0].get_text(" ", strip=True)
@@ -70,7 +73,7 @@ def gen_nature(issn: str) -> None:
     nature.run()
 
 
-def download_nature(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_nature(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "https://www.nature.com"
 
@@ -85,7 +88,7 @@ def download_nature(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
                 return b"can't find abstract!"
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections import defaultdict
+from typing import Any
 from typing import TYPE_CHECKING
 
 import click
@@ -15,6 +15,7 @@ if TYPE_CHECKING:
 
     from bs4 import BeautifulSoup
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 ISSN = {
     "1460-2431": "J. Exp. Bot.",
@@ -50,92 +51,53 @@ def ok_elem(tag: Tag) -> bool:
 
 
 class OUP(Clean):
+    FLAT_ELEMENTS = staticmethod(ok_elem)
+
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article-body div.widget-items")
+        a = self.select(root, "div.article-body div.widget-items")
         assert a, a
         self.article = a[0]
 
-        objs = defaultdict(list)
-        target = None
-        for d in self.article.contents:
-            if not isinstance(d, Tag):
-                continue
-            if d.name == "h2":
-                target = d.text.lower().strip()
-            elif d.name == "section" and d.attrs["class"] == ["abstract"]:
-                target = "abstract"
-                for p in d.select("p"):
-                    objs[target].append(p)
-            elif ok_elem(d):
-                if target:
-                    objs[target].append(d)
-        res: dict[str, list[Tag]] = {}
-        # sections = {'abstract', 'results', 'materials and methods', 'results and discussion',
-        #             'material and methods'}  # spelling!
-        for k in objs:
-            # if k in sections:
-            res[k] = objs[k]
-        # assert set(res) == sections, (set(res))
-        self.resultsd = res
+    def flat_heading(self, tag: Tag) -> str | None:
+        if tag.name == "section" and tag.attrs.get("class") == ["abstract"]:
+            return "abstract"
+        return super().flat_heading(tag)
 
     def results(self) -> list[Tag]:
-        K = ("results and discussion", "results")
-        for k in K:
-            if k in self.resultsd:
-                return self.resultsd[k]
-        for k in self.resultsd:
-            if k.endswith(K):
-                return self.resultsd[k]
-        return []
+        return self.flat_section(("results and discussion", "results"), suffix=True)
 
     def methods(self) -> list[Tag]:
-        K = ("materials and methods", "material and methods")
-        for k in K:
-            if k in self.resultsd:
-                return self.resultsd[k]
-        for k in self.resultsd:
-            if k.endswith(K):
-                return self.resultsd[k]
-        return []
+        return self.flat_section(
+            ("materials and methods", "material and methods"),
+            suffix=True,
+        )
 
     def abstract(self) -> list[Tag]:
-        s = self.article.select("section.abstract")
+        s = self.select(self.article, "section.abstract")
         if s:
-            return [s[0].select("p")[0]] or [s[0]]
-        return self.resultsd.get("abstract") or []
+            return [self.select(s[0], "p")[0]] or [s[0]]
+        return self.flat_sections().get("abstract") or []
 
     def title(self) -> str | None:
-        s = self.root.select("h1.wi-article-title")
+        s = self.select(self.root, "h1.wi-article-title")
         if s:
             return s[0].text.strip()
         return super().title()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
-        for sec in seclist:
-            for p in sec:
-                if not isinstance(p, Tag):
-                    continue
-                for a in p.select("a.xref-bibr"):
-                    a.replace_with("CITATION")
-        ss = []
-        for sec in seclist:
-            for p in sec:
-                if not isinstance(p, Tag):
-                    continue
-                if p.name == "div":
-                    if has_class(p, "fig-section"):
-                        ss.append(self.newfig(p, caption=".fig-caption p", node="div"))
-                    elif has_class(p, "table-wrap"):
-                        ss.append(self.newtable(p, caption=".caption p", node="div"))
-                else:
-                    ss.append(p)
-
-        txt = [self.SPACE.sub(" ", p.text) for p in ss]
-        return txt
-
-
-def download_oup(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
+        for a in v.select_all(seclist, "a.xref-bibr"):
+            v.replace(a, "CITATION")
+        for d in v.select_all(seclist, "div.fig-section"):
+            v.replace(d, self.newfig(d, caption=".fig-caption p", node="div", view=v))
+        for d in v.select_all(seclist, "div.table-wrap"):
+            v.replace(d, self.newtable(d, caption=".caption p", node="div", view=v))
+
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return self.flat_paras(v, seclist)
+
+
+def download_oup(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "https://academic.oup.com"
 
@@ -163,7 +125,7 @@ def download_oup(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
                 )
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 from ._mlabc import Clean
@@ -10,6 +11,7 @@ from ._mlabc import Generate
 if TYPE_CHECKING:
     from bs4 import Tag, BeautifulSoup
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 ISSN = {
     "1932-6203": "PLoS ONE",
@@ -22,12 +24,12 @@ ISSN = {
 class PLOS(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article-text")
+        a = self.select(root, "div.article-text")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("div.section.toc-section")
+        secs = self.select(self.article, "div.section.toc-section")
         for sec in secs:
             if self.find_title(
                 sec,
@@ -38,7 +40,7 @@ class PLOS(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("div.section.toc-section")
+        secs = self.select(self.article, "div.section.toc-section")
         for sec in secs:
             if self.find_title(
                 sec,
@@ -54,24 +56,22 @@ class PLOS(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("div.toc-section.abstract")
+        secs = self.select(self.article, "div.toc-section.abstract")
         return [secs[0]] if secs else []
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.figure"):
-                a.replace_with(self.newfig(a, caption=".figcaption"))
-            for a in sec.select("span.equation"):  # e.g. math equations
-                a.replace_with("[[EQUATION]]")
-            for a in sec.select("span.inline-formula"):  # e.g. math equations
-                a.replace_with("[[EQUATION]]")
-            for a in sec.select("p a.ref-tip"):
-                a.replace_with("CITATION")
+            for a in v.select(sec, "div.figure"):
+                v.replace(a, self.newfig(a, caption=".figcaption", view=v))
+            for a in v.select(sec, "span.equation"):  # e.g. math equations
+                v.replace(a, "[[EQUATION]]")
+            for a in v.select(sec, "span.inline-formula"):  # e.g. math equations
+                v.replace(a, "[[EQUATION]]")
+            for a in v.select(sec, "p a.ref-tip"):
+                v.replace(a, "CITATION")
 
-        return super().tostr(seclist)
 
-
-def download_plos(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_plos(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://www.plosone.org"
 
@@ -85,7 +85,7 @@ def download_plos(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 
     from bs4 import BeautifulSoup
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 
 ISSN = {
@@ -23,18 +24,18 @@ ISSN = {
 class PNAS(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article.fulltext-view")[0]
+        a = self.select(root, "div.article.fulltext-view")[0]
         assert a
         self.article = a
 
     def title(self) -> str | None:
-        return self.root.select("#page-title")[0].text.strip()
+        return self.select(self.root, "#page-title")[0].text.strip()
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("div.section.results-discussion")
+        secs = self.select(self.article, "div.section.results-discussion")
         if secs:
             return [secs[0]]
-        for sec in self.article.select("div.section"):
+        for sec in self.select(self.article, "div.section"):
             h2 = sec.find("h2")
             if not isinstance(h2, Tag):
                 continue
@@ -46,12 +47,12 @@ class PNAS(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("div.section.methods")
+        secs = self.select(self.article, "div.section.methods")
         if not secs:
-            secs = self.article.select("div.section.materials-methods")
+            secs = self.select(self.article, "div.section.materials-methods")
         if secs:
             return [secs[0]]
-        for sec in self.article.select("div.section"):
+        for sec in self.select(self.article, "div.section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower()
@@ -60,35 +61,36 @@ class PNAS(Clean):
         return []
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("div.section.abstract")
+        secs = self.select(self.article, "div.section.abstract")
         return [secs[0]] if secs else []
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("div.fig"):
-                a.replace_with(self.newfig(a, caption=".fig-caption p"))
-            for a in sec.select("div.table"):
-                a.replace_with(
+            for a in v.select(sec, "div.fig"):
+                v.replace(a, self.newfig(a, caption=".fig-caption p", view=v))
+            for a in v.select(sec, "div.table"):
+                v.replace(
+                    a,
                     self.newtable(
                         a,
                         caption=".table-caption p",
+                        view=v,
                     ),
                 )
                 # a.replace_with('[[FIGURE]]')
-            for a in sec.select("p a.xref-bibr"):
-                a.replace_with("CITATION")
-            for a in sec.select("p a.xref-fig"):
-                a.replace_with("FIG-REF")
+            for a in v.select(sec, "p a.xref-bibr"):
+                v.replace(a, "CITATION")
+            for a in v.select(sec, "p a.xref-fig"):
+                v.replace(a, "FIG-REF")
 
         # def p(tag):
         #     return tag.name == "p" or (tag.name == "div" and ["fig"] == tag["class"])
 
-        txt = [self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.select("p")]
-        # txt = [self.SPACE.sub(' ', p.text) for p in sec.find_all(p)]
-        return txt
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return self.paras(v, seclist)
 
 
-def download_pnas(issn, sleep=5.0, mx=0):
+def download_pnas(issn, sleep=5.0, mx=0, **kwargs):
     class D(Download):
         Referer = "http://www.pnas.org"
 
@@ -102,7 +104,7 @@ def download_pnas(issn, sleep=5.0, mx=0):
             assert a and len(a) == 1, (paper.pmid, resp.url)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
-import requests
 
 from ._mlabc import Clean
 from ._mlabc import Download
@@ -14,81 +14,64 @@ if TYPE_CHECKING:
     from typing import Iterator
     from bs4 import BeautifulSoup, Tag
     from ._mlabc import Response
+    from ._textview import TextView
 
 
 ISSN = {"1095-9203": "Science", "0036-8075": "Science"}
 
 
 class Science(Clean):
+    FLAT_ELEMENTS = "p, figure"
+
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("div.article.fulltext-view")
+        a = self.select(root, "div.article.fulltext-view")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("div.section.results")
-        if secs:
-            return [secs[0]]
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2 and h2.text and h2.text.lower() == "results":
-                return [sec]
-
-        return []
+        return self.sections().find(("results",), classes=("results",)) or (
+            self.flat_section(("results",))
+        )
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("div.section.methods")
-        if secs:
-            return [secs[0]]
-        for sec in self.article.select("div.section"):
-            h2 = sec.find("h2")
-            if h2 and h2.text and h2.text.lower() == "methods":
-                return [sec]
-
-        return []
+        return self.sections().find(("methods",), classes=("methods",)) or (
+            self.flat_section(("methods",))
+        )
 
     def abstract(self) -> list[Tag]:
-        secs = self.article.select("div.section.abstract")
-        return [secs[0]] if secs else []
+        return self.sections().find(classes=("abstract",))
 
     def full_text(self) -> list[Tag]:
-
-        paper = [
-            t
-            for t in self.article.contents
-            if isinstance(t, Tag) and t.name in {"p", "figure"}
-        ]
+        # newer pages have the paragraphs and figures directly in the article
+        paper = [tag for lt in self.flat_sections().values() for tag in lt]
         if not paper:
-            for sec in self.article.select(".section"):
+            for sec in self.select(self.article, ".section"):
                 if "abstract" not in sec["class"]:
                     return [sec]
-        node = self.root.new_tag("div")
-        for n in paper:
-            node.append(n)
-        return [node]
+        return paper
 
     def title(self) -> str | None:
-        s = self.root.select("h1.article__headline")
+        s = self.select(self.root, "h1.article__headline")
         if s:
             return s[0].text.strip()
         return super().title()
 
     def xrefs(self) -> list[XRef]:
         def xref(s: Tag) -> Iterator[XRef]:
-            for c in s.select("li div[data-doi]"):
+            for c in self.select(s, "li div[data-doi]"):
                 cite = c.find("cite")
                 if not isinstance(cite, Tag):
                     continue
-                title = cite.select(".cit-article-title")
+                title = self.select(cite, ".cit-article-title")
                 stitle = title[0].text if title else None
                 yield XRef(doi=c.attrs["data-doi"], title=stitle)
 
-        for s in self.article.select("div.section"):
+        for s in self.select(self.article, "div.section"):
             if "ref-list" in s.attrs["class"]:
                 return list(xref(s))
 
-        for s in self.article.select("div.section"):
+        for s in self.select(self.article, "div.section"):
 
             ss = s.find("h2")
             if not ss or not hasattr(ss, "string") or not ss.string:
@@ -99,43 +82,46 @@ class Science(Clean):
                 return list(xref(s))
         return []
 
-    def old_tostr(self, seclist: list[Tag]) -> list[str]:
-        for sec in seclist:
-            for a in sec.select("div.fig.pos-float"):
-                a.replace_with(self.newfig(a, caption=".fig-caption p"))
-
-            for a in sec.select("div.table.pos-float"):
-                a.replace_with(
-                    self.newtable(a, caption=".table-caption p"),
-                )  # XXXX check me!!!!
-            for a in sec.select("p a.xref-bibr"):
-                a.replace_with(" CITATION ")
-            for a in sec.select("p a.xref-fig"):
-                a.replace_with(" FIG-REF ")
-        txt = [self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.select("p")]
-        return txt
-
-    def tostr(self, seclist: list[Tag]) -> list[str]:
-        for sec in seclist:
-            for a in sec.select("figure"):
-                a.replace_with(self.newfig(a))
-
-            for a in sec.select("p a.xref-bibr"):
-                a.replace_with(" CITATION ")
-            for a in sec.select("p a.xref-fig"):
-                a.replace_with(" FIG-REF ")
-        txt = [self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.select("p")]
-        return txt
-
-
-def download_science(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
+        # select_all since flat sections are the paragraphs and figures themselves
+        for a in v.select_all(seclist, "figure"):
+            v.replace(a, self.newfig(a, view=v))
+
+        for a in v.select_all(seclist, "p a.xref-bibr"):
+            v.replace(a, " CITATION ")
+        for a in v.select_all(seclist, "p a.xref-fig"):
+            v.replace(a, " FIG-REF ")
+
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return [self.SPACE.sub(" ", v.text(p)) for p in v.select_all(seclist, "p")]
+
+
+class ScienceOld(Science):
+    """Older layout with div.fig/div.table floats instead of figure."""
+
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
+        for a in v.select_all(seclist, "div.fig.pos-float"):
+            v.replace(a, self.newfig(a, caption=".fig-caption p", view=v))
+
+        for a in v.select_all(seclist, "div.table.pos-float"):
+            v.replace(
+                a,
+                self.newtable(a, caption=".table-caption p", view=v),
+            )  # XXXX check me!!!!
+        for a in v.select_all(seclist, "p a.xref-bibr"):
+            v.replace(a, " CITATION ")
+        for a in v.select_all(seclist, "p a.xref-fig"):
+            v.replace(a, " FIG-REF ")
+
+
+def download_science(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://science.sciencemag.org"
 
         def get_response(self, paper: Paper, header: dict[str, str]) -> Response:
-            resp = requests.get(f"http://doi.org/{paper.doi}", headers=header)
+            resp = self.session.get(f"http://doi.org/{paper.doi}", headers=header)
             if not resp.url.endswith(".full"):
-                resp = requests.get(resp.url + ".full", headers=header)
+                resp = self.session.get(resp.url + ".full", headers=header)
             return resp
 
         def check_soup(
@@ -148,13 +134,19 @@ def download_science(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a, (a, resp.url, paper.doi)
             return None
 
-    download = D(issn, sleep=sleep, mx=mx)
+    download = D(issn, sleep=sleep, mx=mx, **kwargs)
     download.run()
 
 
 class GenerateScience(Generate):
-    def create_clean(self, soup: BeautifulSoup, pmid: str) -> Clean:
-        return Science(soup)
+    layouts = [
+        (
+            "div.article.fulltext-view div.fig.pos-float,"
+            " div.article.fulltext-view div.table.pos-float",
+            ScienceOld,
+        ),
+        ("div.article.fulltext-view", Science),
+    ]
 
 
 def gen_science(issn):
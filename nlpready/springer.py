@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import TYPE_CHECKING
 
 from ._mlabc import Clean
@@ -11,6 +12,7 @@ if TYPE_CHECKING:
 
     from bs4 import BeautifulSoup, Tag
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 
 ISSN = {
@@ -59,15 +61,15 @@ ISSN = {
 class Springer(Clean):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("main#main-content article.main-body__content")
+        a = self.select(root, "main#main-content article.main-body__content")
         assert a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        secs = self.article.select("#body section.SectionTypeResults")
+        secs = self.select(self.article, "#body section.SectionTypeResults")
         if secs:
             return [secs[0]]
-        for sec in self.article.select("#body section"):
+        for sec in self.select(self.article, "#body section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -76,10 +78,10 @@ class Springer(Clean):
         return []
 
     def methods(self) -> list[Tag]:
-        secs = self.article.select("#body section.SectionTypeMaterialsAndMethods")
+        secs = self.select(self.article, "#body section.SectionTypeMaterialsAndMethods")
         if secs:
             return [secs[0]]
-        for sec in self.article.select("#body section"):
+        for sec in self.select(self.article, "#body section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -94,47 +96,45 @@ class Springer(Clean):
 
     def abstract(self) -> list[Tag]:
 
-        secs = self.article.select("section.Abstract")
+        secs = self.select(self.article, "section.Abstract")
         if secs:
             return [secs[0]]
-        secs = self.article.select("div.section.abstract")
+        secs = self.select(self.article, "div.section.abstract")
         return [secs[0]] if secs else []
 
     def title(self):
-        s = self.root.select("h1.ArticleTitle")
+        s = self.select(self.root, "h1.ArticleTitle")
         if s:
             return s[0].text.strip()
         return super().title()
 
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("figure"):
-                a.replace_with(self.newfig(a, node="span"))
+            for a in v.select(sec, "figure"):
+                v.replace(a, self.newfig(a, node="span", view=v))
                 # a.replace_with('[[FIGURE]]')
 
-            for a in sec.select("div.Table"):
-                a.replace_with(self.newtable(a, ".Caption p", node="span"))
+            for a in v.select(sec, "div.Table"):
+                v.replace(a, self.newtable(a, ".Caption p", node="span", view=v))
                 # a.replace_with('[[TABLE]]')
 
-            for a in sec.select("span.CitationRef"):
-                a.replace_with("CITATION")
+            for a in v.select(sec, "span.CitationRef"):
+                v.replace(a, "CITATION")
 
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
         def para(tag):
             return tag.name == "p" or (
                 tag.name == "div" and tag.has_attr("class") and "Para" in tag["class"]
             )
 
         # txt = [self.SPACE.sub(' ', p.text) for p in sec.select('p, div.Para')]
-        txt = [
-            self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.find_all(para)
-        ]
-        return txt
+        return self.paras(v, seclist, match=para)
 
 
 class SpringerRice(Springer):
     def __init__(self, root: BeautifulSoup) -> None:
-        super().__init__(root)
-        a = root.select("body.journal-fulltext .FulltextWrapper > section")
+        Clean.__init__(self, root)  # pylint: disable=non-parent-init-called
+        a = self.select(root, "body.journal-fulltext .FulltextWrapper > section")
         assert a
         article = a[0].parent
         assert article
@@ -142,7 +142,7 @@ class SpringerRice(Springer):
 
     def results(self) -> list[Tag]:
 
-        for sec in self.article.select("section"):
+        for sec in self.select(self.article, "section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -151,7 +151,7 @@ class SpringerRice(Springer):
         return []
 
     def methods(self) -> list[Tag]:
-        for sec in self.article.select("section"):
+        for sec in self.select(self.article, "section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -166,7 +166,12 @@ class SpringerRice(Springer):
         return []
 
 
-def download_springer(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_springer(
+    issn: str,
+    sleep: float = 5.0,
+    mx: int = 0,
+    **kwargs: Any,
+) -> None:
     class D(Download):
         Referer = "https://link.springer.com"
 
@@ -185,15 +190,17 @@ def download_springer(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a, (paper.pmid, resp.url, paper.doi)
             return None
 
-    o = D(issn, sleep=sleep, mx=mx)
+    o = D(issn, sleep=sleep, mx=mx, **kwargs)
     o.run()
 
 
 class GenerateSpringer(Generate):
-    def create_clean(self, soup: BeautifulSoup, pmid: str) -> Clean:
-        if self.pmid2doi[pmid].issn == "1939-8425":
-            return SpringerRice(soup)
-        return Springer(soup)
+    # Rice pages have both markers (they used to be picked by ISSN): check
+    # the more specific FulltextWrapper layout first
+    layouts = [
+        ("body.journal-fulltext .FulltextWrapper > section", SpringerRice),
+        ("main#main-content article.main-body__content", Springer),
+    ]
 
 
 def gen_springer(issn: str) -> None:
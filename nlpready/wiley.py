@@ -24,6 +24,7 @@ if TYPE_CHECKING:
 
     from bs4 import Tag
     from ._mlabc import Response, Paper
+    from ._textview import TextView
 
 HREF = re.compile(r"^/journal/.*/\(ISSN\)(.{4}-.{4})$")
 
@@ -158,42 +159,45 @@ ISSN = {
 
 # pylint: disable=abstract-method
 class BaseWiley(Clean):
-    def tostr(self, seclist: list[Tag]) -> list[str]:
+    def replacements(self, v: TextView, seclist: list[Tag]) -> None:
         for sec in seclist:
-            for a in sec.select("figure"):
+            for a in v.select(sec, "figure"):
                 # figure inside a div.Para so can't really replace
                 # with a "p"
-                a.replace_with(self.newfig(a))
+                v.replace(a, self.newfig(a, view=v))
 
-            for a in sec.select(".article-table-content"):
-                a.replace_with(self.newtable(a, caption=".article-table-caption"))
+            for a in v.select(sec, ".article-table-content"):
+                v.replace(
+                    a,
+                    self.newtable(a, caption=".article-table-caption", view=v),
+                )
             # for a in sec.select('figure'):
             #    p = self.root.new_tag('p')
             #    p.string = '[[FIGURE]]'
             #     a.replace_with(p)
-            for a in sec.select('p a[title="Link to bibliographic citation"]'):
-                a.replace_with("CITATION")
-            for a in sec.select("p a.bibLink"):
-                a.replace_with("CITATION")
+            for a in v.select(sec, 'p a[title="Link to bibliographic citation"]'):
+                v.replace(a, "CITATION")
+            for a in v.select(sec, "p a.bibLink"):
+                v.replace(a, "CITATION")
 
-        txt = [self.SPACE.sub(" ", p.text) for sec in seclist for p in sec.select("p")]
-        return txt
+    def paragraphs(self, v: TextView, seclist: list[Tag]) -> list[str]:
+        return self.paras(v, seclist)
 
 
 class Wiley(BaseWiley):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("article.journal article.issue article.article")[0]
+        a = self.select(root, "article.journal article.issue article.article")[0]
         assert a, a
         self.article = a
 
     def title(self) -> str | None:
-        for s in self.article.select("h1.article-header__title"):
+        for s in self.select(self.article, "h1.article-header__title"):
             return s.text.strip()
         return super().title()
 
     def results(self) -> list[Tag]:
-        for sec in self.article.select("section.article-body-section"):
+        for sec in self.select(self.article, "section.article-body-section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -205,7 +209,7 @@ class Wiley(BaseWiley):
         return []
 
     def methods(self) -> list[Tag]:
-        for sec in self.article.select("section.article-body-section"):
+        for sec in self.select(self.article, "section.article-body-section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -222,7 +226,7 @@ class Wiley(BaseWiley):
         return []
 
     def abstract(self) -> list[Tag]:
-        for s in self.article.select("section.article-section--abstract"):
+        for s in self.select(self.article, "section.article-section--abstract"):
             if s.attrs["id"] == "abstract":
                 return [s]
         return []
@@ -231,25 +235,26 @@ class Wiley(BaseWiley):
 class Wiley2(BaseWiley):
     def __init__(self, root: BeautifulSoup) -> None:
         super().__init__(root)
-        a = root.select("article div.article__body article")
+        a = self.select(root, "article div.article__body article")
         assert a, a
         self.article = a[0]
 
     def results(self) -> list[Tag]:
-        for sec in self.article.select(
+        for sec in self.select(
+            self.article,
             ".article-section.article-section__full div.article-section__content",
         ):
             h2 = sec.find("h2")
             if h2 and h2.text.lower().strip().endswith("results and discussion"):
                 return [sec]
-        for sec in self.article.select("div.article-section__content"):
+        for sec in self.select(self.article, "div.article-section__content"):
             h2 = sec.find("h2")
             if h2 and h2.text.lower().strip().endswith("results"):
                 return [sec]
         return []
 
     def methods(self) -> list[Tag]:
-        for sec in self.article.select("section.article-body-section"):
+        for sec in self.select(self.article, "section.article-body-section"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -263,7 +268,7 @@ class Wiley2(BaseWiley):
                 ):  # spelling!
                     return [sec]
 
-        for sec in self.article.select("div.article-section__content"):
+        for sec in self.select(self.article, "div.article-section__content"):
             h2 = sec.find("h2")
             if h2:
                 txt = h2.text.lower().strip()
@@ -280,28 +285,22 @@ class Wiley2(BaseWiley):
         return []
 
     def abstract(self) -> list[Tag]:
-        for s in self.article.select("section.article-section__abstract"):
+        for s in self.select(self.article, "section.article-section__abstract"):
             return [s]
         return []
 
     def title(self) -> str | None:
-        s = self.root.select(".article-citation .citation__title")
+        s = self.select(self.root, ".article-citation .citation__title")
         if s:
             return s[0].text.strip()
         return super().title()
 
 
 class GenerateWiley(Generate):
-    def create_clean(self, soup: BeautifulSoup, pmid: str) -> Clean:
-        # p = self.pmid2doi[pmid]
-        # if p.issn in {'1873-3468'}:
-        #     return Wiley(soup)
-        e: Clean
-        try:
-            e = Wiley(soup)
-        except Exception:  # pylint: disable=broad-except
-            e = Wiley2(soup)
-        return e
+    layouts = [
+        ("article.journal article.issue article.article", Wiley),
+        ("article div.article__body article", Wiley2),
+    ]
 
 
 def gen_wiley(issn: str) -> None:
@@ -309,13 +308,13 @@ def gen_wiley(issn: str) -> None:
     e.run()
 
 
-def download_wiley(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
+def download_wiley(issn: str, sleep: float = 5.0, mx: int = 0, **kwargs: Any) -> None:
     class D(Download):
         Referer = "http://onlinelibrary.wiley.com"
 
         def get_response(self, paper, header):
             url = f"http://onlinelibrary.wiley.com/doi/{paper.doi}/full"
-            resp = requests.get(url, headers=header)
+            resp = self.session.get(url, headers=header)
             return resp
 
         def check_soup(
@@ -335,7 +334,7 @@ def download_wiley(issn: str, sleep: float = 5.0, mx: int = 0) -> None:
             assert a and len(a) == 1, (paper.pmid, resp.url, paper.doi, len(a))
             return None
 
-    download = D(issn, sleep=sleep, mx=mx)
+    download = D(issn, sleep=sleep, mx=mx, **kwargs)
     download.run()
 
 